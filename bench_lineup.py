@@ -0,0 +1,225 @@
+"""
+Micro-Benchmarks für die Lineup-Logik (ohne Kivy).
+
+Misst die Bench-Hotpaths (Rotation, Auto-Fill, Zuweisung, Undo/Redo) auf
+synthetischen Rostern mit 20, 200 und 2000 Spieler*innen.
+
+Aufruf:
+    python bench_lineup.py
+    python bench_lineup.py --sizes 20 200 --repeat 500 --json bench.json
+    python bench_lineup.py --lines 4 --only rotate    # Scrimmage mit vier Lines
+    python bench_lineup.py --baseline base.json --tolerance 0.3
+
+Mit --baseline werden die Zeiten mit einer früheren --json-Ausgabe
+verglichen; ist ein Benchmark um mehr als --tolerance langsamer, endet das
+Skript mit Exit-Code 1 (CI: .github/workflows/bench.yml misst Ziel-Branch
+und Pull Request nacheinander auf demselben Runner).
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+from lineup_engine import JAMMER_SLOTS, LineupEngine, line_slot_names
+
+DEFAULT_SIZES = (20, 200, 2000)
+DEFAULT_TOLERANCE = 0.25  # 25 % langsamer als die Baseline gilt als Regression
+
+
+def make_roster(size):
+    """Synthetischer Roster: 1/6 Jammer, 1/6 Pivots, Rest Blocker"""
+    players = []
+    for i in range(size):
+        if i % 6 == 0:
+            role = "J"
+        elif i % 6 == 1:
+            role = "P"
+        else:
+            role = "B"
+        players.append({
+            "name": f"Skater {i}",
+            "number": str(100 + i),
+            "role": role,
+            "status": "NORMAL"
+        })
+    return players
+
+
+def make_engine(size, lines=3):
+    """
+    Engine mit vollem Lineup; ca. 10% des Rosters sitzen in der Penalty Box.
+
+    Returns:
+        tuple: (engine, reserve) - reserve sind Blocker, die nirgends zugewiesen sind
+    """
+    line_slots = line_slot_names(lines)
+    engine = LineupEngine(make_roster(size), line_slots=line_slots)
+    jammers = [p for p in engine.players if p["role"] == "J"]
+    pivots = [p for p in engine.players if p["role"] == "P"]
+    blockers = [p for p in engine.players if p["role"] == "B"]
+
+    for slot, jammer in zip(JAMMER_SLOTS, jammers):
+        engine.drop_assign_to(jammer, slot)
+    for i, line in enumerate(line_slots):
+        if i < len(pivots):
+            engine.drop_assign_to(pivots[i], line)
+        for blocker in blockers[i * 3:(i + 1) * 3]:
+            engine.drop_assign_to(blocker, line)
+
+    lined = 3 * len(line_slots)
+    penalty_end = lined + size // 10
+    for blocker in blockers[lined:penalty_end]:
+        engine.drop_assign_to(blocker, "penalty")
+    engine.reset_history()
+    return engine, blockers[penalty_end:]
+
+
+def bench_rotate(engine, reserve):
+    engine.rotate_lineup()
+
+
+def setup_fill(engine, reserve):
+    """Nimmt 3 Spieler*innen aus der Current Line, damit FILL etwas zu tun hat"""
+    line_a = engine.slot("line_a")
+    while len(line_a) > 1:
+        player = line_a[-1]
+        engine.drop_to_player_pool(player)
+        if player["role"] == "B":
+            reserve.insert(0, player)
+    # Übrige Lines wieder auffüllen, damit genug Ersatz vorhanden ist
+    for line in engine.line_slots[1:]:
+        while len(engine.slot(line)) < 4 and reserve:
+            engine.drop_assign_to(reserve.pop(), line)
+
+
+def bench_fill(engine, reserve):
+    engine.auto_fill_current_line()
+
+
+def bench_assign(engine, reserve):
+    player = engine.players[-1]
+    engine.drop_assign_to(player, "penalty")
+    engine.drop_to_player_pool(player)
+
+
+def bench_history(engine, reserve):
+    """Rotation als Undo-Schritt speichern, rückgängig machen und wiederherstellen"""
+    engine.rotate_lineup()
+    engine.checkpoint()
+    engine.undo()
+    engine.redo()
+
+
+# Saison: 20 Bouts × 2 Perioden × 30 Jams
+SEASON_BOUTS = 20
+PERIOD_JAMS = 30
+
+
+def setup_season(engine, reserve):
+    """Füllt den Jam-Log einmalig mit einer ganzen Saison"""
+    if len(engine.jam_log):
+        return
+    for bout in range(SEASON_BOUTS):
+        for period in range(2):
+            for _ in range(PERIOD_JAMS):
+                engine.force_rotate()
+            engine.start_period(new_bout=period == 1)
+    engine.reset_history()
+
+
+def bench_query(engine, reserve):
+    """Alle Jams einer Blockerin, in denen Line B Current war"""
+    engine.jam_log.rows_where(line="B", player_id=engine.slot("line_b")[0]["id"])
+
+
+BENCHMARKS = (
+    ("rotate", None, bench_rotate),
+    ("fill", setup_fill, bench_fill),
+    ("assign", None, bench_assign),
+    ("history", None, bench_history),
+    ("query", setup_season, bench_query),
+)
+
+
+def run_benchmark(size, setup, func, repeat, lines=3):
+    """Gibt die mittlere Zeit pro Aufruf in Mikrosekunden zurück"""
+    engine, reserve = make_engine(size, lines)
+    total = 0.0
+    for _ in range(repeat):
+        if setup:
+            setup(engine, reserve)
+        start = time.perf_counter()
+        func(engine, reserve)
+        total += time.perf_counter() - start
+    return total / repeat * 1e6
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Vergleicht Ergebnisse mit einer früheren --json-Ausgabe. Benchmarks, die
+    in der Baseline fehlen (z.B. neu hinzugekommen), werden übersprungen.
+
+    Returns:
+        list: Ergebnisse, die um mehr als tolerance langsamer sind
+    """
+    before = {(r["name"], r["size"], r.get("lines", 3)): r["usec_per_op"] for r in baseline}
+    slower = []
+    for result in results:
+        base = before.get((result["name"], result["size"], result["lines"]))
+        if not base:
+            continue
+        change = result["usec_per_op"] / base - 1
+        regressed = change > tolerance
+        if regressed:
+            slower.append(result)
+        print(f"{result['name']:<10} n={result['size']:<6} {base:10.2f} -> "
+              f"{result['usec_per_op']:10.2f} µs/op {change:+8.1%}"
+              + ("  LANGSAMER" if regressed else ""))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lineup-Engine Micro-Benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--only", nargs="+", help="Nur diese Benchmarks ausführen")
+    parser.add_argument("--lines", type=int, default=3, help="Anzahl Lines (Scrimmage: 4)")
+    parser.add_argument("--json", dest="json_path", help="Ergebnisse zusätzlich als JSON speichern")
+    parser.add_argument("--baseline", help="Mit früherer --json-Ausgabe vergleichen (Exit-Code 1 bei Regression)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Erlaubte Verlangsamung gegenüber der Baseline (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    # Engine-Logging (print) würde die Messung dominieren
+    with open(os.devnull, "w") as devnull:
+        for name, setup, func in BENCHMARKS:
+            if args.only and name not in args.only:
+                continue
+            for size in args.sizes:
+                with contextlib.redirect_stdout(devnull):
+                    usec = run_benchmark(size, setup, func, args.repeat, args.lines)
+                results.append({"name": name, "size": size, "lines": args.lines,
+                                "usec_per_op": round(usec, 3)})
+                print(f"{name:<10} n={size:<6} {usec:10.2f} µs/op")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nVergleich mit {args.baseline} (Toleranz {args.tolerance:.0%}):")
+        slower = compare(results, baseline, args.tolerance)
+        if slower:
+            print(f"{len(slower)} Benchmark(s) langsamer als erlaubt")
+            sys.exit(1)
+        print("Keine Regression")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Line-Chemie: Wer hat wie oft und wie kürzlich zusammen in einer Line gestanden?
+(ohne Kivy, benötigt numpy)
+
+Grundlage ist der JamLog (jam_log.py). Dessen Blocker-Spalten sind bereits
+typisierte Arrays mit dichten Spieler-Indizes und werden per
+numpy.frombuffer direkt gelesen. Pro Jam gibt es sechs Paare aus den
+vier Line-Plätzen; alle Paare einer Saison werden vektorisiert gezählt:
+
+    together[a, b]   gemeinsame Jams
+    last[a, b]       letzte gemeinsame Zeile im Log (-1 = nie)
+    weight[a, b]     gemeinsame Jams, gewichtet nach Alter (RECENCY_DECAY^Alter)
+
+Keine Python-Schleife über Jams oder Paare; eine Saison mit einigen tausend
+Jams braucht damit nur wenige Millisekunden. build() cached die Matrix pro
+JamLog-Revision.
+"""
+import numpy as np
+
+from jam_log import BLOCKER_SEATS, NO_PLAYER
+
+# Gewicht eines gemeinsamen Jams halbiert sich nach etwa 60 Jams (~ ein Bout)
+RECENCY_DECAY = 0.5 ** (1 / 60)
+
+_SEAT_PAIRS = [(i, j) for i in range(BLOCKER_SEATS) for j in range(i + 1, BLOCKER_SEATS)]
+
+_cache = {}  # id(JamLog) -> (revision, ChemistryMatrix)
+
+
+class ChemistryMatrix:
+    def __init__(self, log):
+        self._log = log
+        jams = len(log)
+        size = log.player_count()
+        self.jams = jams
+
+        # (jams × 4) Matrix der Spieler-Indizes, NO_PLAYER für leere Plätze
+        seats = np.empty((jams, BLOCKER_SEATS), dtype=np.int64)
+        for seat in range(BLOCKER_SEATS):
+            column = log.column(f"blocker{seat}")
+            seats[:, seat] = np.frombuffer(column, dtype=np.uint16, count=jams)
+
+        rows = np.arange(jams, dtype=np.int64)
+        first = np.concatenate([seats[:, i] for i, _ in _SEAT_PAIRS])
+        second = np.concatenate([seats[:, j] for _, j in _SEAT_PAIRS])
+        pair_rows = np.tile(rows, len(_SEAT_PAIRS))
+        valid = (first != NO_PLAYER) & (second != NO_PLAYER)
+        first, second, pair_rows = first[valid], second[valid], pair_rows[valid]
+
+        # Symmetrisch: beide Richtungen eines Paares zählen
+        a = np.concatenate([first, second])
+        b = np.concatenate([second, first])
+        pair_rows = np.concatenate([pair_rows, pair_rows])
+        flat = a * size + b
+
+        cells = size * size
+        self.together = np.bincount(flat, minlength=cells).reshape(size, size)
+        ages = (jams - 1 - pair_rows).astype(np.float64)
+        self.weight = np.bincount(flat, weights=RECENCY_DECAY ** ages, minlength=cells).reshape(size, size)
+        self.last = np.full(cells, -1, dtype=np.int64)
+        np.maximum.at(self.last, flat, pair_rows)
+        self.last = self.last.reshape(size, size)
+
+        # Jams pro Spieler*in in einer Line
+        played = seats[seats != NO_PLAYER]
+        self.line_jams = np.bincount(played, minlength=size)
+
+    def _indices(self, player_ids):
+        indices = [self._log.player_index(pid) for pid in player_ids]
+        return np.array([i for i in indices if i is not None and i < len(self.line_jams)], dtype=np.int64)
+
+    def _index(self, player_id):
+        index = self._log.player_index(player_id)
+        return index if index is not None and index < len(self.line_jams) else None
+
+    def together_count(self, player_a, player_b):
+        a, b = self._index(player_a), self._index(player_b)
+        return 0 if a is None or b is None else int(self.together[a, b])
+
+    def jams_since_together(self, player_a, player_b):
+        """Jams seit dem letzten gemeinsamen Jam (None = nie zusammen)"""
+        a, b = self._index(player_a), self._index(player_b)
+        if a is None or b is None or self.last[a, b] < 0:
+            return None
+        return int(self.jams - 1 - self.last[a, b])
+
+    def with_line(self, player_id, line_ids):
+        """
+        Chemie einer Spieler*in mit einer (teilweise besetzten) Line.
+
+        Returns:
+            tuple: (gemeinsame Jams gesamt, gewichtete Summe)
+        """
+        index = self._index(player_id)
+        members = self._indices(line_ids)
+        if index is None or not len(members):
+            return 0, 0.0
+        return int(self.together[index, members].sum()), float(self.weight[index, members].sum())
+
+    def partners(self, player_id, candidate_ids=None, limit=3):
+        """
+        Beste Partner*innen nach gewichteter gemeinsamer Spielzeit.
+
+        Args:
+            candidate_ids: nur unter diesen IDs suchen (None = alle im Log)
+
+        Returns:
+            list: (player_id, gemeinsame Jams, Gewicht), bestes zuerst
+        """
+        index = self._index(player_id)
+        if index is None:
+            return []
+        if candidate_ids is None:
+            candidates = np.arange(len(self.line_jams))
+        else:
+            candidates = self._indices(candidate_ids)
+        candidates = candidates[(candidates != index) & (self.together[index, candidates] > 0)]
+        if not len(candidates):
+            return []
+        scores = self.weight[index, candidates]
+        best = candidates[np.argsort(-scores, kind="stable")[:limit]]
+        return [(self._log.player_id(int(i)), int(self.together[index, i]), float(self.weight[index, i]))
+                for i in best]
+
+    def line_chemistry(self, line_ids):
+        """Mittlere gewichtete Chemie aller Paare einer Line (0.0 bei < 2 Spieler*innen)"""
+        members = self._indices(line_ids)
+        if len(members) < 2:
+            return 0.0
+        block = self.weight[np.ix_(members, members)]
+        pairs = len(members) * (len(members) - 1)
+        return float((block.sum() - np.trace(block)) / pairs)
+
+
+def build(log):
+    """ChemistryMatrix für den aktuellen Stand des JamLog (gecacht pro Revision)"""
+    cached = _cache.get(id(log))
+    if cached is not None and cached[0] == log.revision and cached[1]._log is log:
+        return cached[1]
+    matrix = ChemistryMatrix(log)
+    _cache.clear()
+    _cache[id(log)] = (log.revision, matrix)
+    return matrix
@@ -0,0 +1,302 @@
+"""
+Kommandozeile für Roster- und Lineup-Dateien (ohne Kivy/KivyMD).
+
+Importiert nur die Lineup-Logik - kein Fenster, keine Android-Permissions,
+Start in Millisekunden. Gedacht für Skripte vor dem Bout und für Server.
+
+Unterbefehle:
+    validate DATEI...             prüft Spieler-Listen und Lineups
+    merge AUSGABE DATEI...        führt Roster zusammen (über ID, sonst Name + Nummer)
+    migrate DATEI [-o AUSGABE]    bringt ältere Dateien ins aktuelle Format
+    rotate N DATEI [-o AUSGABE]   rotiert das Lineup N-mal und zeigt die Jams
+    export DATEI AUSGABE          konvertiert JSON <-> Snapshot (.drby)
+
+Aufruf:
+    python derby_cli.py validate roster.json lineup_export.json
+    python derby_cli.py merge roster.json team_a.json team_b.json
+    python derby_cli.py rotate 5 lineup_export.json --fill -o nach_5_jams.json
+    python derby_cli.py export lineup_export.json bout.drby
+    python derby_cli.py export bout.drby roster.json --players-only
+
+Exit-Code: 0 = ok, 1 = Fehler in einer Datei bzw. Rotation nicht möglich.
+"""
+import argparse
+import contextlib
+import os
+import sys
+
+import snapshot
+from lineup_engine import LINE_SIZE, LineupEngine, line_slots_for
+from persistence import write_json_atomic
+from roster_import import clean_player
+
+
+@contextlib.contextmanager
+def _quiet(verbose):
+    """Engine-Logging (print) nur mit --verbose"""
+    if verbose:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _load(path, verbose):
+    with _quiet(verbose):
+        return snapshot.load_engine(path)
+
+
+def _write(engine, path, players_only=False):
+    """Schreibt als Snapshot (.drby), Spieler-Liste oder Lineup im Export-Format"""
+    if snapshot.is_snapshot_file(path):
+        snapshot.write_snapshot(path, engine.export_state())
+    elif players_only:
+        write_json_atomic(path, engine.players)
+    else:
+        write_json_atomic(path, engine.export_lineup())
+
+
+def _short(player):
+    return player.get("number") or player["name"]
+
+
+# ---------------------------------------------------------
+# validate
+# ---------------------------------------------------------
+def validate_data(data):
+    """
+    Prüft Rohdaten einer Datei, ohne sie zu verändern.
+
+    Returns:
+        tuple: (Fehler, Warnungen) als Listen von Texten
+    """
+    errors, warnings = [], []
+    if isinstance(data, list):
+        raw_players, assignments = data, None
+    elif isinstance(data, dict) and isinstance(data.get("players"), list):
+        raw_players, assignments = data["players"], data.get("assignments")
+    else:
+        return ["Unbekanntes Format (weder Spieler-Liste noch Lineup)"], warnings
+
+    by_id, by_value = {}, {}
+    for i, raw in enumerate(raw_players):
+        player = clean_player(raw)
+        if player is None:
+            errors.append(f"Spieler*in #{i + 1}: ungültig ({str(raw)[:60]})")
+            continue
+        label = f"{player['number']} {player['name']}".strip()
+        if "id" not in player:
+            warnings.append(f"{label}: keine ID (wird beim Import vergeben)")
+        elif player["id"] in by_id:
+            errors.append(f"{label}: doppelte ID {player['id']}")
+        else:
+            by_id[player["id"]] = player
+        if not isinstance(raw, dict) or raw.get("status") != player["status"]:
+            warnings.append(f"{label}: Status fehlt/unbekannt (wird NORMAL)")
+        key = (player["name"].lower(), player["number"])
+        if key in by_value:
+            warnings.append(f"{label}: doppelt (gleicher Name und Nummer)")
+        by_value.setdefault(key, player)
+
+    if assignments is None:
+        return errors, warnings
+    if not isinstance(assignments, dict):
+        return errors + ["assignments ist kein Objekt"], warnings
+
+    engine = LineupEngine(line_slots=line_slots_for(assignments))
+    seen = set()
+    for name, entries in assignments.items():
+        if name not in engine.box_slots:
+            warnings.append(f"Unbekannte Box {name} (wird ignoriert)")
+            continue
+        if not isinstance(entries, list):
+            errors.append(f"{name}: keine Liste")
+            continue
+        players = []
+        for entry in entries:
+            if isinstance(entry, str):
+                player = by_id.get(entry)
+            else:
+                cleaned = clean_player(entry) or {}
+                player = by_id.get(cleaned.get("id")) or by_value.get(
+                    (cleaned.get("name", "").lower(), cleaned.get("number")))
+            if player is None:
+                errors.append(f"{name}: Eintrag ohne passende Spieler*in ({str(entry)[:60]})")
+                continue
+            if id(player) in seen:
+                errors.append(f"{name}: {player['name']} ist mehrfach zugewiesen")
+            seen.add(id(player))
+            players.append(player)
+
+        if name in engine.line_slots:
+            if len(players) > LINE_SIZE:
+                errors.append(f"{name}: {len(players)} Spieler*innen (max. {LINE_SIZE})")
+            if sum(1 for p in players if p["role"] == "P") > 1:
+                warnings.append(f"{name}: mehr als ein Pivot")
+            warnings.extend(f"{name}: {p['name']} ist Jammer" for p in players if p["role"] == "J")
+        elif name in engine.jammer_slots:
+            if len(players) > 1:
+                warnings.append(f"{name}: {len(players)} Jammer")
+            warnings.extend(f"{name}: {p['name']} ist kein Jammer" for p in players if p["role"] != "J")
+    return errors, warnings
+
+
+def cmd_validate(args):
+    failed = False
+    for path in args.files:
+        try:
+            errors, warnings = validate_data(snapshot.load_file(path))
+        except (OSError, ValueError) as e:
+            errors, warnings = [str(e)], []
+        for message in errors:
+            print(f"{path}: FEHLER: {message}")
+        if not args.quiet:
+            for message in warnings:
+                print(f"{path}: Warnung: {message}")
+        if errors:
+            failed = True
+        else:
+            print(f"{path}: ok ({len(warnings)} Warnungen)")
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------
+# merge / migrate / export
+# ---------------------------------------------------------
+def merge_rosters(datasets):
+    """
+    Führt Spieler-Listen zusammen: gleiche ID oder gleicher Name + Nummer
+    gelten als dieselbe Person, spätere Dateien aktualisieren Rolle und Status.
+
+    Returns:
+        tuple: (Spieler-Liste, Anzahl übersprungener Datensätze)
+
+    Raises:
+        ValueError: wenn ein Datensatz weder Spieler-Liste noch Lineup ist
+    """
+    merged, by_id, by_value = [], {}, {}
+    skipped = 0
+    for number, data in enumerate(datasets, 1):
+        if isinstance(data, list):
+            raw_players = data
+        elif isinstance(data, dict) and isinstance(data.get("players"), list):
+            raw_players = data["players"]
+        else:
+            raise ValueError(f"Datei {number}: weder Spieler-Liste noch Lineup")
+        for raw in raw_players:
+            player = clean_player(raw)
+            if player is None:
+                skipped += 1
+                continue
+            key = (player["name"].lower(), player["number"])
+            existing = by_id.get(player.get("id")) or by_value.get(key)
+            if existing is not None:
+                existing["role"] = player["role"]
+                existing["status"] = player["status"]
+                continue
+            merged.append(player)
+            by_value[key] = player
+            if "id" in player:
+                by_id[player["id"]] = player
+    return merged, skipped
+
+
+def cmd_merge(args):
+    datasets = [snapshot.load_file(path) for path in args.files]
+    players, skipped = merge_rosters(datasets)
+    engine = LineupEngine()
+    with _quiet(args.verbose):
+        engine.load_players(players)  # vergibt fehlende IDs
+    _write(engine, args.output, players_only=not snapshot.is_snapshot_file(args.output))
+    print(f"{len(engine.players)} Spieler*innen aus {len(args.files)} Dateien → {args.output}"
+          + (f" ({skipped} ungültige übersprungen)" if skipped else ""))
+    return 0
+
+
+def cmd_migrate(args):
+    engine, kind = _load(args.file, args.verbose)
+    output = args.output or args.file
+    _write(engine, output, players_only=(kind == "players"))
+    print(f"{args.file}: {len(engine.players)} Spieler*innen ({kind}) → {output}")
+    return 0
+
+
+def cmd_export(args):
+    engine, kind = _load(args.file, args.verbose)
+    _write(engine, args.output, players_only=args.players_only or kind == "players")
+    print(f"{args.file} → {args.output}")
+    return 0
+
+
+# ---------------------------------------------------------
+# rotate
+# ---------------------------------------------------------
+def cmd_rotate(args):
+    engine, _ = _load(args.file, args.verbose)
+    jammer_slot, line_slot = engine.jammer_slots[0], engine.line_slots[0]
+    status = 0
+    for jam in range(1, args.count + 1):
+        with _quiet(args.verbose):
+            rotated = engine.rotate_lineup() or (args.fill and engine.autofill_and_rotate())
+        if not rotated:
+            line = engine.slot(line_slot)
+            print(f"Jam +{jam}: Current Line unvollständig ({len(line)}/{LINE_SIZE}) - abgebrochen")
+            status = 1
+            break
+        jammer = engine.slot(jammer_slot)
+        line = " ".join(_short(p) for p in engine.slot(line_slot)) or "–"
+        print(f"Jam +{jam}: J {_short(jammer[0]) if jammer else '–'} | {line}")
+
+    if args.output:
+        _write(engine, args.output)
+        print(f"→ {args.output}")
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Roster- und Lineup-Dateien ohne App bearbeiten")
+    parser.add_argument("--verbose", action="store_true", help="Engine-Logging anzeigen")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="Dateien prüfen")
+    validate.add_argument("files", nargs="+")
+    validate.add_argument("--quiet", action="store_true", help="Nur Fehler ausgeben")
+    validate.set_defaults(func=cmd_validate)
+
+    merge = commands.add_parser("merge", help="Roster zusammenführen")
+    merge.add_argument("output")
+    merge.add_argument("files", nargs="+")
+    merge.set_defaults(func=cmd_merge)
+
+    migrate = commands.add_parser("migrate", help="Ins aktuelle Format bringen")
+    migrate.add_argument("file")
+    migrate.add_argument("-o", "--output", help="Zieldatei (Standard: Datei überschreiben)")
+    migrate.set_defaults(func=cmd_migrate)
+
+    rotate = commands.add_parser("rotate", help="Lineup N-mal rotieren")
+    rotate.add_argument("count", type=int)
+    rotate.add_argument("file")
+    rotate.add_argument("-o", "--output", help="Ergebnis speichern")
+    rotate.add_argument("--fill", action="store_true",
+                        help="Unvollständige Current Line vorher auffüllen (wie Auto-Fill & Rotieren)")
+    rotate.set_defaults(func=cmd_rotate)
+
+    export = commands.add_parser("export", help="JSON <-> Snapshot (.drby) konvertieren")
+    export.add_argument("file")
+    export.add_argument("output")
+    export.add_argument("--players-only", action="store_true", help="Nur Spieler-Liste exportieren")
+    export.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Wiederverwendbare Dialoge (Status, Zuordnen, Bestätigen, Warnung, Export).
+
+Jeder Dialog wird einmal gebaut und beim Öffnen nur neu gebunden
+(Titel, Texte, Ziel-Spieler*in, Callbacks). Buttons werden dabei nicht neu
+erzeugt, sondern aus einem kleinen Vorrat wiederverwendet. DialogPool baut
+die Dialoge bei Bedarf oder vorab in ruhigen Frames nach dem Start.
+"""
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.textinput import TextInput
+
+STATUS_CHOICES = (
+    ("✓ Normal (Spielbereit)", "NORMAL"),
+    ("⏸ Rest (Pause)", "REST"),
+    ("+ Injured (Verletzt)", "INJURED")
+)
+
+EXPORT_DEFAULT_FILENAME = "lineup_export.json"
+
+
+def _sync_buttons(layout, buttons, count, make_button):
+    """
+    Zeigt genau die ersten count Buttons im Layout an.
+
+    Fehlende Buttons werden einmalig erzeugt, überzählige nur ausgehängt.
+    """
+    while len(buttons) < count:
+        buttons.append(make_button())
+    for i, btn in enumerate(buttons):
+        if i < count:
+            if btn.parent is None:
+                layout.add_widget(btn)
+        elif btn.parent is not None:
+            layout.remove_widget(btn)
+
+
+# ---------------------------------------------------------
+# Status ändern
+# ---------------------------------------------------------
+class StatusDialog(Popup):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("size_hint", (0.5, 0.4))
+        super().__init__(**kwargs)
+        self.player = None
+        self.on_choose = None
+
+        layout = GridLayout(cols=1, spacing=10, padding=10, size_hint_y=None)
+        layout.bind(minimum_height=layout.setter("height"))
+        for text, status in STATUS_CHOICES:
+            layout.add_widget(Button(
+                text=text,
+                font_size="22sp",
+                size_hint_y=None,
+                height=70,
+                on_release=lambda x, s=status: self.on_choose(self.player, s, self)
+            ))
+        self.content = layout
+
+    def show(self, player, on_choose):
+        """on_choose(player, status, dialog)"""
+        self.player = player
+        self.on_choose = on_choose
+        self.title = f"Status für {player['name']} ändern"
+        self.open()
+
+
+# ---------------------------------------------------------
+# Zuordnen
+# ---------------------------------------------------------
+class AssignDialog(Popup):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("size_hint", (0.6, 0.7))
+        super().__init__(**kwargs)
+        self.player = None
+        self.on_choose = None
+        self._buttons = []
+
+        self.layout = GridLayout(cols=1, spacing=10, padding=10, size_hint_y=None)
+        self.layout.bind(minimum_height=self.layout.setter("height"))
+        self.content = self.layout
+
+        # Hinweiszeile über den Buttons (z.B. Partner*innen), nur wenn gesetzt
+        self.info = Label(size_hint_y=None, height=50, font_size="18sp", halign="left", valign="middle")
+        self.info.bind(size=self.info.setter("text_size"))
+
+    def _make_button(self):
+        btn = Button(size_hint_y=None, height=70, font_size="22sp")
+        btn.target = None
+        btn.bind(on_release=lambda b: self.on_choose(self.player, b.target, self))
+        return btn
+
+    def show(self, player, targets, on_choose, info=""):
+        """
+        Args:
+            targets: (Text, Ziel)-Paare aus LineupEngine.assignment_targets
+            on_choose: on_choose(player, target, dialog)
+            info: Optionale Hinweiszeile über den Buttons
+        """
+        self.player = player
+        self.on_choose = on_choose
+        self.title = f"{player['name']} zuordnen"
+        self.info.text = info
+        if info and self.info.parent is None:
+            self.layout.add_widget(self.info, index=len(self.layout.children))
+        elif not info and self.info.parent is not None:
+            self.layout.remove_widget(self.info)
+        _sync_buttons(self.layout, self._buttons, len(targets), self._make_button)
+        for btn, (text, target) in zip(self._buttons, targets):
+            btn.text = text
+            btn.target = target
+        self.open()
+
+
+# ---------------------------------------------------------
+# Bestätigung / Auswahl mit Meldung
+# ---------------------------------------------------------
+class ChoiceDialog(Popup):
+    """Meldung + Buttons; wird für Bestätigungen und Warnungen verwendet"""
+
+    def __init__(self, orientation="horizontal", message_hint=0.6, **kwargs):
+        kwargs.setdefault("size_hint", (0.6, 0.3))
+        super().__init__(**kwargs)
+        self._buttons = []
+        self._callbacks = []
+
+        content = BoxLayout(orientation="vertical", spacing=20, padding=20)
+        self.message = Label(
+            font_size="20sp",
+            size_hint_y=message_hint,
+            halign="center",
+            valign="middle"
+        )
+        self.message.bind(size=self.message.setter("text_size"))
+        self.button_box = BoxLayout(spacing=10, size_hint_y=1 - message_hint,
+                                    orientation=orientation)
+        content.add_widget(self.message)
+        content.add_widget(self.button_box)
+        self.content = content
+
+    def _make_button(self):
+        btn = Button(font_size="22sp")
+        btn.choice = len(self._buttons)
+        btn.bind(on_release=self._on_button)
+        return btn
+
+    def _on_button(self, btn):
+        callback = self._callbacks[btn.choice]
+        if callback is None:
+            self.dismiss()
+        else:
+            callback(self)
+
+    def show(self, title, message, choices):
+        """
+        Args:
+            choices: (Text, Callback)-Paare; Callback bekommt den Dialog,
+                     None schließt nur den Dialog
+        """
+        self.title = title
+        self.message.text = message
+        self._callbacks = [callback for _, callback in choices]
+        _sync_buttons(self.button_box, self._buttons, len(choices), self._make_button)
+        for btn, (text, _) in zip(self._buttons, choices):
+            btn.text = text
+        self.open()
+
+
+# ---------------------------------------------------------
+# Export-Optionen
+# ---------------------------------------------------------
+class ExportDialog(Popup):
+    def __init__(self, archive_ext, **kwargs):
+        kwargs.setdefault("size_hint", (0.7, 0.6))
+        kwargs.setdefault("title", "Export Optionen")
+        super().__init__(**kwargs)
+        self.on_choose = None
+
+        content = BoxLayout(orientation="vertical", spacing=15, padding=15)
+
+        # Info-Text
+        content.add_widget(Label(
+            text="Wähle was exportiert werden soll:",
+            font_size="22sp",
+            size_hint_y=None,
+            height=40
+        ))
+
+        # Filename Input
+        filename_box = BoxLayout(orientation="horizontal", spacing=10, size_hint_y=None, height=60)
+        self.filename_input = TextInput(
+            text=EXPORT_DEFAULT_FILENAME,
+            font_size="20sp",
+            multiline=False
+        )
+        filename_box.add_widget(Label(text="Dateiname:", size_hint_x=0.3, font_size="20sp"))
+        filename_box.add_widget(self.filename_input)
+        content.add_widget(filename_box)
+
+        # Export-Optionen
+        export_options = GridLayout(cols=1, spacing=10, size_hint_y=None, height=220)
+        for text, kind in (
+            ("Nur Spieler\n(ohne Zuweisungen)", "players"),
+            ("Komplettes Lineup\n(Spieler + Zuweisungen)", "lineup"),
+            (f"Lineup-Archiv\n(kompakt, {archive_ext})", "archive")
+        ):
+            export_options.add_widget(Button(
+                text=text,
+                font_size="20sp",
+                size_hint_y=None,
+                height=60,
+                on_release=lambda x, k=kind: self.on_choose(k, self.filename_input.text, self)
+            ))
+        content.add_widget(export_options)
+        self.content = content
+
+    def show(self, on_choose):
+        """on_choose(kind, filename, dialog) mit kind "players", "lineup" oder "archive" """
+        self.on_choose = on_choose
+        self.filename_input.text = EXPORT_DEFAULT_FILENAME
+        self.open()
+
+
+# ---------------------------------------------------------
+# Pool
+# ---------------------------------------------------------
+def _make_export_dialog():
+    from snapshot import SNAPSHOT_EXT
+    return ExportDialog(SNAPSHOT_EXT)
+
+
+DIALOG_FACTORIES = {
+    "assign": AssignDialog,
+    "status": StatusDialog,
+    "confirm": ChoiceDialog,
+    "warning": lambda: ChoiceDialog(orientation="vertical", message_hint=0.5,
+                                    size_hint=(0.7, 0.5)),
+    "export": _make_export_dialog,
+}
+
+
+class DialogPool:
+    def __init__(self, factories=DIALOG_FACTORIES):
+        self.factories = factories
+        self._dialogs = {}
+
+    def get(self, name):
+        dialog = self._dialogs.get(name)
+        if dialog is None:
+            dialog = self._dialogs[name] = self.factories[name]()
+        return dialog
+
+    def warm_up(self, *args):
+        """Baut pro Frame einen noch fehlenden Dialog (häufigste zuerst)"""
+        for name in self.factories:
+            if name not in self._dialogs:
+                self.get(name)
+                Clock.schedule_once(self.warm_up)
+                return
@@ -0,0 +1,132 @@
+"""
+Verzeichnis-Listings für die Dateiauswahl (ohne Kivy).
+
+DirectoryScanner liest Verzeichnisse in einem Worker-Thread und hält die
+Ergebnisse in einem begrenzten LRU-Cache. Ein Eintrag gilt, solange sich die
+mtime des Verzeichnisses nicht ändert (Anlegen/Löschen/Umbenennen von
+Einträgen ändert sie). Die UI kann so sofort das zwischengespeicherte Listing
+zeigen und im Hintergrund nachprüfen lassen.
+
+RecentDirs merkt sich die zuletzt benutzten Import-/Export-Ordner.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from persistence import load_json, save_json
+
+SCAN_CACHE_SIZE = 32
+RECENT_DIRS_FILE = "picker_dirs.json"
+
+
+class Listing:
+    """Ergebnis eines Scans: Unterordner und passende Dateien (sortiert)"""
+
+    __slots__ = ("path", "mtime", "dirs", "files")
+
+    def __init__(self, path, mtime, dirs, files):
+        self.path = path
+        self.mtime = mtime
+        self.dirs = dirs
+        self.files = files
+
+
+def scan_directory(path, extensions):
+    """
+    Liest ein Verzeichnis einmal mit os.scandir (kein stat pro Datei).
+
+    Args:
+        extensions: Dateiendungen in Kleinbuchstaben, z.B. (".json",)
+
+    Raises:
+        OSError: Verzeichnis nicht lesbar
+    """
+    mtime = os.stat(path).st_mtime_ns
+    dirs = []
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir():
+                    dirs.append(entry.name)
+                elif entry.name.lower().endswith(extensions):
+                    files.append(entry.name)
+            except OSError:
+                continue  # z.B. defekter Symlink
+    dirs.sort(key=str.lower)
+    files.sort(key=str.lower)
+    return Listing(path, mtime, dirs, files)
+
+
+class DirectoryScanner:
+    def __init__(self, max_entries=SCAN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # (path, extensions) -> Listing
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def cached(self, path, extensions):
+        """Zuletzt bekanntes Listing oder None (ohne Dateisystemzugriff)"""
+        key = (os.path.abspath(path), tuple(extensions))
+        with self._lock:
+            listing = self._cache.get(key)
+            if listing is not None:
+                self._cache.move_to_end(key)
+            return listing
+
+    def scan(self, path, extensions, callback):
+        """
+        Liest das Verzeichnis im Worker-Thread, falls sich seine mtime seit
+        dem letzten Scan geändert hat.
+
+        Args:
+            callback: callback(path, listing, changed, error) im Worker-Thread;
+                      changed ist False, wenn das gecachte Listing gültig war
+        """
+        self._executor.submit(self._scan, os.path.abspath(path), tuple(extensions), callback)
+
+    def _scan(self, path, extensions, callback):
+        key = (path, extensions)
+        try:
+            listing = self.cached(path, extensions)
+            if listing is not None and os.stat(path).st_mtime_ns == listing.mtime:
+                callback(path, listing, False, None)
+                return
+            listing = scan_directory(path, extensions)
+        except OSError as e:
+            print(f"Ordner {path} nicht lesbar: {e}")
+            callback(path, None, True, e)
+            return
+
+        with self._lock:
+            self._cache[key] = listing
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        callback(path, listing, True, None)
+
+
+class RecentDirs:
+    """Zuletzt benutzte Ordner pro Zweck ("import", "export")"""
+
+    def __init__(self, path=RECENT_DIRS_FILE):
+        self.path = path
+        self._dirs = None
+
+    def get(self, key, default):
+        if self._dirs is None:
+            self._dirs = load_json(self.path, {}) or {}
+        directory = self._dirs.get(key)
+        if directory and os.path.isdir(directory):
+            return directory
+        return default
+
+    def remember(self, key, directory):
+        if self._dirs is None:
+            self._dirs = load_json(self.path, {}) or {}
+        if self._dirs.get(key) != directory:
+            self._dirs[key] = directory
+            save_json(self.path, self._dirs)
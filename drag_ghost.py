@@ -0,0 +1,102 @@
+"""
+Drag-Vorschau: ein Abbild der gezogenen Karte folgt dem Finger.
+
+Es gibt genau einen Ghost für die ganze App. Seine Instruktionen
+(Translate + Rectangle) liegen einmalig auf dem Fenster-Canvas; beim Start
+eines Drags wird die Karte einmal in ein wiederverwendetes Fbo gerendert,
+bei jeder Bewegung ändert sich nur der Translate-Wert. Kein Widget, kein
+Re-Layout, keine neuen Instruktionen pro Bewegung.
+
+Das erste Anlegen eines Fbo ist teuer (Shader/Stencil-Setup); warm_up()
+erledigt das nach dem Start, damit der erste Drag nicht ruckelt.
+"""
+from kivy.core.window import Window
+from kivy.graphics import (
+    ClearBuffers, ClearColor, Color, Fbo, InstructionGroup, PopMatrix, PushMatrix,
+    Rectangle, Translate
+)
+
+GHOST_ALPHA = 0.85
+
+
+class DragGhost:
+    def __init__(self):
+        self._group = None
+        self._color = None
+        self._translate = None
+        self._rect = None
+        self._fbo = None
+        self._fbo_translate = None
+        self._offset = (0, 0)
+        self.active = False
+
+    def _attach(self):
+        self._group = InstructionGroup()
+        self._color = Color(1, 1, 1, 0)
+        self._translate = Translate()
+        self._rect = Rectangle()
+        for instruction in (PushMatrix(), self._translate, self._color, self._rect, PopMatrix()):
+            self._group.add(instruction)
+        Window.canvas.after.add(self._group)
+
+    def warm_up(self, *args):
+        """Legt Fbo und Fenster-Instruktionen vorab an"""
+        if self._group is None:
+            self._attach()
+        if self._fbo is None:
+            self._fbo = Fbo(size=(1, 1), with_stencilbuffer=True)
+            with self._fbo:
+                ClearColor(0, 0, 0, 0)
+                ClearBuffers()
+                self._fbo_translate = Translate()
+            self._fbo.draw()
+
+    def _render(self, widget):
+        """Rendert widget in das Fbo (wie Widget.export_as_image, ohne neues Fbo)"""
+        self.warm_up()
+        fbo = self._fbo
+        width, height = int(widget.width), int(widget.height)
+        if tuple(fbo.size) != (width, height):
+            fbo.size = (width, height)
+        self._fbo_translate.xy = (-widget.x, -widget.y)
+
+        # Canvas vorübergehend aus dem Eltern-Canvas lösen und danach an
+        # derselben Stelle wieder einhängen, sonst lösen spätere Änderungen
+        # an der Karte kein Neuzeichnen mehr aus
+        parent_canvas = widget.parent.canvas if widget.parent is not None else None
+        index = parent_canvas.indexof(widget.canvas) if parent_canvas is not None else -1
+        if index > -1:
+            parent_canvas.remove(widget.canvas)
+        fbo.add(widget.canvas)
+        try:
+            fbo.draw()
+        finally:
+            fbo.remove(widget.canvas)
+            if index > -1:
+                parent_canvas.insert(index, widget.canvas)
+        return fbo.texture
+
+    def begin(self, card, grab_x, grab_y, x, y):
+        """
+        Rendert die Karte und zeigt den Ghost an.
+
+        Args:
+            grab_x, grab_y: Griffpunkt relativ zur linken unteren Kartenecke
+            x, y: aktuelle Fingerposition in Fensterkoordinaten
+        """
+        self._rect.texture = self._render(card)
+        self._rect.size = card.size
+        self._offset = (grab_x, grab_y)
+        self._color.a = GHOST_ALPHA
+        self.active = True
+        self.move(x, y)
+
+    def move(self, x, y):
+        if self.active:
+            self._translate.xy = (x - self._offset[0], y - self._offset[1])
+
+    def end(self):
+        if not self.active:
+            return
+        self.active = False
+        self._color.a = 0
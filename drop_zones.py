@@ -0,0 +1,159 @@
+"""
+Drop-Zonen für Drag & Drop: Trefferprüfung in Fensterkoordinaten.
+
+Die Rechtecke aller Zonen (Player Pool + Boxen) werden einmal in
+Fensterkoordinaten umgerechnet und in ein grobes Raster (Zellgröße
+DROP_CELL_SIZE) einsortiert. Eine Abfrage prüft nur die ein bis zwei Zonen
+in der Zelle unter dem Finger. Neu berechnet wird erst, wenn sich Position
+oder Größe einer Zone ändert.
+
+Touch-Koordinaten innerhalb einer ScrollView sind lokal verschoben; für die
+Abfrage daher window_pos(touch) verwenden.
+
+CardRows nutzt dieselbe Idee innerhalb einer Box: Die Karten-Zeilen werden
+einmal nach y sortiert, die Karte unter einem Touch per Binärsuche gefunden.
+So muss MainLayout einen Touch nur an genau eine Karte weiterreichen.
+"""
+from bisect import bisect_right
+
+from kivy.core.window import Window
+from kivy.graphics import Color, InstructionGroup, Line
+
+DROP_CELL_SIZE = 64
+HIGHLIGHT_COLOR = (0.2, 0.5, 0.8, 0.9)
+HIGHLIGHT_WIDTH = 3
+
+
+def window_pos(touch):
+    """Fensterkoordinaten eines Touches, unabhängig von ScrollView-Transformationen"""
+    return touch.sx * Window.width, touch.sy * Window.height
+
+
+class DropZoneIndex:
+    def __init__(self, cell_size=DROP_CELL_SIZE):
+        self.cell_size = cell_size
+        self._zones = []    # (target, widget)
+        self._rects = []    # (x1, y1, x2, y2) in Fensterkoordinaten
+        self._grid = {}     # (cx, cy) -> [zone_index]
+        self._dirty = True
+
+        self._hover = None
+        self._highlight = None
+        self._highlight_color = None
+        self._highlight_line = None
+
+    # -----------------------------------------------------
+    # Zonen
+    # -----------------------------------------------------
+    def set_zones(self, zones):
+        """
+        Args:
+            zones: (target, widget)-Paare; target ist "player_pool" oder ein Box-Name
+        """
+        for _, widget in self._zones:
+            widget.unbind(pos=self.invalidate, size=self.invalidate)
+        self._zones = [(target, widget) for target, widget in zones if widget is not None]
+        for _, widget in self._zones:
+            widget.bind(pos=self.invalidate, size=self.invalidate)
+        self.invalidate()
+
+    def invalidate(self, *args):
+        self._dirty = True
+
+    def _rebuild(self):
+        cell = self.cell_size
+        self._rects = []
+        self._grid = {}
+        for index, (_, widget) in enumerate(self._zones):
+            x, y = widget.to_window(*widget.pos)
+            rect = (x, y, x + widget.width, y + widget.height)
+            self._rects.append(rect)
+            for cx in range(int(rect[0] // cell), int(rect[2] // cell) + 1):
+                for cy in range(int(rect[1] // cell), int(rect[3] // cell) + 1):
+                    self._grid.setdefault((cx, cy), []).append(index)
+        self._dirty = False
+        self._hover = -1  # Markierung beim nächsten hover() neu setzen
+
+    def _zone_at(self, x, y):
+        if self._dirty:
+            self._rebuild()
+        for index in self._grid.get((int(x // self.cell_size), int(y // self.cell_size)), ()):
+            x1, y1, x2, y2 = self._rects[index]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                return index
+        return None
+
+    def target_at(self, x, y):
+        """Ziel unter dem Punkt (Fensterkoordinaten) oder None"""
+        index = self._zone_at(x, y)
+        return None if index is None else self._zones[index][0]
+
+    # -----------------------------------------------------
+    # Hover-Markierung
+    # -----------------------------------------------------
+    def attach_highlight(self, canvas):
+        """Legt die (einzige) Markierung auf einem Canvas in Fensterkoordinaten an"""
+        self._highlight = InstructionGroup()
+        self._highlight_color = Color(*HIGHLIGHT_COLOR[:3], 0)
+        self._highlight_line = Line(width=HIGHLIGHT_WIDTH)
+        self._highlight.add(self._highlight_color)
+        self._highlight.add(self._highlight_line)
+        canvas.add(self._highlight)
+
+    def hover(self, x, y):
+        """Markiert die Zone unter dem Finger; zeichnet nur bei Zonenwechsel neu"""
+        index = self._zone_at(x, y)
+        if index == self._hover:
+            return
+        self._hover = index
+        if self._highlight is None:
+            return
+        if index is None:
+            self._highlight_color.a = 0
+        else:
+            x1, y1, x2, y2 = self._rects[index]
+            self._highlight_line.rounded_rectangle = (x1, y1, x2 - x1, y2 - y1, 10)
+            self._highlight_color.a = HIGHLIGHT_COLOR[3]
+
+    def clear_hover(self):
+        self._hover = None
+        if self._highlight is not None:
+            self._highlight_color.a = 0
+
+
+class CardRows:
+    """Zeilen-Geometrie der Karten einer (nicht scrollenden) Box"""
+
+    def __init__(self, box):
+        self.box = box
+        self._bottoms = []  # y-Unterkante je Karte, aufsteigend
+        self._cards = []
+        self._dirty = True
+        box.bind(children=self.invalidate, pos=self.invalidate, size=self.invalidate)
+
+    def invalidate(self, *args):
+        self._dirty = True
+
+    def _rebuild(self):
+        cards = sorted((c for c in self.box.children if hasattr(c, "player")), key=lambda c: c.y)
+        self._cards = cards
+        self._bottoms = [c.y for c in cards]
+        self._dirty = False
+
+    def card_at(self, x, y):
+        """Karte unter dem Punkt (Koordinaten der Box) oder None"""
+        if self._dirty:
+            self._rebuild()
+        card = self._find(x, y)
+        if card is None:
+            # Layout evtl. seit dem letzten Aufbau verschoben (z.B. neue Karte)
+            self._rebuild()
+            card = self._find(x, y)
+        return card
+
+    def _find(self, x, y):
+        index = bisect_right(self._bottoms, y) - 1
+        if index < 0:
+            return None
+        card = self._cards[index]
+        return card if card.collide_point(x, y) else None
@@ -0,0 +1,163 @@
+"""
+Dateiauswahl für Import/Export.
+
+Ersetzt FileChooserListView: Der Inhalt eines Ordners kommt aus dem
+DirectoryScanner (Worker-Thread + Cache), das Popup wird einmal gebaut und
+wiederverwendet, und die Liste ist eine RecycleView. Dadurch öffnet sich
+IMPORT/EXPORT sofort, auch auf Speichern mit tausenden Dateien.
+"""
+import os
+
+from kivy.clock import mainthread
+from kivy.properties import BooleanProperty, ObjectProperty, StringProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+from dir_cache import DirectoryScanner, RecentDirs
+
+# Gemeinsamer Cache für alle Picker
+scanner = DirectoryScanner()
+recent_dirs = RecentDirs()
+
+
+class PickerEntry(RecycleDataViewBehavior, Button):
+    picker = ObjectProperty(None, allownone=True)
+    entry = StringProperty("")
+    is_dir = BooleanProperty(False)
+
+    def on_release(self):
+        if self.picker:
+            self.picker.activate(self.entry, self.is_dir)
+
+
+class FilePicker(Popup):
+    """
+    Wiederverwendbares Auswahl-Popup.
+
+        picker.show("Titel", on_select, mode="file", key="import",
+                    extensions=(".json",), start_path=get_start_path())
+
+    mode "file": Tippen auf eine Datei wählt sie aus.
+    mode "dir": Ordner werden geöffnet, "Ordner wählen" übernimmt den aktuellen.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("size_hint", (0.9, 0.9))
+        super().__init__(**kwargs)
+        self.mode = "file"
+        self.key = None
+        self.extensions = (".json",)
+        self.on_select = None
+        self.path = None
+
+        layout = BoxLayout(orientation="vertical", spacing=10)
+
+        top = BoxLayout(size_hint_y=None, height=60, spacing=10)
+        top.add_widget(Button(text="..", font_size="22sp", size_hint_x=None, width=90,
+                              on_release=lambda x: self.open_dir(os.path.dirname(self.path))))
+        self.path_label = Label(font_size="18sp", halign="left", valign="middle", shorten=True)
+        self.path_label.bind(size=self.path_label.setter("text_size"))
+        top.add_widget(self.path_label)
+
+        self.status_label = Label(font_size="18sp", size_hint_y=None, height=0, opacity=0)
+
+        self.view = RecycleView(viewclass=PickerEntry)
+        entries = RecycleBoxLayout(
+            orientation="vertical",
+            default_size=(None, 60),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=4
+        )
+        entries.bind(minimum_height=entries.setter("height"))
+        self.view.add_widget(entries)
+
+        self.buttons = BoxLayout(size_hint_y=None, height=60, spacing=10)
+        self.select_btn = Button(text="Ordner wählen", font_size="22sp",
+                                 on_release=lambda x: self._select(self.path))
+        self.buttons.add_widget(Button(text="Abbrechen", font_size="22sp",
+                                       on_release=lambda x: self.dismiss()))
+        self.buttons.add_widget(self.select_btn)
+
+        layout.add_widget(top)
+        layout.add_widget(self.status_label)
+        layout.add_widget(self.view)
+        layout.add_widget(self.buttons)
+        self.content = layout
+
+    def show(self, title, on_select, mode="file", key=None, extensions=(".json",),
+             start_path=None):
+        self.title = title
+        self.on_select = on_select
+        self.mode = mode
+        self.key = key
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.select_btn.disabled = mode != "dir"
+        self.select_btn.opacity = 1 if mode == "dir" else 0
+
+        start = start_path or os.path.expanduser("~")
+        if key:
+            start = recent_dirs.get(key, start)
+        self.open_dir(start)
+        self.open()
+
+    # -----------------------------------------------------
+    def open_dir(self, path):
+        """Zeigt sofort das gecachte Listing und prüft es im Hintergrund"""
+        if not path:
+            return
+        self.path = os.path.abspath(path)
+        self.path_label.text = self.path
+        self.view.scroll_y = 1
+
+        listing = scanner.cached(self.path, self.extensions)
+        if listing is not None:
+            self._show_listing(listing)
+        else:
+            self.view.data = []
+            self._set_status("Lade ...")
+        scanner.scan(self.path, self.extensions, self._on_scanned)
+
+    @mainthread
+    def _on_scanned(self, path, listing, changed, error):
+        if path != self.path:
+            return  # Inzwischen anderer Ordner geöffnet
+        if error is not None:
+            self.view.data = []
+            self._set_status("Ordner nicht lesbar")
+        elif changed:
+            self._show_listing(listing)
+
+    def _show_listing(self, listing):
+        data = [{"text": f"[{name}]", "entry": name, "is_dir": True, "picker": self}
+                for name in listing.dirs]
+        data.extend({"text": name, "entry": name, "is_dir": False, "picker": self}
+                    for name in listing.files)
+        self.view.data = data
+        self._set_status("" if data else "Keine passenden Dateien")
+
+    def _set_status(self, text):
+        self.status_label.text = text
+        self.status_label.height = 40 if text else 0
+        self.status_label.opacity = 1 if text else 0
+
+    # -----------------------------------------------------
+    def activate(self, name, is_dir):
+        path = os.path.join(self.path, name)
+        if is_dir:
+            self.open_dir(path)
+        elif self.mode == "file":
+            self._select(path)
+
+    def _select(self, path):
+        if self.key:
+            directory = path if self.mode == "dir" else os.path.dirname(path)
+            recent_dirs.remember(self.key, directory)
+        self.dismiss()
+        if self.on_select:
+            self.on_select(path)
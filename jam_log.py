@@ -0,0 +1,292 @@
+"""
+Jam-Log: eine Zeile pro gespieltem Jam, über ganze Bouts und Saisons (ohne Kivy).
+
+Statt einer Liste von dicts liegen die Jams spaltenweise in typisierten
+Arrays (array-Modul) - pro Jam rund 20 Bytes plus Verweise für die Suche:
+
+    bout, period, jam    Position im Spielplan (Jam-Nummer pro Periode)
+    line                 Label der Current Line (0 = A, 1 = B, ...; siehe
+                         LineupEngine.line_labels)
+    jammer, blocker0..3  Index in die Spieler-Tabelle (NO_PLAYER = leer)
+    pivots               Bitmaske der Blocker-Plätze mit Rolle P
+
+Wer seit dem letzten Jam in die Penalty- oder Injured-Box gesetzt wurde,
+wird als Event in eigenen Spalten abgelegt (Zeile, Spieler*in, Art).
+Spieler-IDs stehen nur einmal in der Spieler-Tabelle; pro Spieler*in wird
+eine Liste der Zeilen mitgeführt, damit "alle Jams mit X" ohne Scan
+beantwortet wird.
+
+Der LineupEngine hängt bei jeder Rotation eine Zeile an; Undo nimmt sie mit
+pop() wieder weg. Der ganze Log ist Teil von LineupEngine.export_state
+(export() kodiert die Spalten als Base64).
+"""
+import base64
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+NO_PLAYER = 0xFFFF
+BLOCKER_SEATS = 4
+
+PENALTY, INJURY = 1, 2
+EVENT_KINDS = {PENALTY: "penalty", INJURY: "injured"}
+
+# Spaltenname -> Typcode
+ROW_COLUMNS = {
+    "bout": "H",
+    "period": "B",
+    "jam": "H",
+    "line": "B",
+    "jammer": "H",
+    "blocker0": "H",
+    "blocker1": "H",
+    "blocker2": "H",
+    "blocker3": "H",
+    "pivots": "B",
+}
+EVENT_COLUMNS = {
+    "event_row": "I",
+    "event_player": "H",
+    "event_kind": "B",
+}
+PLAYER_COLUMNS = ("jammer", "blocker0", "blocker1", "blocker2", "blocker3")
+
+
+def line_label(index):
+    return chr(ord("A") + index)
+
+
+class JamLog:
+    def __init__(self):
+        self.bout = 1
+        self.period = 1
+        self.revision = 0       # zählt jede Änderung (für Caches, z.B. chemistry.py)
+        self._columns = {name: array(code) for name, code in {**ROW_COLUMNS, **EVENT_COLUMNS}.items()}
+        self._player_ids = []   # Index -> player_id
+        self._index_of = {}     # player_id -> Index
+        self._rows_of = []      # Index -> array("I") der Zeilen (Jams)
+        self._events_of = []    # Index -> array("I") der Event-Positionen
+
+    def __len__(self):
+        return len(self._columns["jam"])
+
+    def nbytes(self):
+        """Speicherbedarf der Spalten und Suchlisten in Bytes"""
+        size = sum(col.itemsize * len(col) for col in self._columns.values())
+        size += sum(rows.itemsize * len(rows) for rows in self._rows_of)
+        size += sum(events.itemsize * len(events) for events in self._events_of)
+        return size
+
+    def column(self, name):
+        """Typisierte Spalte (array) zum direkten Auswerten, z.B. per numpy.frombuffer"""
+        return self._columns[name]
+
+    def player_count(self):
+        return len(self._player_ids)
+
+    def player_id(self, index):
+        return self._player_ids[index]
+
+    def player_index(self, player_id):
+        return self._index_of.get(player_id)
+
+    def _intern(self, player_id):
+        index = self._index_of.get(player_id)
+        if index is None:
+            index = len(self._player_ids)
+            if index >= NO_PLAYER:
+                raise ValueError("Zu viele Spieler*innen im Jam-Log")
+            self._index_of[player_id] = index
+            self._player_ids.append(player_id)
+            self._rows_of.append(array("I"))
+            self._events_of.append(array("I"))
+        return index
+
+    # -----------------------------------------------------
+    # Schreiben
+    # -----------------------------------------------------
+    def next_jam(self):
+        """Jam-Nummer der nächsten Zeile (beginnt pro Periode bei 1)"""
+        cols = self._columns
+        if cols["jam"] and cols["bout"][-1] == self.bout and cols["period"][-1] == self.period:
+            return cols["jam"][-1] + 1
+        return 1
+
+    def append(self, line, jammer_id, blocker_ids, pivot_seats=(), penalty_ids=(), injured_ids=()):
+        """
+        Hängt einen Jam an.
+
+        Args:
+            line: Label-Index der Current Line (0 = A)
+            jammer_id: player_id oder None
+            blocker_ids: bis zu vier player_ids der Current Line
+            pivot_seats: Plätze (0-3) in blocker_ids mit Rolle P
+            penalty_ids, injured_ids: player_ids, die neu in Penalty- bzw.
+                Injured-Box gesetzt wurden
+
+        Returns:
+            int: Zeilennummer
+        """
+        cols = self._columns
+        row = len(self)
+        self.revision += 1
+        cols["jam"].append(self.next_jam())
+        cols["bout"].append(self.bout)
+        cols["period"].append(self.period)
+        cols["line"].append(line)
+
+        seats = list(blocker_ids[:BLOCKER_SEATS])
+        seats += [None] * (BLOCKER_SEATS - len(seats))
+        for name, player_id in zip(PLAYER_COLUMNS, [jammer_id] + seats):
+            if player_id is None:
+                cols[name].append(NO_PLAYER)
+                continue
+            index = self._intern(player_id)
+            cols[name].append(index)
+            rows = self._rows_of[index]
+            if not rows or rows[-1] != row:
+                rows.append(row)
+
+        mask = 0
+        for seat in pivot_seats:
+            mask |= 1 << seat
+        cols["pivots"].append(mask)
+
+        for kind, player_ids in ((PENALTY, penalty_ids), (INJURY, injured_ids)):
+            for player_id in player_ids:
+                index = self._intern(player_id)
+                self._events_of[index].append(len(cols["event_row"]))
+                cols["event_row"].append(row)
+                cols["event_player"].append(index)
+                cols["event_kind"].append(kind)
+        return row
+
+    def pop(self):
+        """Entfernt den letzten Jam (Undo von append)"""
+        cols = self._columns
+        row = len(self) - 1
+        if row < 0:
+            return
+        self.revision += 1
+        for name in PLAYER_COLUMNS:
+            index = cols[name][row]
+            if index != NO_PLAYER:
+                rows = self._rows_of[index]
+                if rows and rows[-1] == row:
+                    rows.pop()
+        while cols["event_row"] and cols["event_row"][-1] == row:
+            self._events_of[cols["event_player"][-1]].pop()
+            for name in EVENT_COLUMNS:
+                cols[name].pop()
+        for name in ROW_COLUMNS:
+            cols[name].pop()
+
+    # -----------------------------------------------------
+    # Abfragen
+    # -----------------------------------------------------
+    def row(self, row):
+        """Ein Jam als dict (für Anzeige und Export)"""
+        cols = self._columns
+        ids = self._player_ids
+
+        def player(name):
+            index = cols[name][row]
+            return None if index == NO_PLAYER else ids[index]
+
+        pivots = cols["pivots"][row]
+        return {
+            "bout": cols["bout"][row],
+            "period": cols["period"][row],
+            "jam": cols["jam"][row],
+            "line": line_label(cols["line"][row]),
+            "jammer": player("jammer"),
+            "blockers": [player(name) for name in PLAYER_COLUMNS[1:] if player(name) is not None],
+            "pivots": [seat for seat in range(BLOCKER_SEATS) if pivots & (1 << seat)],
+            "events": [(ids[cols["event_player"][i]], EVENT_KINDS[cols["event_kind"][i]])
+                       for i in self._event_range(row)],
+        }
+
+    def _event_range(self, row):
+        # Events sind nach Zeile sortiert → binäre Suche
+        events = self._columns["event_row"]
+        return range(bisect_left(events, row), bisect_right(events, row))
+
+    def rows_with_player(self, player_id):
+        """Zeilen aller Jams, in denen player_id als Jammer oder Blocker stand"""
+        index = self._index_of.get(player_id)
+        return list(self._rows_of[index]) if index is not None else []
+
+    def rows_with_event(self, player_id, kind=None):
+        """Zeilen mit Penalty- (PENALTY) bzw. Injury-Event (INJURY) von player_id"""
+        index = self._index_of.get(player_id)
+        if index is None:
+            return []
+        cols = self._columns
+        rows = []
+        for position in self._events_of[index]:
+            if kind is None or cols["event_kind"][position] == kind:
+                row = cols["event_row"][position]
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+        return rows
+
+    def rows_where(self, line=None, bout=None, period=None, player_id=None):
+        """
+        Zeilen, die alle angegebenen Filter erfüllen.
+
+        Args:
+            line: Label ("B") oder Label-Index (1) der Current Line
+        """
+        if isinstance(line, str):
+            line = ord(line.upper()) - ord("A")
+        filters = [(self._columns[name], value)
+                   for name, value in (("line", line), ("bout", bout), ("period", period))
+                   if value is not None]
+        rows = self.rows_with_player(player_id) if player_id is not None else range(len(self))
+        for column, value in filters:
+            rows = [row for row in rows if column[row] == value]
+        return list(rows)
+
+    # -----------------------------------------------------
+    # Persistenz (Teil von LineupEngine.export_state)
+    # -----------------------------------------------------
+    def export(self):
+        """JSON-taugliche Kopie: Spalten als Base64 (little endian)"""
+        columns = {}
+        for name, column in self._columns.items():
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            columns[name] = base64.b64encode(column.tobytes()).decode("ascii")
+        return {"bout": self.bout, "period": self.period,
+                "players": list(self._player_ids), "columns": columns}
+
+    def restore(self, data):
+        revision = self.revision
+        self.__init__()
+        self.revision = revision + 1
+        if not data:
+            return
+        self.bout = data.get("bout", 1)
+        self.period = data.get("period", 1)
+        for name, encoded in data.get("columns", {}).items():
+            column = self._columns.get(name)
+            if column is None:
+                continue
+            column.frombytes(base64.b64decode(encoded))
+            if sys.byteorder == "big":
+                column.byteswap()
+        for player_id in data.get("players", []):
+            self._intern(player_id)
+
+        # Suchlisten neu aufbauen
+        cols = self._columns
+        for row in range(len(self)):
+            for name in PLAYER_COLUMNS:
+                index = cols[name][row]
+                if index != NO_PLAYER:
+                    rows = self._rows_of[index]
+                    if not rows or rows[-1] != row:
+                        rows.append(row)
+        for position, index in enumerate(cols["event_player"]):
+            self._events_of[index].append(position)
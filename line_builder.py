@@ -0,0 +1,165 @@
+"""
+Auto-Build: Lines und Jammer-Boxen in einem Schritt aus dem Player Pool
+besetzen (ohne Kivy).
+
+Jeder freie Platz ist ein "Sitz": pro Line ohne Pivot ein Pivot-Sitz (P,
+notfalls B) und Blocker-Sitze (nur B), pro leerer Jammer-Box ein
+Jammer-Sitz. Die Kosten Spieler*in × Sitz werden mit der Ungarischen
+Methode minimiert:
+
+    - frühere Slots zuerst füllen (Current vor Next vor Third ...)
+    - Pivot-Sitz bevorzugt mit einer Pivot besetzen
+    - Spielzeit ausgleichen: wer schon viel gespielt hat (load), kommt in
+      spätere Lines bzw. bleibt bei Überzahl draußen
+
+Nur NORMAL-Spieler*innen aus dem Player Pool werden eingeteilt, bestehende
+Zuweisungen bleiben unverändert. Weil die Kosten innerhalb einer Rolle nur
+mit load wachsen, reichen pro Rolle die Kandidat*innen mit der geringsten
+Spielzeit - die Matrix bleibt auch bei großen Trainings-Rostern klein.
+"""
+from lineup_engine import LINE_SIZE
+
+INFEASIBLE = float("inf")
+SLOT_ORDER_COST = 1_000_000  # frühere Slots zuerst
+PIVOT_SEAT_COST = 10_000     # Blocker auf dem Pivot-Sitz
+BENCH_COST = 100_000_000     # bleibt im Player Pool (höher als jeder Sitz)
+
+
+def hungarian(cost):
+    """
+    Minimale Zuordnung Zeilen → Spalten (Ungarische Methode, O(n²·m)).
+
+    Args:
+        cost: n×m Matrix (Liste von Listen) mit n <= m;
+              INFEASIBLE für verbotene Paare
+
+    Returns:
+        list: Spaltenindex pro Zeile
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # Spalte -> Zeile (1-basiert, 0 = frei)
+    way = [0] * (m + 1)
+
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        minv = [INFEASIBLE] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[col0] = True
+            row0 = match[col0]
+            costs = cost[row0 - 1]
+            u_row0 = u[row0]
+            delta = INFEASIBLE
+            col1 = 0
+            for col in range(1, m + 1):
+                if used[col]:
+                    continue
+                cur = costs[col - 1] - u_row0 - v[col]
+                if cur < minv[col]:
+                    minv[col] = cur
+                    way[col] = col0
+                if minv[col] < delta:
+                    delta = minv[col]
+                    col1 = col
+            if delta == INFEASIBLE:
+                raise ValueError("Keine gültige Zuordnung")
+            for col in range(m + 1):
+                if used[col]:
+                    u[match[col]] += delta
+                    v[col] -= delta
+                else:
+                    minv[col] -= delta
+            col0 = col1
+            if match[col0] == 0:
+                break
+        # Augmentieren
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+
+    result = [0] * n
+    for col in range(1, m + 1):
+        if match[col]:
+            result[match[col] - 1] = col - 1
+    return result
+
+
+def _seat_cost(player, seat, load, slot_count):
+    slot_index, kind = seat
+    if kind == "blocker" and player["role"] != "B":
+        return INFEASIBLE
+    cost = slot_index * SLOT_ORDER_COST
+    # Mehr Spielzeit → spätere Slots (kleinerer Faktor)
+    cost += load.get(player["id"], 0) * (slot_count - slot_index)
+    if kind == "pivot" and player["role"] != "P":
+        cost += PIVOT_SEAT_COST
+    return cost
+
+
+def _assign(candidates, seats, load, slot_count):
+    """(Spieler*in, Sitz)-Paare für die beste Zuordnung; Bank = kein Sitz"""
+    if not candidates or not seats:
+        return []
+    bench = max(0, len(candidates) - len(seats))
+    matrix = [
+        [_seat_cost(p, seat, load, slot_count) for seat in seats] + [BENCH_COST] * bench
+        for p in candidates
+    ]
+    columns = hungarian(matrix)
+    return [(p, seats[col]) for p, col in zip(candidates, columns) if col < len(seats)]
+
+
+def _lowest_load(players, count, load):
+    ranked = sorted(enumerate(players), key=lambda item: (load.get(item[1]["id"], 0), item[0]))
+    return [p for _, p in ranked[:count]]
+
+
+def build_plan(engine, load=None):
+    """
+    Berechnet die Auto-Build-Zuweisung, ohne den Engine zu verändern.
+
+    Args:
+        load: dict player_id -> bisherige Spielzeit (z.B. gespielte Jams);
+              None = alle gleich
+
+    Returns:
+        list: (Spieler*in, Box-Name)-Paare, Lines und Jammer-Boxen in Slot-Reihenfolge
+    """
+    load = load or {}
+    pool = [p for p in engine.players
+            if engine.is_in_player_pool(p) and p.get("status", "NORMAL") == "NORMAL"]
+
+    # Sitze: (Slot-Index, Art)
+    line_seats = []
+    for index, name in enumerate(engine.line_slots):
+        line = engine.slot(name)
+        free = LINE_SIZE - len(line)
+        if free <= 0:
+            continue
+        has_pivot = any(p["role"] == "P" for p in line)
+        line_seats.append((index, "blocker" if has_pivot else "pivot"))
+        line_seats.extend((index, "blocker") for _ in range(free - 1))
+    jammer_seats = [(index, "jammer") for index, name in enumerate(engine.jammer_slots)
+                    if not engine.slot(name)]
+
+    pivot_seats = sum(1 for _, kind in line_seats if kind == "pivot")
+    pivots = _lowest_load([p for p in pool if p["role"] == "P"], pivot_seats, load)
+    blockers = _lowest_load([p for p in pool if p["role"] == "B"], len(line_seats), load)
+    jammers = _lowest_load([p for p in pool if p["role"] == "J"], len(jammer_seats), load)
+
+    plan = []
+    for player, (index, _) in _assign(jammers, jammer_seats, load, len(engine.jammer_slots)):
+        plan.append((player, engine.jammer_slots[index]))
+    for player, (index, _) in _assign(pivots + blockers, line_seats, load, len(engine.line_slots)):
+        plan.append((player, engine.line_slots[index]))
+
+    slot_order = {name: i for i, name in enumerate(engine.box_slots)}
+    plan.sort(key=lambda item: slot_order[item[1]])
+    return plan
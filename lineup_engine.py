@@ -0,0 +1,902 @@
+"""
+Lineup-Logik ohne Kivy.
+
+Der LineupEngine hält Spieler*innen und alle Box-Zuweisungen als normale
+Python-Listen. MainLayout delegiert sämtliche Roster- und Rotationslogik
+hierher, damit sie ohne Fenster getestet und gebenchmarkt werden kann
+(siehe bench_lineup.py).
+
+Jede Spieler*in hat eine stabile "id". Der Index player_id -> Box wird bei
+jeder Änderung mitgeführt, Mitgliedschaftstests sind damit O(1) statt
+Wertvergleiche über alle Listen.
+
+Änderungen zwischen zwei checkpoint()-Aufrufen werden als kleiner,
+umkehrbarer Record im Undo-Verlauf abgelegt (siehe undo_history.py).
+
+Die Zahl der Line- und Jammer-Slots ist pro Engine einstellbar (z.B. vier
+Lines fürs Scrimmage); die Rotation läuft für jede Anzahl über rotation.py.
+
+Jede Rotation zählt den gerade gespielten Jam im PlayingTimeTracker
+(playing_time.py) und hängt ihn an den JamLog (jam_log.py) an; der Jam ist
+Teil des Undo-Records. line_labels merkt sich, welche Line (A, B, ...)
+gerade in welchem Slot steht - die Labels rotieren mit den Spieler*innen.
+"""
+import uuid
+
+from jam_log import JamLog
+from playing_time import PlayingTimeTracker
+from rotation import fill_plan, jammer_refill_source, rotate_groups, rotation_plan
+from undo_history import UndoHistory, is_empty_record
+
+JAMMER_SLOTS = ("current_jammer", "next_jammer", "third_jammer")
+LINE_SLOTS = ("line_a", "line_b", "line_c")
+BOX_SLOTS = JAMMER_SLOTS + LINE_SLOTS + ("penalty", "injured")
+EVENT_BOXES = ("penalty", "injured")  # Zuweisung = Event im JamLog
+
+ROLES = ("J", "B", "P")
+STATUSES = ("NORMAL", "REST", "INJURED")
+
+LINE_SIZE = 4
+
+
+def line_slot_names(count):
+    """Line-Slots line_a, line_b, ... für count Lines"""
+    return tuple(f"line_{chr(ord('a') + i)}" for i in range(count))
+
+
+# Vier Lines fürs Scrimmage: LineupEngine(line_slots=SCRIMMAGE_LINE_SLOTS)
+SCRIMMAGE_LINE_SLOTS = line_slot_names(4)
+
+
+def line_slots_for(assignments):
+    """Line-Slots passend zu exportierten Zuweisungen (mindestens drei)"""
+    count = sum(1 for name in assignments or () if name.startswith("line_"))
+    return line_slot_names(count) if count > len(LINE_SLOTS) else LINE_SLOTS
+
+
+def new_player_id():
+    return uuid.uuid4().hex[:12]
+
+
+class LineupEngine:
+    def __init__(self, players=None, line_slots=LINE_SLOTS, jammer_slots=JAMMER_SLOTS):
+        # Slot-Reihenfolge: Current zuerst, dann Next, Third, ...
+        self.line_slots = tuple(line_slots)
+        self.jammer_slots = tuple(jammer_slots)
+        self.box_slots = self.jammer_slots + self.line_slots + ("penalty", "injured")
+
+        self.players = []
+        self.slots = {name: [] for name in self.box_slots}
+        self._by_id = {}    # player_id -> Spieler-Dict
+        self._slot_of = {}  # player_id -> Box-Name (fehlt = nur Player Pool)
+
+        # Undo/Redo: Änderungen seit dem letzten Checkpoint
+        self.history = UndoHistory()
+        self._tracking = True
+        self._pending_slots = {}   # Box-Name -> IDs vor der ersten Änderung
+        self._pending_status = {}  # player_id -> [Status, REST-Marke] vor der ersten Änderung
+        self._pending_roster = []  # ["add" | "del", index, Spieler-Kopie]
+        self._pending_jams = []    # [player_ids, Zähler vorher, JamLog-Zeile] pro Jam
+        self._pending_labels = None    # line_labels vor der ersten Änderung
+        self._pending_position = None  # [Bout, Periode] vor der ersten Änderung
+
+        # Spielzeit pro Spieler*in (Jams, in Folge, seit REST)
+        self.playing_time = PlayingTimeTracker()
+
+        # Jam für Jam über ganze Bouts/Saisons; Label-Index (0 = A) pro Line-Slot
+        self.jam_log = JamLog()
+        self.line_labels = tuple(range(len(self.line_slots)))
+        # Seit dem letzten Jam in Penalty-/Injured-Box gesetzt (Events für den JamLog)
+        self._box_arrivals = []
+
+        # Optionales SessionJournal: bekommt jeden Undo-Schritt als Record
+        self.journal = None
+
+        if players:
+            self.load_players(players)
+            self.reset_history()
+
+    # -----------------------------------------------------
+    # Roster
+    # -----------------------------------------------------
+    def load_players(self, raw_players):
+        """
+        Übernimmt eine Spieler-Liste (z.B. aus players.json).
+
+        Migration: Fügt "status" Feld hinzu falls nicht vorhanden und vergibt
+        eine "id" an Datensätze ohne (oder mit doppelter) ID.
+        Alle Box-Zuweisungen werden geleert.
+
+        Returns:
+            bool: True wenn mindestens ein Datensatz migriert wurde
+        """
+        migrated = False
+        self.clear_boxes()
+        for index in range(len(self.players) - 1, -1, -1):
+            self._record_roster("del", index, self.players[index])
+        self.players = []
+        self._by_id = {}
+
+        for player in raw_players:
+            if "status" not in player:
+                player["status"] = "NORMAL"
+                migrated = True
+            pid = player.get("id")
+            if not pid or pid in self._by_id:
+                pid = player["id"] = self._unique_id()
+                migrated = True
+            self._by_id[pid] = player
+            self._record_roster("add", len(self.players), player)
+            self.players.append(player)
+        return migrated
+
+    def _unique_id(self):
+        pid = new_player_id()
+        while pid in self._by_id:
+            pid = new_player_id()
+        return pid
+
+    def add_player(self, name, number, role):
+        """
+        Legt eine neue Spieler*in mit NORMAL Status an.
+
+        Returns:
+            dict | None: Die neue Spieler*in oder None bei ungültiger Eingabe
+        """
+        name = (name or "").strip()
+        number = (number or "").strip()
+        role = (role or "").strip().upper()
+
+        if not name or not number or role not in ROLES:
+            print(f"Invalid player input: name={name}, number={number}, role={role}")
+            return None
+
+        player = {
+            "id": self._unique_id(),
+            "name": name,
+            "number": number,
+            "role": role,
+            "status": "NORMAL"
+        }
+        self._record_roster("add", len(self.players), player)
+        self._insert_player(len(self.players), player)
+        return player
+
+    def delete_player(self, player):
+        player = self.resolve(player)
+        if player is None:
+            return
+
+        self._record_roster("del", self.players.index(player), player)
+        self._remove_player(player)
+
+    def _insert_player(self, index, player):
+        self._by_id[player["id"]] = player
+        self.players.insert(index, player)
+
+    def _remove_player(self, player):
+        # Aus allen Boxen entfernen
+        self._unplace(player)
+
+        del self._by_id[player["id"]]
+        self.players.remove(player)
+
+    def _set_status(self, player, status):
+        if self._tracking and player["id"] not in self._pending_status:
+            self._pending_status[player["id"]] = [player.get("status"),
+                                                  self.playing_time.rest_mark(player["id"])]
+        player["status"] = status
+        if status == "REST":
+            self.playing_time.mark_rest(player["id"])
+
+    # -----------------------------------------------------
+    # ID-Index
+    # -----------------------------------------------------
+    def resolve(self, player):
+        """
+        Liefert das kanonische Spieler-Dict zu einem Dict oder einer ID.
+
+        Damit funktionieren auch Kopien (z.B. nach Import oder Undo), solange
+        sie die gleiche "id" tragen.
+        """
+        if isinstance(player, dict):
+            player = player.get("id")
+        return self._by_id.get(player)
+
+    def get_player(self, player_id):
+        return self._by_id.get(player_id)
+
+    def slot(self, name):
+        return self.slots[name]
+
+    def slot_of(self, player):
+        """Box-Name der Spieler*in oder None wenn nur im Player Pool"""
+        return self._slot_of.get(player["id"])
+
+    def assigned_ids(self):
+        """Menge (View) aller player_ids, die in einer Box sind"""
+        return self._slot_of.keys()
+
+    def is_in_player_pool(self, player):
+        """Prüft ob Spieler*in nur im Player Pool ist (nicht in Boxen/Lines)"""
+        return player["id"] not in self._slot_of
+
+    def _place(self, player, slot_name):
+        """Hängt Spieler*in an eine Box an und aktualisiert den Index"""
+        self._touch(slot_name)
+        self.slots[slot_name].append(player)
+        self._slot_of[player["id"]] = slot_name
+        if slot_name in EVENT_BOXES:
+            self._box_arrivals.append(player)
+
+    def _unplace(self, player):
+        """
+        Entfernt Spieler*in aus ihrer Box (falls vorhanden).
+
+        Returns:
+            str | None: Name der Box, aus der entfernt wurde
+        """
+        slot_name = self._slot_of.pop(player["id"], None)
+        if slot_name is not None:
+            self._touch(slot_name)
+            lst = self.slots[slot_name]
+            # Identitätsvergleich statt Wertvergleich über ganze Dicts
+            for i, p in enumerate(lst):
+                if p is player:
+                    del lst[i]
+                    break
+        return slot_name
+
+    def _move(self, player, slot_name):
+        self._unplace(player)
+        self._place(player, slot_name)
+
+    def _set_slot(self, slot_name, players):
+        """Ersetzt den Inhalt einer Box (Spieler*innen müssen vorher entfernt sein)"""
+        self._touch(slot_name)
+        self.slots[slot_name] = list(players)
+        for p in self.slots[slot_name]:
+            self._slot_of[p["id"]] = slot_name
+
+    def _take_slots(self, slot_names):
+        """Leert mehrere Boxen und gibt ihre bisherigen Inhalte zurück"""
+        taken = {}
+        for name in slot_names:
+            self._touch(name)
+            taken[name] = self.slots[name]
+            self.slots[name] = []
+            for p in taken[name]:
+                del self._slot_of[p["id"]]
+        return taken
+
+    # -----------------------------------------------------
+    # Zuweisungen
+    # -----------------------------------------------------
+    def drop_to_player_pool(self, player):
+        """
+        Spieler*in zurück in den Player Pool.
+
+        Returns:
+            bool: True wenn sich der Status geändert hat (aus Injured Box geholt)
+        """
+        player = self.resolve(player)
+        if player is None:
+            return False
+
+        # Nur aus Lines/Jammer entfernen, NICHT aus Player Pool!
+        # Prüfe dabei ob Spieler*in in Injured Box war
+        was_injured = self._unplace(player) == "injured"
+
+        # Wenn aus Injured Box geholt: Status auf NORMAL setzen
+        if was_injured:
+            self._set_status(player, "NORMAL")
+        return was_injured
+
+    def can_assign(self, player, target):
+        """
+        Prüft die Zuweisungsregeln für eine Box.
+
+        Returns:
+            str | None: Fehlermeldung oder None wenn erlaubt
+        """
+        role = player["role"]
+
+        # Rollenvalidierung
+        if role == "J" and target in self.line_slots:
+            return "Jammer can't be in Line"
+        if role != "J" and target in self.jammer_slots:
+            return "Blocker/Pivot can't be Jammer"
+
+        # Jammer-Boxen dürfen nur 1 Jammer haben
+        if target in self.jammer_slots and self.slots[target]:
+            return "Jammer box already full"
+
+        # Lines dürfen maximal 4 Spieler*innen haben
+        if target in self.line_slots:
+            lst = self.slots[target]
+            if len(lst) >= LINE_SIZE:
+                return "Line already has 4 players"
+            # Maximal 1 Pivot pro Line
+            if role == "P" and any(p["role"] == "P" for p in lst):
+                return "Line already has a Pivot"
+
+        return None
+
+    def drop_assign_to(self, player, target):
+        """
+        Weist Spieler*in einer Box zu.
+
+        Returns:
+            bool: True wenn die Zuweisung durchgeführt wurde
+        """
+        player = self.resolve(player)
+        if player is None:
+            return False
+
+        error = self.can_assign(player, target)
+        if error:
+            print(f"Validation failed: {error}")
+            return False
+
+        # Entfernen aus allen anderen Boxen (außer Player Pool)
+        self._unplace(player)
+
+        # SPECIAL: Drop in Injured Box → Status auf INJURED setzen
+        if target == "injured":
+            if player["status"] != "INJURED":
+                self._set_status(player, "INJURED")
+                print(f"Status changed: {player['name']} → INJURED")
+
+        self._place(player, target)
+        return True
+
+    def assignment_targets(self, player):
+        """Mögliche Ziele für das Zuordnen-Popup als (Text, Ziel)-Paare"""
+        targets = []
+        current_slot = self.slot_of(player)
+
+        if current_slot is not None:
+            targets.append(("Zurück in Playerpool", "player_pool"))
+
+        if player["role"] == "J":
+            candidates = self.jammer_slots + ("penalty",)
+        else:
+            candidates = self.line_slots + ("penalty",)
+
+        for t in candidates:
+            if t != current_slot:
+                targets.append((t.replace("_", " ").title(), t))
+        return targets
+
+    # -----------------------------------------------------
+    # Status-Management
+    # -----------------------------------------------------
+    def change_player_status(self, player, new_status):
+        """Ändert den Status einer Spieler*in"""
+        player = self.resolve(player)
+        if player is None:
+            return
+        old_status = player.get("status", "NORMAL")
+        self._set_status(player, new_status)
+
+        print(f"Status-Änderung: {player['name']} von {old_status} → {new_status}")
+
+        # INJURED-Logik: Aus allen Lines/Jammer-Boxen entfernen, in Injured Box
+        if new_status == "INJURED":
+            # Aus Lines/Jammer entfernen (NICHT aus Player Pool!)
+            # und in Injured Box hinzufügen (falls nicht schon drin)
+            if self.slot_of(player) != "injured":
+                self._move(player, "injured")
+
+        # Zurück von INJURED zu NORMAL/REST: Aus Injured Box entfernen + Auto-Assignment
+        elif old_status == "INJURED" and new_status in ("NORMAL", "REST"):
+            if self.slot_of(player) == "injured":
+                self._unplace(player)
+                # Automatisch in nächste freie Box einfügen
+                self._auto_assign_recovered_player(player)
+
+    def _auto_assign_recovered_player(self, player):
+        """
+        Weist einen Spieler automatisch einer freien Box zu nach Rückkehr von INJURED.
+
+        Priorität für Jammer: Next → Third → Current
+        Priorität für Blocker/Pivot: Next Line → Third Line → Current Line
+        """
+        role = player["role"]
+
+        if role == "J":
+            # Jammer: Suche freie Jammer-Box
+            for slot_name in self.jammer_slots[1:] + self.jammer_slots[:1]:
+                if not self.slots[slot_name]:
+                    self._place(player, slot_name)
+                    print(f"Auto-Assignment: {player['name']} → {_slot_label(slot_name)}")
+                    return
+            print(f"Auto-Assignment: Alle Jammer-Boxen belegt, {player['name']} bleibt im Player Pool")
+
+        else:  # Blocker oder Pivot
+            # Suche Line mit Platz (max 4 Spieler*innen)
+            for slot_name in self.line_slots[1:] + self.line_slots[:1]:
+                line_list = self.slots[slot_name]
+                if len(line_list) < LINE_SIZE:
+                    # Prüfe Pivot-Regel (max 1 Pivot pro Line)
+                    if role == "P" and any(p["role"] == "P" for p in line_list):
+                        continue  # Diese Line hat schon einen Pivot
+
+                    self._place(player, slot_name)
+                    print(f"Auto-Assignment: {player['name']} → {_slot_label(slot_name)}")
+                    return
+
+            # Alle Lines voll
+            print(f"Auto-Assignment: Alle Lines voll, {player['name']} bleibt im Player Pool")
+
+    # -----------------------------------------------------
+    # Line-Validierung
+    # -----------------------------------------------------
+    def is_line_complete(self, line_list):
+        """
+        Prüft ob eine Line spielbar ist.
+
+        Eine Line ist vollständig wenn:
+        - Genau 4 Spieler*innen vorhanden sind UND
+        - Maximal 1 Pivot dabei ist
+
+        Returns:
+            bool: True wenn Line spielbar, False wenn unvollständig
+        """
+        if len(line_list) != LINE_SIZE:
+            return False
+
+        pivot_count = sum(1 for p in line_list if p["role"] == "P")
+        return pivot_count <= 1
+
+    def get_line_info(self, line_list):
+        """
+        Gibt detaillierte Info über eine Line zurück.
+        """
+        count = len(line_list)
+        pivot_count = sum(1 for p in line_list if p["role"] == "P")
+        blocker_count = sum(1 for p in line_list if p["role"] == "B")
+
+        info = f"Aktuell: {count}/4 Spieler*innen\n"
+        info += f"Blocker: {blocker_count}, Pivot: {pivot_count}\n"
+
+        if count < LINE_SIZE:
+            missing = LINE_SIZE - count
+            info += f"Fehlend: {missing} Spieler*innen"
+        elif pivot_count > 1:
+            info += f"Problem: Zu viele Pivots ({pivot_count})"
+
+        return info
+
+    # -----------------------------------------------------
+    # Auto-Fill
+    # -----------------------------------------------------
+    def auto_fill_current_line(self):
+        """
+        Füllt Current Line automatisch mit Spieler*innen aus Next/Third Line.
+
+        Priorität:
+        1. Pivot holen (falls keiner in Current Line)
+        2. Blocker auffüllen bis 4 Spieler*innen
+
+        Quell-Priorität: Next Line (B) → Third Line (C) → weitere Lines
+
+        Returns:
+            bool: True wenn erfolgreich aufgefüllt, False wenn nicht genug Ersatz
+        """
+        current = self.slots[self.line_slots[0]]
+        missing = LINE_SIZE - len(current)
+        if missing <= 0:
+            return True  # Bereits voll
+
+        print(f"Auto-Fill: {missing} Spieler*innen fehlen in Current Line")
+
+        sources = self.line_slots[1:]
+        picks = fill_plan(current, [self.slots[name] for name in sources], LINE_SIZE)
+        for source, player in picks:
+            kind = "Pivot" if player["role"] == "P" else "Blocker"
+            print(f"Auto-Fill: Nehme {kind} {player['name']} aus {sources[source]}")
+            self._move(player, self.line_slots[0])
+        filled = len(picks)
+
+        # Erfolgreich wenn Current Line jetzt vollständig ist
+        success = self.is_line_complete(self.slots[self.line_slots[0]])
+
+        if success:
+            print(f"Auto-Fill: Erfolgreich! {filled} Spieler*innen verschoben")
+        else:
+            print(f"Auto-Fill: Nur {filled} Spieler*innen gefunden, Current Line noch unvollständig")
+
+        return success
+
+    # -----------------------------------------------------
+    # Rotation
+    # -----------------------------------------------------
+    def rotate_lineup(self):
+        """
+        Intelligente Rotation: Rotiert nur zwischen tatsächlich belegten Boxen.
+
+        Jammer und Lines werden unabhängig voneinander rotiert.
+        REST-Spieler werden übersprungen und automatisch ersetzt.
+
+        Returns:
+            bool: False wenn Current Line unvollständig ist (keine Rotation)
+        """
+        current_line = self.line_slots[0]
+        if not self.is_line_complete(self.slots[current_line]):
+            return False
+
+        self.force_rotate()
+
+        # Auto-Fill wenn Current Line durch REST-Filter unvollständig wurde
+        if len(self.slots[current_line]) < LINE_SIZE:
+            print(f"Current Line nach Rotation unvollständig ({len(self.slots[current_line])}/4) - fülle automatisch auf")
+            self.auto_fill_current_line()
+
+        # Prüfe ob Current Jammer leer ist (REST wurde übersprungen)
+        current_jammer = self.jammer_slots[0]
+        if not self.slots[current_jammer]:
+            index = jammer_refill_source([self.slots[name] for name in self.jammer_slots])
+            if index is not None:
+                source = self.jammer_slots[index]
+                jammer = self.slots[source][0]
+                self._move(jammer, current_jammer)
+                print(f"Current Jammer war leer - {jammer['name']} aus {_slot_label(source)} geholt")
+
+        return True
+
+    def force_rotate(self):
+        """Rotation ohne Vollständigkeits-Check"""
+        self._record_jam()
+        self._rotate_slots(self.jammer_slots)
+        self._rotate_slots(self.line_slots)
+
+    def autofill_and_rotate(self):
+        """
+        Füllt Current Line auf und rotiert danach.
+
+        Returns:
+            bool: False wenn nicht aufgefüllt werden konnte (keine Rotation)
+        """
+        if not self.auto_fill_current_line():
+            return False
+        self.force_rotate()
+        return True
+
+    def _record_jam(self):
+        """Zählt die aktuelle Besetzung (Current Jammer + Current Line) als gespielten Jam"""
+        jammers = self.slots[self.jammer_slots[0]]
+        line = self.slots[self.line_slots[0]]
+        player_ids = [p["id"] for p in jammers + line]
+        if not player_ids:
+            return
+        before = self.playing_time.record_jam(player_ids)
+
+        row = [
+            self.line_labels[0],
+            jammers[0]["id"] if jammers else None,
+            [p["id"] for p in line],
+            [seat for seat, p in enumerate(line) if p["role"] == "P"],
+            self._arrival_ids("penalty"),
+            self._arrival_ids("injured"),
+        ]
+        self._box_arrivals = []
+        self.jam_log.append(*row)
+        if self._tracking:
+            self._pending_jams.append([player_ids, before, row])
+
+    def _arrival_ids(self, slot_name):
+        """IDs, die seit dem letzten Jam in slot_name gekommen und noch dort sind"""
+        ids = []
+        for p in self._box_arrivals:
+            if self._slot_of.get(p["id"]) == slot_name and p["id"] not in ids:
+                ids.append(p["id"])
+        return ids
+
+    def start_period(self, new_bout=False):
+        """Folgende Jams zählen zur nächsten Periode (bzw. Periode 1 des nächsten Bouts)"""
+        log = self.jam_log
+        if self._tracking and self._pending_position is None:
+            self._pending_position = [log.bout, log.period]
+        if new_bout:
+            log.bout += 1
+            log.period = 1
+        else:
+            log.period += 1
+
+    def _set_line_labels(self, labels):
+        if self._tracking and self._pending_labels is None:
+            self._pending_labels = list(self.line_labels)
+        self.line_labels = tuple(labels)
+
+    def _rotate_slots(self, slot_names):
+        """
+        Rotiert eine Slot-Gruppe (Jammer oder Lines) nach dem Plan für ihr
+        Belegungsmuster (siehe rotation.py).
+        """
+        groups = [self.slots[name] for name in slot_names]
+        rotated = rotate_groups(groups)
+        if rotated is None:
+            # 0 oder 1 belegter Slot → keine Rotation möglich
+            return
+
+        if slot_names == self.line_slots:
+            # Line-Labels wandern mit (gleicher Plan wie in rotate_groups)
+            labels = list(self.line_labels)
+            plan = rotation_plan(tuple(bool(players) for players in groups))
+            for origin, target in enumerate(plan):
+                if target is not None:
+                    labels[target] = self.line_labels[origin]
+            self._set_line_labels(labels)
+
+        groups, held = rotated
+        for name, players in zip(slot_names, groups):
+            self._set_slot(name, players)
+        if held:
+            print(f"REST-Spieler bleiben: {[p['name'] for p in held]}")
+
+    # -----------------------------------------------------
+    def clear_boxes(self):
+        for name in self.box_slots:
+            if self.slots[name]:
+                self._touch(name)
+                self.slots[name] = []
+        self._slot_of.clear()
+        # Leere Boxen → neue Lines, Labels wieder A, B, C, ...
+        self._set_line_labels(range(len(self.line_slots)))
+
+    # -----------------------------------------------------
+    # Undo/Redo
+    # -----------------------------------------------------
+    def _touch(self, slot_name):
+        """Merkt sich den Inhalt einer Box vor ihrer ersten Änderung seit dem Checkpoint"""
+        if self._tracking and slot_name not in self._pending_slots:
+            self._pending_slots[slot_name] = [p["id"] for p in self.slots[slot_name]]
+
+    def _record_roster(self, op, index, player):
+        if self._tracking:
+            self._pending_roster.append([op, index, dict(player)])
+
+    def _collect_pending(self):
+        """Baut aus den Änderungen seit dem letzten Checkpoint einen Record"""
+        slots = {}
+        for name, old_ids in self._pending_slots.items():
+            new_ids = [p["id"] for p in self.slots[name]]
+            if new_ids != old_ids:
+                slots[name] = [old_ids, new_ids]
+
+        status = {}
+        for pid, (old_status, old_mark) in self._pending_status.items():
+            player = self._by_id.get(pid)
+            new_status = player["status"] if player is not None else None
+            new_mark = self.playing_time.rest_mark(pid)
+            if new_mark != old_mark:
+                status[pid] = [old_status, new_status, old_mark, new_mark]
+            elif new_status != old_status:
+                status[pid] = [old_status, new_status]
+
+        record = {"slots": slots, "status": status, "roster": self._pending_roster}
+        if self._pending_jams:
+            record["jams"] = self._pending_jams
+        if self._pending_labels is not None and self._pending_labels != list(self.line_labels):
+            record["lines"] = [self._pending_labels, list(self.line_labels)]
+        position = [self.jam_log.bout, self.jam_log.period]
+        if self._pending_position is not None and self._pending_position != position:
+            record["period"] = [self._pending_position, position]
+        self._pending_slots = {}
+        self._pending_status = {}
+        self._pending_roster = []
+        self._pending_jams = []
+        self._pending_labels = None
+        self._pending_position = None
+        return record
+
+    def reset_history(self):
+        """Aktueller Zustand wird Ausgangspunkt, bisheriger Verlauf wird verworfen"""
+        self._collect_pending()
+        self.history.clear()
+
+    def checkpoint(self):
+        """
+        Speichert alle Änderungen seit dem letzten Checkpoint als einen
+        Undo-Schritt. Kosten: O(geänderte Spieler*innen), nicht O(Roster).
+
+        Returns:
+            dict | None: Der gespeicherte Record oder None wenn sich nichts geändert hat
+        """
+        record = self._collect_pending()
+        if is_empty_record(record):
+            print("History: keine Änderung")
+            return None
+
+        self.history.push(record)
+        if self.journal is not None:
+            self.journal.append(record)
+        print(f"History saved: {self.history.position}/{len(self.history)} steps "
+              f"({self.history.total_bytes} Bytes)")
+        return record
+
+    def undo(self):
+        """
+        Macht den letzten Schritt rückgängig. Nicht gespeicherte Änderungen
+        seit dem letzten Checkpoint werden dabei verworfen.
+
+        Returns:
+            bool: False wenn es keinen Schritt mehr gibt
+        """
+        self._discard_pending()
+        record = self.history.undo()
+        if record is None:
+            return False
+        self.apply_record(record, reverse=True)
+        if self.journal is not None:
+            self.journal.append(record, undo=True)
+        return True
+
+    def redo(self):
+        """
+        Stellt den zuletzt rückgängig gemachten Schritt wieder her.
+
+        Returns:
+            bool: False wenn es keinen Schritt mehr gibt
+        """
+        self._discard_pending()
+        record = self.history.redo()
+        if record is None:
+            return False
+        self.apply_record(record)
+        if self.journal is not None:
+            self.journal.append(record)
+        return True
+
+    def _discard_pending(self):
+        record = self._collect_pending()
+        if not is_empty_record(record):
+            self.apply_record(record, reverse=True)
+
+    def apply_record(self, record, reverse=False):
+        """Wendet einen Record vorwärts (Redo) oder rückwärts (Undo) an"""
+        self._tracking = False
+        try:
+            roster = reversed(record["roster"]) if reverse else record["roster"]
+            for op, index, data in roster:
+                if (op == "add") != reverse:
+                    self._insert_player(index, dict(data))
+                else:
+                    self._remove_player(self._by_id[data["id"]])
+
+            side = 0 if reverse else 1
+            for pid, values in record["status"].items():
+                player = self._by_id.get(pid)
+                if player is not None and values[side] is not None:
+                    player["status"] = values[side]
+                    # Ältere Journal-Records ohne REST-Marken
+                    if len(values) < 4 and not reverse and values[side] == "REST":
+                        self.playing_time.mark_rest(pid)
+
+            slot_ids = {name: ids[side] for name, ids in record["slots"].items()}
+            self._take_slots(slot_ids)
+            for name, ids in slot_ids.items():
+                self._set_slot(name, [self._by_id[pid] for pid in ids])
+
+            if "lines" in record:
+                self.line_labels = tuple(record["lines"][side])
+
+            # Periodenwechsel vor den Jams desselben Records
+            jams = record.get("jams", ())
+            # REST-Marken sind absolute Werte und werden nach den Jams gesetzt:
+            # unrecord_jam stellt ganze Zähler (samt Marke) von vor dem Jam her
+            marks = [(pid, values[2 + side]) for pid, values in record["status"].items()
+                     if len(values) == 4]
+            if reverse:
+                for entry in reversed(jams):
+                    self.playing_time.unrecord_jam(entry[1])
+                    if len(entry) > 2:
+                        self.jam_log.pop()
+                        # Box-Events des Jams sind wieder offen für den nächsten Jam
+                        self._box_arrivals = [self._by_id[pid] for pid in entry[2][4] + entry[2][5]
+                                              if pid in self._by_id]
+                for pid, mark in marks:
+                    self.playing_time.set_rest_mark(pid, mark)
+                if "period" in record:
+                    self.jam_log.bout, self.jam_log.period = record["period"][0]
+            else:
+                if "period" in record:
+                    self.jam_log.bout, self.jam_log.period = record["period"][1]
+                for entry in jams:
+                    self.playing_time.record_jam(entry[0])
+                    if len(entry) > 2:
+                        self.jam_log.append(*entry[2])
+                        self._box_arrivals = []
+                for pid, mark in marks:
+                    self.playing_time.set_rest_mark(pid, mark)
+        finally:
+            self._tracking = True
+
+    # -----------------------------------------------------
+    # Import / Export
+    # -----------------------------------------------------
+    def load_lineup(self, data):
+        """
+        Übernimmt importierte Daten (Spieler-Liste oder Lineup-Struktur).
+
+        Zuweisungen werden über die "id" auf die Spieler*innen abgebildet;
+        ältere Exporte ohne IDs werden über Name/Nummer/Rolle zugeordnet.
+
+        Returns:
+            str | None: "lineup", "players" oder None bei ungültigem Format
+        """
+        # FALL 1: Neue Struktur mit "players" und "assignments"
+        if isinstance(data, dict) and "players" in data:
+            self.load_players(data["players"])
+            assignments = data.get("assignments")
+            if assignments is None:
+                return "players"
+            self._load_assignments(assignments)
+            return "lineup"
+
+        # FALL 2: Alte Struktur - einfache Liste von Spielern
+        if isinstance(data, list):
+            self.load_players(data)
+            return "players"
+
+        return None
+
+    def _load_assignments(self, assignments):
+        by_value = {}
+        for player in self.players:
+            by_value.setdefault(_value_key(player), []).append(player)
+
+        for name in self.box_slots:
+            for entry in assignments.get(name, []):
+                player = self.resolve(entry)
+                if player is None:
+                    candidates = by_value.get(_value_key(entry))
+                    player = candidates.pop(0) if candidates else None
+                if player is None or player["id"] in self._slot_of:
+                    print(f"Import: Zuweisung in {name} übersprungen ({entry.get('name')})")
+                    continue
+                self._place(player, name)
+        # Importierte Box-Belegung ist kein neues Event
+        self._box_arrivals = []
+
+    def load_state(self, state):
+        """Lädt einen Zustand aus export_state() (Zuweisungen als IDs)"""
+        self.load_players(state["players"])
+        self.playing_time.restore(state.get("playing_time"))
+        self.jam_log.restore(state.get("jam_log"))
+        labels = state.get("line_labels")
+        if labels is not None and len(labels) == len(self.line_slots):
+            self.line_labels = tuple(labels)
+        for name in self.box_slots:
+            for pid in state["assignments"].get(name, []):
+                player = self._by_id.get(pid)
+                if player is not None and pid not in self._slot_of:
+                    self._place(player, name)
+        # Wer beim Laden schon in der Box sitzt, ist kein neues Event
+        self._box_arrivals = []
+
+    def export_state(self):
+        """Kopie des aktuellen Zustands mit Zuweisungen als ID-Listen"""
+        return {
+            "players": [dict(p) for p in self.players],
+            "assignments": {name: [p["id"] for p in self.slots[name]] for name in self.box_slots},
+            "playing_time": self.playing_time.export(),
+            "jam_log": self.jam_log.export(),
+            "line_labels": list(self.line_labels)
+        }
+
+    def export_lineup(self):
+        """Komplettes Lineup (Spieler + Zuweisungen) im Export-Format"""
+        return {
+            "players": self.players,
+            "assignments": {name: self.slots[name] for name in self.box_slots}
+        }
+
+
+def _slot_label(slot_name):
+    return slot_name.replace("_", " ").title()
+
+
+def _value_key(player):
+    return (player.get("name"), player.get("number"), player.get("role"))
@@ -0,0 +1,138 @@
+"""
+Vorschau der nächsten Jams, ohne den LineupEngine zu verändern.
+
+simulate() spielt ROTATE auf flachen Listen-Kopien der Line- und
+Jammer-Slots durch und nutzt dabei dieselben Regeln wie der Engine
+(rotation.py): Rotation pro Belegungsmuster, REST-Filter, Auto-Fill und
+Nachrücken in Current Jammer. INJURED-Spieler*innen werden ignoriert.
+
+Ist die Current Line unvollständig, wird wie bei "Auto-Fill & Rotieren"
+erst aufgefüllt; klappt das nicht, endet die Vorschau an diesem Jam.
+
+Kein Kopieren der Spieler-Dicts, kein Undo-Record, kein UI-Refresh:
+10 Jams kosten nur wenige Mikrosekunden pro Jam.
+"""
+from lineup_engine import LINE_SIZE
+from rotation import fill_plan, jammer_refill_source, rotate_groups
+
+LOOKAHEAD_JAMS = 10
+
+
+class JamPreview:
+    __slots__ = ("jam", "jammer", "line", "warnings")
+
+    def __init__(self, jam, jammer, line, warnings):
+        self.jam = jam            # 0 = aktueller Jam, 1 = nach einer Rotation, ...
+        self.jammer = jammer      # Spieler-Dict oder None
+        self.line = line          # Liste der Spieler-Dicts in Current Line
+        self.warnings = warnings  # Liste kurzer Hinweistexte
+
+    @property
+    def ok(self):
+        return not self.warnings
+
+
+def _available(players):
+    return [p for p in players if p.get("status") != "INJURED"]
+
+
+def _line_warnings(line):
+    warnings = []
+    if len(line) < LINE_SIZE:
+        warnings.append(f"Line unvollständig ({len(line)}/{LINE_SIZE})")
+    pivots = sum(1 for p in line if p["role"] == "P")
+    if pivots > 1:
+        warnings.append(f"Zu viele Pivots ({pivots})")
+    return warnings
+
+
+def simulate(engine, jams=LOOKAHEAD_JAMS):
+    """
+    Projiziert die nächsten Jams aus dem aktuellen Zustand.
+
+    Returns:
+        list: JamPreview für Jam 0 (jetzt) bis höchstens Jam jams
+    """
+    jammers = [_available(engine.slots[name]) for name in engine.jammer_slots]
+    lines = [_available(engine.slots[name]) for name in engine.line_slots]
+
+    previews = []
+    for jam in range(jams + 1):
+        line_warnings = _line_warnings(lines[0])
+        warnings = list(line_warnings)
+        if not jammers[0]:
+            warnings.append("Kein Jammer")
+        previews.append(JamPreview(jam, jammers[0][0] if jammers[0] else None, lines[0], warnings))
+        if jam == jams:
+            break
+
+        complete = not line_warnings
+        if not complete:
+            # Wie "Auto-Fill & Rotieren": erst auffüllen, sonst keine Rotation
+            # (eine volle Line mit zwei Pivots gilt dabei als aufgefüllt)
+            if len(lines[0]) < LINE_SIZE:
+                lines = _fill(lines)
+                if _line_warnings(lines[0]):
+                    warnings.append("Rotation nicht möglich")
+                    break
+
+        rotated = rotate_groups(jammers)
+        if rotated is not None:
+            jammers = rotated[0]
+        rotated = rotate_groups(lines)
+        if rotated is not None:
+            lines = rotated[0]
+
+        if complete:
+            # Wie rotate_lineup: nach der Rotation auffüllen bzw. Jammer nachrücken
+            if len(lines[0]) < LINE_SIZE:
+                lines = _fill(lines)
+            if not jammers[0]:
+                index = jammer_refill_source(jammers)
+                if index is not None:
+                    jammers = list(jammers)
+                    jammers[0] = jammers[index][:1]
+                    jammers[index] = jammers[index][1:]
+    return previews
+
+
+def _fill(lines):
+    """Auto-Fill auf Kopien: gibt neue Line-Listen zurück"""
+    picks = fill_plan(lines[0], lines[1:], LINE_SIZE)
+    if not picks:
+        return lines
+    lines = [list(players) for players in lines]
+    for source, player in picks:
+        lines[source + 1] = [p for p in lines[source + 1] if p is not player]
+        lines[0].append(player)
+    return lines
+
+
+def _short(player):
+    return player.get("number") or player["name"]
+
+
+def format_preview(previews, shown=3):
+    """
+    Einzeilige Vorschau für die UI: der erste Hinweis innerhalb der ganzen
+    Vorschau (vorne, damit er nie abgeschnitten wird), dann die nächsten
+    shown Jams.
+    """
+    now = previews[0]
+    if not now.line and now.jammer is None:
+        return "Vorschau   –"  # Noch nichts zugewiesen
+
+    parts = []
+    for preview in previews[1:]:
+        if preview.warnings:
+            parts.append(f"Achtung +{preview.jam}: {', '.join(preview.warnings)}")
+            break
+    if len(previews) == 1:
+        # Schon die nächste Rotation scheitert
+        parts.append(f"Achtung: {', '.join(previews[0].warnings)}")
+
+    for preview in previews[1:shown + 1]:
+        jammer = _short(preview.jammer) if preview.jammer else "–"
+        line = " ".join(_short(p) for p in preview.line) or "–"
+        parts.append(f"+{preview.jam}: J {jammer} | {line}")
+    return "Vorschau   " + "     ".join(parts)
@@ -1,70 +1,60 @@
-import json
+# Muss als erstes importiert werden (misst die übrigen Imports)
+from startup_profile import timeline
+
 import os
 
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.floatlayout import FloatLayout
-from kivy.properties import ListProperty, ObjectProperty, BooleanProperty, NumericProperty
+from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty, OptionProperty, StringProperty
 from kivy.uix.label import Label
 from kivy.graphics import Color, RoundedRectangle
-from kivy.uix.popup import Popup
-from kivy.uix.button import Button
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.filechooser import FileChooserListView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+from kivy.clock import Clock, mainthread
 
 from kivymd.app import MDApp
 from kivymd.uix.button import MDIconButton
 
 from kivy.core.window import Window
 from kivy.utils import platform
-from kivy.utils import platform
 
-# Android Permissions
-if platform == 'android':
-    from android.permissions import request_permissions, Permission
-    request_permissions([
-        Permission.READ_EXTERNAL_STORAGE,
-        Permission.WRITE_EXTERNAL_STORAGE
-    ])
+from lineup_engine import LineupEngine
+from lookahead import format_preview, simulate
+import persistence
+from persistence import load_json, save_json
+from session_journal import SessionJournal
+from drag_ghost import DragGhost
+from drop_zones import CardRows, DropZoneIndex, window_pos
 
-# Verbesserte get_start_path für Android
+# Popups, Dateiauswahl, Import und Snapshot-Format werden erst bei Bedarf
+# importiert (lokale Imports), damit der erste Frame schneller steht
 
-# ---------------------------------------------------------
-# Vollbild für Tablet / Desktop
-# ---------------------------------------------------------
-Window.fullscreen = "auto"
+timeline.mark("main: Imports fertig")
 
 PLAYERS_FILE = "players.json"
 
-# ---------------------------------------------------------
-# JSON helpers
-# ---------------------------------------------------------
-def load_json(file, default):
-    if not os.path.exists(file):
-        print(f"File {file} does not exist, using default")
-        return default
-    try:
-        with open(file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            print(f"Successfully loaded {file}")
-            return data
-    except json.JSONDecodeError as e:
-        print(f"JSON decode error in {file}: {e}")
-        return default
-    except Exception as e:
-        print(f"Error loading {file}: {e}")
-        return default
-
-
-def save_json(file, data):
-    try:
-        with open(file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Successfully saved {file}")
-    except Exception as e:
-        print(f"Error saving {file}: {e}")
+# Ab dieser Roster-Größe nutzt der Player Pool (im Modus "auto") eine
+# RecycleView, die nur sichtbare Karten instanziiert
+VIRTUAL_POOL_THRESHOLD = 60
 
 
+_permissions_requested = False
+
+
+def request_storage_permissions():
+    """Android Permissions - erst beim ersten IMPORT/EXPORT angefragt"""
+    global _permissions_requested
+    if platform != 'android' or _permissions_requested:
+        return
+    _permissions_requested = True
+    from android.permissions import request_permissions, Permission
+    request_permissions([
+        Permission.READ_EXTERNAL_STORAGE,
+        Permission.WRITE_EXTERNAL_STORAGE
+    ])
+
+
+# Verbesserte get_start_path für Android
 def get_start_path():
     if platform == "android":
         from android.storage import primary_external_storage_path
@@ -80,7 +70,7 @@ class PlayerCard(BoxLayout):
     drag_start_x = NumericProperty(0)
     drag_start_y = NumericProperty(0)
     
-    def __init__(self, player, parent_layout, **kwargs):
+    def __init__(self, player, parent_layout, in_pool=False, **kwargs):
         super().__init__(**kwargs)
         self.player = player
         self.parent_layout = parent_layout
@@ -91,12 +81,8 @@ class PlayerCard(BoxLayout):
         self.padding = (12, 10)
         self.spacing = 10
 
-        # Hintergrundfarbe basierend auf Status
-        status = player.get("status", "NORMAL")
-        bg_color = self._get_status_color(status)
-
         with self.canvas.before:
-            self._bg_color = Color(*bg_color)
+            self._bg_color = Color()
             self._bg_rect = RoundedRectangle(radius=[10])
 
         self.bind(pos=self._update_bg, size=self._update_bg)
@@ -104,17 +90,14 @@ class PlayerCard(BoxLayout):
 
         # Status-Indikator (Icon statt Emoji - anklickbar)
         self.status_btn = MDIconButton(
-            icon=self._get_status_icon(status),
             icon_size="28sp",
             theme_text_color="Custom",
-            text_color=self._get_status_icon_color(status),
-            on_release=lambda x: parent_layout.open_status_popup(self)
+            on_release=lambda x: self.parent_layout.open_status_popup(self)
         )
         self.status_btn.size_hint_x = 0.08
 
         # Mittlerer Bereich (draggable)
         self.lbl = Label(
-            text=f"{player['number']} – {player['name']} ({player['role']})",
             halign="left",
             valign="middle",
             font_size="22sp",
@@ -123,19 +106,106 @@ class PlayerCard(BoxLayout):
         )
         self.lbl.bind(size=self.lbl.setter("text_size"))
 
-        # Delete Button (nur im Player Pool sichtbar)
+        # Spielzeit-Badge (gespielte Jams, Farbe = Müdigkeit; wird bei Bedarf erzeugt)
+        self.badge = None
+        self._badge_color = None
+        self._badge_rect = None
+
+        # Delete Button (nur im Player Pool sichtbar, wird bei Bedarf erzeugt)
         self.del_btn = None
-        if self._is_in_player_pool():
+
+        self.add_widget(self.status_btn)
+        self.add_widget(self.lbl)
+
+        # Zuletzt dargestellter Zustand, damit refresh() nur Änderungen anfasst
+        self._shown_status = None
+        self._shown_text = None
+        self._shown_badge = None
+        self.refresh(player, in_pool)
+
+    def refresh(self, player, in_pool=False):
+        """
+        Bindet die Karte an (ggf. neues) Spieler-Dict und aktualisiert nur die
+        Teile, die sich seit der letzten Darstellung geändert haben.
+
+        Args:
+            in_pool: True wenn Spieler*in keiner Box zugewiesen ist
+                     (wird von update_ui einmal pro Refresh berechnet)
+        """
+        self.player = player
+
+        # Hintergrundfarbe + Icon basierend auf Status
+        status = player.get("status", "NORMAL")
+        if status != self._shown_status:
+            self._shown_status = status
+            self._bg_color.rgba = self._get_status_color(status)
+            self.status_btn.icon = self._get_status_icon(status)
+            self.status_btn.text_color = self._get_status_icon_color(status)
+
+        text = f"{player['number']} – {player['name']} ({player['role']})"
+        if text != self._shown_text:
+            self._shown_text = text
+            self.lbl.text = text
+
+        self._refresh_badge()
+
+        if in_pool and self.del_btn is None:
             self.del_btn = MDIconButton(
                 icon="trash-can-outline",
                 icon_size="28sp",
-                on_release=lambda x: parent_layout.confirm_delete_player(player)
+                on_release=lambda x: self.parent_layout.confirm_delete_player(self.player)
             )
-
-        self.add_widget(self.status_btn)
-        self.add_widget(self.lbl)
-        if self.del_btn:
             self.add_widget(self.del_btn)
+        elif not in_pool and self.del_btn is not None:
+            self.remove_widget(self.del_btn)
+            self.del_btn = None
+
+    def _refresh_badge(self):
+        """Spielzeit-Badge aus dem PlayingTimeTracker (O(1) pro Karte)"""
+        badge = None
+        if self.parent_layout is not None:
+            tracker = self.parent_layout.engine.playing_time
+            jams = tracker.jams(self.player["id"])
+            if jams:
+                badge = (jams, tracker.fatigue(self.player["id"]))
+        if badge == self._shown_badge:
+            return
+        self._shown_badge = badge
+
+        if badge is None:
+            if self.badge is not None:
+                self.remove_widget(self.badge)
+                self.badge = None
+            return
+
+        if self.badge is None:
+            self.badge = Label(
+                size_hint=(None, None), size=(40, 40), pos_hint={"center_y": 0.5},
+                font_size="16sp", bold=True
+            )
+            with self.badge.canvas.before:
+                self._badge_color = Color()
+                self._badge_rect = RoundedRectangle(radius=[8])
+            self.badge.bind(pos=self._update_badge_bg, size=self._update_badge_bg)
+            # Vor dem Delete-Button einsortieren (falls vorhanden)
+            self.add_widget(self.badge, index=1 if self.del_btn else 0)
+
+        jams, fatigue = badge
+        self.badge.text = str(jams)
+        self._badge_color.rgba = self._get_fatigue_color(fatigue)
+
+    def _update_badge_bg(self, *args):
+        self._badge_rect.pos = self.badge.pos
+        self._badge_rect.size = self.badge.size
+
+    def _get_fatigue_color(self, fatigue):
+        """Badge-Farbe: frisch / müde / sehr müde"""
+        if fatigue == 2:
+            return (0.85, 0.15, 0.15, 1)  # Rot
+        elif fatigue == 1:
+            return (0.95, 0.6, 0.0, 1)  # Orange
+        else:
+            return (0.2, 0.6, 0.3, 1)  # Grün
 
     def _get_status_color(self, status):
         """Gibt Hintergrundfarbe basierend auf Status zurück"""
@@ -146,20 +216,6 @@ class PlayerCard(BoxLayout):
         else:  # NORMAL
             return (0.95, 0.95, 0.95, 1)  # Hellgrau
 
-    def _is_in_player_pool(self):
-        """Prüft ob Spieler*in nur im Player Pool ist (nicht in Boxen/Lines)"""
-        player = self.player
-        parent = self.parent_layout
-        
-        # Prüfe ob in irgendeiner Box/Line
-        in_boxes = player in (
-            parent.current_jammer + parent.next_jammer + parent.third_jammer +
-            parent.line_a + parent.line_b + parent.line_c + 
-            parent.penalty + parent.injured
-        )
-        
-        return not in_boxes
-
     def _get_status_icon(self, status):
         """Gibt Icon basierend auf Status zurück"""
         if status == "REST":
@@ -211,9 +267,17 @@ class PlayerCard(BoxLayout):
             dy = abs(touch.y - self.drag_start_y)
             
             if dx > 10 or dy > 10:
+                x, y = window_pos(touch)
                 if not self.is_being_dragged:
+                    # Ghost vor dem Abdunkeln rendern (Griffpunkt bleibt unter dem Finger)
+                    self.parent_layout.drag_ghost.begin(
+                        self, self.drag_start_x - self.x, self.drag_start_y - self.y, x, y)
                     self.is_being_dragged = True
                     print(f"Drag started: {self.player['name']}")
+                else:
+                    self.parent_layout.drag_ghost.move(x, y)
+                # Zone unter dem Finger markieren (Raster-Lookup, kein Widget-Walk)
+                self.parent_layout.drop_zones.hover(x, y)
             
             return True
         return super().on_touch_move(touch)
@@ -224,6 +288,8 @@ class PlayerCard(BoxLayout):
             
             if self.is_being_dragged:
                 # Drag beenden - finde Drop-Zone
+                self.parent_layout.drag_ghost.end()
+                self.parent_layout.drop_zones.clear_hover()
                 self._handle_drop(touch)
                 self.is_being_dragged = False
             else:
@@ -235,237 +301,174 @@ class PlayerCard(BoxLayout):
 
     def _handle_drop(self, touch):
         """Findet Drop-Zone und führt Zuweisung durch"""
-        # Finde welche Box unter dem Touch ist
-        target_box = None
-        target_name = None
-        
-        # Prüfe alle Boxen
-        boxes = {
-            'player_pool': self.parent_layout.ids.get('player_pool'),
-            'current_jammer_box': self.parent_layout.ids.get('current_jammer_box'),
-            'next_jammer_box': self.parent_layout.ids.get('next_jammer_box'),
-            'third_jammer_box': self.parent_layout.ids.get('third_jammer_box'),
-            'line_a_box': self.parent_layout.ids.get('line_a_box'),
-            'line_b_box': self.parent_layout.ids.get('line_b_box'),
-            'line_c_box': self.parent_layout.ids.get('line_c_box'),
-            'penalty_box': self.parent_layout.ids.get('penalty_box'),
-            'injured_box': self.parent_layout.ids.get('injured_box'),
-        }
-        
-        for box_name, box_widget in boxes.items():
-            if box_widget and box_widget.collide_point(*touch.pos):
-                target_box = box_widget
-                target_name = box_name
-                break
+        # Touch-Position in Fensterkoordinaten (Pool-Karten liegen in einer ScrollView)
+        target = self.parent_layout.drop_zones.target_at(*window_pos(touch))
         
-        if target_name:
-            print(f"Dropped {self.player['name']} on {target_name}")
+        if target:
+            print(f"Dropped {self.player['name']} on {target}")
             
-            # Konvertiere box_name zu target für assign_to
-            if target_name == 'player_pool':
+            if target == 'player_pool':
                 self.parent_layout.drop_to_player_pool(self.player)
-            elif target_name.endswith('_box'):
-                # Entferne '_box' suffix
-                target = target_name.replace('_box', '')
+            else:
                 self.parent_layout.drop_assign_to(self.player, target)
         else:
             print(f"Dropped {self.player['name']} outside valid zone - no action")
 
 
+class PoolCardView(RecycleDataViewBehavior, PlayerCard):
+    """
+    Datengetriebene PlayerCard für den virtualisierten Player Pool.
+
+    Die RecycleView erzeugt nur so viele Instanzen wie sichtbar sind und
+    bindet sie beim Scrollen über refresh_view_attrs an neue Datensätze.
+    """
+
+    def __init__(self, **kwargs):
+        placeholder = {"number": "", "name": "", "role": "", "status": "NORMAL"}
+        super().__init__(placeholder, None, **kwargs)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.parent_layout = data["parent_layout"]
+        self.refresh(data["player"], data["in_pool"])
+
+
+class PlayerPoolView(RecycleView):
+    pass
+
+
 # ---------------------------------------------------------
 # Main Layout
 # ---------------------------------------------------------
 class MainLayout(BoxLayout):
-    players = ListProperty([])
-
-    current_jammer = ListProperty([])
-    next_jammer = ListProperty([])
-    third_jammer = ListProperty([])
-
-    line_a = ListProperty([])
-    line_b = ListProperty([])
-    line_c = ListProperty([])
+    selected_player = ObjectProperty(None, allownone=True)
 
-    penalty = ListProperty([])
-    injured = ListProperty([])
+    # Player Pool Darstellung: "widgets" (eine Karte pro Spieler*in),
+    # "virtual" (RecycleView) oder "auto" (abhängig von der Roster-Größe)
+    pool_mode = OptionProperty("auto", options=["auto", "widgets", "virtual"])
 
-    selected_player = ObjectProperty(None, allownone=True)
+    # Fortschrittsanzeige für Importe im Hintergrund (siehe derby.kv)
+    importing = BooleanProperty(False)
+    import_progress = NumericProperty(0)
+    import_message = StringProperty("")
 
-    # UNDO/REDO System
-    history_stack = ListProperty([])
-    history_index = NumericProperty(-1)
+    # Vorschau der nächsten Jams (siehe lookahead.py), nach jeder Änderung neu
+    lookahead_text = StringProperty("")
 
     # -----------------------------------------------------
+    def __init__(self, **kwargs):
+        # Engine vor super().__init__, da on_kv_post bereits darauf zugreift
+        self.engine = LineupEngine()
+        # Karten-Cache für update_ui: player_id -> PlayerCard
+        self._pool_cards = {}
+        self._box_cards = {}
+        self._ui_initialized = False
+        self._pool_view = None  # PlayerPoolView, wird bei Bedarf erzeugt
+        self._import_job = None
+        self._file_picker = None  # Wird beim ersten IMPORT/EXPORT gebaut
+        self._dialogs = None      # DialogPool, nach dem Start vorgewärmt
+        self._toasts = None       # ToastOverlay für notify()
+        # Drop-Zonen in Fensterkoordinaten (Player Pool + alle Boxen)
+        self.drop_zones = DropZoneIndex()
+        # Karten-Zeilen je Box für die Touch-Weiterleitung (Box-Name -> CardRows)
+        self._card_rows = {}
+        # Vorschau der gezogenen Karte (eine Instanz für alle Karten)
+        self.drag_ghost = DragGhost()
+        # Journal: jede Aktion wird angehängt, players.json nur beim Kompaktieren geschrieben
+        self.journal = SessionJournal(roster_file=PLAYERS_FILE)
+        super().__init__(**kwargs)
+
     def on_kv_post(self, base_widget):
-        raw_players = load_json(PLAYERS_FILE, []) or []
+        timeline.mark("MainLayout: KV angewendet")
+        self.drop_zones.attach_highlight(self.canvas.after)
+        with timeline.span("Roster laden"):
+            # Letzten Checkpoint + Journal laden (inkl. Zuweisungen nach App-Kill)
+            replayed = self.journal.recover(self.engine)
+            
+            if replayed is None:
+                # Noch keine Sitzung: Roster aus players.json
+                raw_players = load_json(PLAYERS_FILE, []) or []
+                
+                # Migration: Füge "status" Feld hinzu falls nicht vorhanden
+                self.engine.load_players(raw_players)
         
-        # Migration: Füge "status" Feld hinzu falls nicht vorhanden
-        self.players = []
-        for player in raw_players:
-            if "status" not in player:
-                player["status"] = "NORMAL"
-            self.players.append(player)
+        # Geladener Zustand ist Ausgangspunkt für Undo/Redo
+        self.engine.reset_history()
+        self.engine.journal = self.journal
         
-        # Speichere migrierte Daten
-        if raw_players:
+        # Frischen Checkpoint schreiben (speichert auch migrierte Daten)
+        if replayed != 0:
             self.save_players()
         
-        self.update_ui()
-        
-        # Initialer Snapshot für Undo/Redo
-        self._save_to_history()
+        # Karten erst nach dem ersten Frame aufbauen
+        Window.bind(on_flip=self._first_update_ui)
+
+    def _first_update_ui(self, window):
+        window.unbind(on_flip=self._first_update_ui)
+        with timeline.span("Erstes update_ui"):
+            self.update_ui()
+        # Dialoge in ruhigen Frames vorbauen, damit der erste Tap nichts kostet
+        Clock.schedule_once(self._warm_up_dialogs, 1)
+        # Fbo für die Drag-Vorschau vorab anlegen (erster Drag sonst ~100 ms)
+        Clock.schedule_once(self.drag_ghost.warm_up, 1.5)
 
-    def save_players(self):
-        save_json(PLAYERS_FILE, self.players)
+    def save_players(self, background=True):
+        """Kompaktiert das Journal in einen neuen Checkpoint (inkl. players.json)"""
+        self.journal.compact(self.engine.export_state(), background=background)
+
+    def _maybe_compact(self):
+        if self.journal.needs_compaction():
+            self.save_players()
 
     # -----------------------------------------------------
     # UNDO/REDO SYSTEM
     # -----------------------------------------------------
-    def _create_snapshot(self):
-        """Erstellt Snapshot des aktuellen Zustands"""
-        import copy
-        # Konvertiere ListProperty zu normalen Listen für deepcopy
-        return {
-            'current_jammer': copy.deepcopy(list(self.current_jammer)),
-            'next_jammer': copy.deepcopy(list(self.next_jammer)),
-            'third_jammer': copy.deepcopy(list(self.third_jammer)),
-            'line_a': copy.deepcopy(list(self.line_a)),
-            'line_b': copy.deepcopy(list(self.line_b)),
-            'line_c': copy.deepcopy(list(self.line_c)),
-            'penalty': copy.deepcopy(list(self.penalty)),
-            'injured': copy.deepcopy(list(self.injured)),
-            'players': copy.deepcopy(list(self.players))  # Für Status-Änderungen
-        }
-
     def _save_to_history(self):
-        """Speichert aktuellen Zustand in History"""
-        snapshot = self._create_snapshot()
-        
-        # Entferne alle Schritte nach current index (bei neuer Änderung nach Undo)
-        if self.history_index < len(self.history_stack) - 1:
-            self.history_stack = self.history_stack[:self.history_index + 1]
-        
-        # Füge neuen Snapshot hinzu
-        self.history_stack.append(snapshot)
-        
-        # Limit auf 20 Schritte
-        if len(self.history_stack) > 20:
-            self.history_stack.pop(0)
-        else:
-            self.history_index += 1
-        
-        print(f"History saved: {self.history_index + 1}/{len(self.history_stack)} steps")
-
-    def _restore_snapshot(self, snapshot):
-        """Stellt einen Snapshot wieder her"""
-        import copy
-        # ListProperty akzeptiert normale Listen als Zuweisung
-        self.current_jammer = copy.deepcopy(snapshot['current_jammer'])
-        self.next_jammer = copy.deepcopy(snapshot['next_jammer'])
-        self.third_jammer = copy.deepcopy(snapshot['third_jammer'])
-        self.line_a = copy.deepcopy(snapshot['line_a'])
-        self.line_b = copy.deepcopy(snapshot['line_b'])
-        self.line_c = copy.deepcopy(snapshot['line_c'])
-        self.penalty = copy.deepcopy(snapshot['penalty'])
-        self.injured = copy.deepcopy(snapshot['injured'])
-        self.players = copy.deepcopy(snapshot['players'])
-        
-        self.save_players()
-        self.update_ui()
+        """Speichert die Änderungen seit dem letzten Schritt als Undo-Schritt (+ Journal)"""
+        self.engine.checkpoint()
+        self._maybe_compact()
+
+    def _history_step(self):
+        history = self.engine.history
+        return f"{history.position + 1}/{len(history) + 1}"
 
     def undo(self):
         """Macht letzte Änderung rückgängig"""
-        if self.history_index > 0:
-            self.history_index -= 1
-            snapshot = self.history_stack[self.history_index]
-            self._restore_snapshot(snapshot)
-            print(f"UNDO: Zurück zu Schritt {self.history_index + 1}/{len(self.history_stack)}")
-            self.show_info_popup(f"Rückgängig: Schritt {self.history_index + 1}", duration=1.5)
+        if self.engine.undo():
+            self._maybe_compact()
+            self.update_ui()
+            print(f"UNDO: Zurück zu Schritt {self._history_step()}")
+            self.notify(f"Rückgängig: Schritt {self.engine.history.position + 1}", duration=1.5, key="history")
         else:
             print("UNDO: Keine weiteren Schritte zurück")
-            self.show_info_popup("Keine weiteren Schritte zurück", duration=1.5)
+            self.notify("Keine weiteren Schritte zurück", duration=1.5, key="history")
 
     def redo(self):
         """Stellt rückgängig gemachte Änderung wieder her"""
-        if self.history_index < len(self.history_stack) - 1:
-            self.history_index += 1
-            snapshot = self.history_stack[self.history_index]
-            self._restore_snapshot(snapshot)
-            print(f"REDO: Vorwärts zu Schritt {self.history_index + 1}/{len(self.history_stack)}")
-            self.show_info_popup(f"Wiederherstellen: Schritt {self.history_index + 1}", duration=1.5)
+        if self.engine.redo():
+            self._maybe_compact()
+            self.update_ui()
+            print(f"REDO: Vorwärts zu Schritt {self._history_step()}")
+            self.notify(f"Wiederherstellen: Schritt {self.engine.history.position + 1}", duration=1.5, key="history")
         else:
             print("REDO: Keine weiteren Schritte vorwärts")
-            self.show_info_popup("Keine weiteren Schritte vorwärts", duration=1.5)
+            self.notify("Keine weiteren Schritte vorwärts", duration=1.5, key="history")
 
     # -----------------------------------------------------
     # DRAG & DROP HANDLERS
     # -----------------------------------------------------
     def drop_to_player_pool(self, player):
         """Spieler wird zurück in Player Pool gedropped"""
-        # Prüfe ob Spieler*in in Injured Box ist
-        was_injured = player in self.injured
-        
-        # Nur aus Lines/Jammer entfernen, NICHT aus Player Pool!
-        for lst in (
-            self.current_jammer, self.next_jammer, self.third_jammer,
-            self.line_a, self.line_b, self.line_c, self.penalty, self.injured
-        ):
-            if player in lst:
-                lst.remove(player)
-        
-        # Wenn aus Injured Box geholt: Status auf NORMAL setzen
-        if was_injured:
-            player["status"] = "NORMAL"
-            self.save_players()
+        # Wenn aus Injured Box geholt: Status wird auf NORMAL gesetzt
+        self.engine.drop_to_player_pool(player)
         
         self._save_to_history()
         self.update_ui()
 
     def drop_assign_to(self, player, target):
         """Spieler wird per Drag & Drop einer Box zugewiesen"""
-        role = player["role"]
-
-        # Rollenvalidierung
-        if role == "J" and target in ("line_a", "line_b", "line_c"):
-            print(f"Validation failed: Jammer can't be in Line")
+        if not self.engine.drop_assign_to(player, target):
             return
-        if role != "J" and target in ("current_jammer", "next_jammer", "third_jammer"):
-            print(f"Validation failed: Blocker/Pivot can't be Jammer")
-            return
-
-        # Jammer-Boxen dürfen nur 1 Jammer haben
-        if target in ("current_jammer", "next_jammer", "third_jammer"):
-            if getattr(self, target):
-                print(f"Validation failed: Jammer box already full")
-                return
 
-        # Lines dürfen maximal 4 Spieler*innen haben
-        if target in ("line_a", "line_b", "line_c"):
-            lst = getattr(self, target)
-            if len(lst) >= 4:
-                print(f"Validation failed: Line already has 4 players")
-                return
-            # Maximal 1 Pivot pro Line
-            if role == "P" and any(p["role"] == "P" for p in lst):
-                print(f"Validation failed: Line already has a Pivot")
-                return
-
-        # Entfernen aus allen anderen Boxen (außer Player Pool)
-        for lst in (
-            self.current_jammer, self.next_jammer, self.third_jammer,
-            self.line_a, self.line_b, self.line_c, self.penalty, self.injured
-        ):
-            if player in lst:
-                lst.remove(player)
-
-        # SPECIAL: Drop in Injured Box → Status auf INJURED setzen
-        if target == "injured":
-            if player["status"] != "INJURED":
-                player["status"] = "INJURED"
-                print(f"Status changed: {player['name']} → INJURED")
-
-        getattr(self, target).append(player)
-        self.save_players()
         self._save_to_history()
         self.update_ui()
 
@@ -474,144 +477,21 @@ class MainLayout(BoxLayout):
     # -----------------------------------------------------
     def open_status_popup(self, card_widget):
         """Öffnet Popup zum Ändern des Spieler-Status"""
-        player = card_widget.player
-        
-        layout = GridLayout(cols=1, spacing=10, padding=10, size_hint_y=None)
-        layout.bind(minimum_height=layout.setter("height"))
-        
-        popup = Popup(
-            title=f"Status für {player['name']} ändern",
-            content=layout,
-            size_hint=(0.5, 0.4)
-        )
-        
-        statuses = [
-            ("✓ Normal (Spielbereit)", "NORMAL"),
-            ("⏸ Rest (Pause)", "REST"),
-            ("+ Injured (Verletzt)", "INJURED")
-        ]
-        
-        for text, status in statuses:
-            btn = Button(
-                text=text,
-                font_size="22sp",
-                size_hint_y=None,
-                height=70,
-                on_release=lambda x, s=status, p=popup: self.change_player_status(player, s, p)
-            )
-            layout.add_widget(btn)
-        
-        popup.open()
+        self.dialog("status").show(card_widget.player, self.change_player_status)
 
     def change_player_status(self, player, new_status, popup):
         """Ändert den Status einer Spieler*in"""
-        old_status = player.get("status", "NORMAL")
-        player["status"] = new_status
+        self.engine.change_player_status(player, new_status)
         
-        print(f"Status-Änderung: {player['name']} von {old_status} → {new_status}")
-        
-        # INJURED-Logik: Aus allen Lines/Jammer-Boxen entfernen, in Injured Box
-        if new_status == "INJURED":
-            # Aus Lines/Jammer entfernen (NICHT aus Player Pool!)
-            for lst in (
-                self.current_jammer, self.next_jammer, self.third_jammer,
-                self.line_a, self.line_b, self.line_c, self.penalty
-            ):
-                if player in lst:
-                    lst.remove(player)
-            
-            # In Injured Box hinzufügen (falls nicht schon drin)
-            if player not in self.injured:
-                self.injured.append(player)
-        
-        # Zurück von INJURED zu NORMAL/REST: Aus Injured Box entfernen + Auto-Assignment
-        elif old_status == "INJURED" and new_status in ("NORMAL", "REST"):
-            if player in self.injured:
-                self.injured.remove(player)
-                # Automatisch in nächste freie Box einfügen
-                self._auto_assign_recovered_player(player)
-        
-        self.save_players()
         self._save_to_history()
         self.update_ui()
         popup.dismiss()
-        
-    def _auto_assign_recovered_player(self, player):
-        """
-        Weist einen Spieler automatisch einer freien Box zu nach Rückkehr von INJURED.
-        
-        Priorität für Jammer: Next → Third → Current
-        Priorität für Blocker/Pivot: Next Line → Third Line → Current Line
-        """
-        role = player["role"]
-        
-        if role == "J":
-            # Jammer: Suche freie Jammer-Box
-            if not self.next_jammer:
-                self.next_jammer.append(player)
-                print(f"Auto-Assignment: {player['name']} → Next Jammer")
-            elif not self.third_jammer:
-                self.third_jammer.append(player)
-                print(f"Auto-Assignment: {player['name']} → Third Jammer")
-            elif not self.current_jammer:
-                self.current_jammer.append(player)
-                print(f"Auto-Assignment: {player['name']} → Current Jammer")
-            else:
-                print(f"Auto-Assignment: Alle Jammer-Boxen belegt, {player['name']} bleibt im Player Pool")
-        
-        else:  # Blocker oder Pivot
-            # Suche Line mit Platz (max 4 Spieler*innen)
-            for line_name, line_list in [("Next Line", self.line_b), ("Third Line", self.line_c), ("Current Line", self.line_a)]:
-                if len(line_list) < 4:
-                    # Prüfe Pivot-Regel (max 1 Pivot pro Line)
-                    if role == "P" and any(p["role"] == "P" for p in line_list):
-                        continue  # Diese Line hat schon einen Pivot
-                    
-                    line_list.append(player)
-                    print(f"Auto-Assignment: {player['name']} → {line_name}")
-                    return
-            
-            # Alle Lines voll
-            print(f"Auto-Assignment: Alle Lines voll, {player['name']} bleibt im Player Pool")
-
-    # -----------------------------------------------------
-    # PHASE 1.1: Line-Validierung
-    # -----------------------------------------------------
-    def is_line_complete(self, line_list):
-        """
-        Prüft ob eine Line spielbar ist.
-        
-        Eine Line ist vollständig wenn:
-        - Genau 4 Spieler*innen vorhanden sind UND
-        - Maximal 1 Pivot dabei ist
-        
-        Returns:
-            bool: True wenn Line spielbar, False wenn unvollständig
-        """
-        if len(line_list) != 4:
-            return False
-        
-        pivot_count = sum(1 for p in line_list if p["role"] == "P")
-        return pivot_count <= 1
 
     # -----------------------------------------------------
     def add_player(self, name, number, role):
-        name = (name or "").strip()
-        number = (number or "").strip()
-        role = (role or "").strip().upper()
-
-        if not name or not number or role not in ("J", "B", "P"):
-            print(f"Invalid player input: name={name}, number={number}, role={role}")
-            return
-
         # Neuer Spieler mit NORMAL Status
-        self.players.append({
-            "name": name,
-            "number": number,
-            "role": role,
-            "status": "NORMAL"
-        })
-        self.save_players()
+        if self.engine.add_player(name, number, role) is None:
+            return
         
         # Input-Felder leeren nach erfolgreichem Hinzufügen
         self.ids.in_name.text = ""
@@ -624,41 +504,11 @@ class MainLayout(BoxLayout):
     # -----------------------------------------------------
     def confirm_delete_player(self, player):
         """Zeigt Bestätigungsdialog bevor Spieler*in gelöscht wird"""
-        content = BoxLayout(orientation="vertical", spacing=20, padding=20)
-        
-        msg = Label(
-            text=f"Möchtest du {player['name']} wirklich löschen?",
-            font_size="20sp",
-            size_hint_y=0.6
-        )
-        
-        btn_box = BoxLayout(spacing=10, size_hint_y=0.4)
-        
-        popup = Popup(
-            title="Spieler*in löschen?",
-            content=content,
-            size_hint=(0.6, 0.3)
-        )
-        
-        yes_btn = Button(
-            text="Ja",
-            font_size="22sp",
-            on_release=lambda x: self._delete_player_confirmed(player, popup)
-        )
-        
-        no_btn = Button(
-            text="Nein",
-            font_size="22sp",
-            on_release=popup.dismiss
+        self.dialog("confirm").show(
+            "Spieler*in löschen?",
+            f"Möchtest du {player['name']} wirklich löschen?",
+            [("Nein", None), ("Ja", lambda popup: self._delete_player_confirmed(player, popup))]
         )
-        
-        btn_box.add_widget(no_btn)
-        btn_box.add_widget(yes_btn)
-        
-        content.add_widget(msg)
-        content.add_widget(btn_box)
-        
-        popup.open()
 
     def _delete_player_confirmed(self, player, popup):
         """Führt das Löschen nach Bestätigung aus"""
@@ -666,18 +516,8 @@ class MainLayout(BoxLayout):
         popup.dismiss()
 
     def delete_player(self, player):
-        if player in self.players:
-            self.players.remove(player)
-
-        # Aus allen Boxen entfernen
-        for lst in (
-            self.current_jammer, self.next_jammer, self.third_jammer,
-            self.line_a, self.line_b, self.line_c, self.penalty, self.injured
-        ):
-            if player in lst:
-                lst.remove(player)
+        self.engine.delete_player(player)
 
-        self.save_players()
         self._save_to_history()
         self.update_ui()
 
@@ -686,44 +526,43 @@ class MainLayout(BoxLayout):
     # -----------------------------------------------------
     def open_assign_popup(self, card_widget):
         player = card_widget.player
-        role = player["role"]
-
-        layout = GridLayout(cols=1, spacing=10, padding=10, size_hint_y=None)
-        layout.bind(minimum_height=layout.setter("height"))
-
-        targets = []
+        targets = self.engine.assignment_targets(player)
+        info = ""
+        if player["role"] != "J":
+            targets, info = self._with_chemistry(player, targets)
+        self.dialog("assign").show(player, targets, self.assign_or_return, info)
 
-        if player in (
-            self.current_jammer + self.next_jammer + self.third_jammer +
-            self.line_a + self.line_b + self.line_c + self.penalty + self.injured
-        ):
-            targets.append(("Zurück in Playerpool", "player_pool"))
-
-        if role == "J":
-            for t in ("current_jammer", "next_jammer", "third_jammer", "penalty"):
-                if player not in getattr(self, t):
-                    targets.append((t.replace("_", " ").title(), t))
-        else:
-            for t in ("line_a", "line_b", "line_c", "penalty"):
-                if player not in getattr(self, t):
-                    targets.append((t.replace("_", " ").title(), t))
-
-        popup = Popup(title=f"{player['name']} zuordnen", size_hint=(0.6, 0.7))
-
-        for txt, target in targets:
-            layout.add_widget(
-                Button(
-                    text=txt,
-                    size_hint_y=None,
-                    height=70,
-                    font_size="22sp",
-                    on_release=lambda x, t=target, p=popup:
-                    self.assign_or_return(player, t, p)
-                )
-            )
-
-        popup.content = layout
-        popup.open()
+    def _with_chemistry(self, player, targets):
+        """
+        Ergänzt die Line-Ziele um gemeinsame Jams mit der jeweiligen Line und
+        liefert die häufigsten Partner*innen als Hinweis (siehe chemistry.py).
+        """
+        try:
+            import chemistry
+        except ImportError:
+            # numpy fehlt (z.B. Desktop-Setup ohne numpy) → Popup ohne Chemie
+            return targets, ""
+        if not len(self.engine.jam_log):
+            return targets, ""
+
+        matrix = chemistry.build(self.engine.jam_log)
+        annotated = []
+        for text, target in targets:
+            if target in self.engine.line_slots:
+                line_ids = [p["id"] for p in self.engine.slot(target)]
+                together, _ = matrix.with_line(player["id"], line_ids)
+                if together:
+                    text = f"{text}  –  {together} gemeinsame Jams"
+            annotated.append((text, target))
+
+        candidates = [p["id"] for p in self.engine.players
+                      if p["role"] != "J" and p.get("status") != "INJURED"]
+        partners = []
+        for pid, together, _ in matrix.partners(player["id"], candidates):
+            partner = self.engine.get_player(pid)
+            partners.append(f"{partner['number']} {partner['name']} ({together})")
+        info = f"Oft zusammen: {', '.join(partners)}" if partners else ""
+        return annotated, info
 
     def assign_or_return(self, player, target, popup):
         if target == "player_pool":
@@ -740,134 +579,46 @@ class MainLayout(BoxLayout):
         """
         FILL Button Handler: Füllt Current Line automatisch auf.
         """
-        if self.is_line_complete(self.line_a):
-            self.show_info_popup("Current Line ist bereits vollständig!")
+        if self.engine.is_line_complete(self.engine.slot("line_a")):
+            self.notify("Current Line ist bereits vollständig!")
             return
         
-        success = self.auto_fill_current_line()
+        success = self.engine.auto_fill_current_line()
+        self.update_ui()
         
         if success:
             self._save_to_history()
-            self.show_info_popup("Current Line wurde aufgefüllt!", duration=2)
+            self.notify("Current Line wurde aufgefüllt!", duration=2)
         else:
-            self.show_info_popup("Keine Ersatzspieler*innen in Next/Third Line verfügbar!")
+            self.notify("Keine Ersatzspieler*innen in Next/Third Line verfügbar!")
 
-    def auto_fill_current_line(self):
+    def auto_build_lines(self):
         """
-        Füllt Current Line automatisch mit Spieler*innen aus Next/Third Line.
-        
-        Priorität:
-        1. Pivot holen (falls keiner in Current Line)
-        2. Blocker auffüllen bis 4 Spieler*innen
-        
-        Quell-Priorität: Next Line (B) → Third Line (C)
-        
-        Returns:
-            bool: True wenn erfolgreich aufgefüllt, False wenn nicht genug Ersatz
+        BUILD Button Handler: Besetzt alle freien Plätze in Lines und
+        Jammer-Boxen in einem Schritt aus dem Player Pool (siehe line_builder.py).
         """
-        missing = 4 - len(self.line_a)
-        if missing <= 0:
-            return True  # Bereits voll
-        
-        print(f"Auto-Fill: {missing} Spieler*innen fehlen in Current Line")
-        
-        # Prüfe ob Pivot fehlt
-        has_pivot = any(p["role"] == "P" for p in self.line_a)
-        needs_pivot = not has_pivot
-        
-        filled = 0
-        
-        # SCHRITT 1: Pivot holen (falls benötigt)
-        if needs_pivot:
-            pivot = self._find_player_in_lines("P")
-            if pivot:
-                source_line = pivot["source"]
-                player = pivot["player"]
-                
-                print(f"Auto-Fill: Nehme Pivot {player['name']} aus {source_line}")
-                
-                # Aus Quell-Line entfernen
-                getattr(self, source_line).remove(player)
-                # Zu Current Line hinzufügen
-                self.line_a.append(player)
-                
-                filled += 1
-                missing -= 1
-        
-        # SCHRITT 2: Blocker auffüllen
-        while missing > 0:
-            blocker = self._find_player_in_lines("B")
-            if not blocker:
-                break  # Keine Blocker mehr verfügbar
-            
-            source_line = blocker["source"]
-            player = blocker["player"]
-            
-            print(f"Auto-Fill: Nehme Blocker {player['name']} aus {source_line}")
-            
-            # Aus Quell-Line entfernen
-            getattr(self, source_line).remove(player)
-            # Zu Current Line hinzufügen
-            self.line_a.append(player)
-            
-            filled += 1
-            missing -= 1
-        
+        from line_builder import build_plan
+
+        plan = build_plan(self.engine, load=self.engine.playing_time.load())
+        if not plan:
+            self.notify("Keine passenden Spieler*innen im Player Pool!")
+            return
+
+        for player, slot_name in plan:
+            self.engine.drop_assign_to(player, slot_name)
+        self._save_to_history()
         self.update_ui()
-        
-        # Erfolgreich wenn Current Line jetzt vollständig ist
-        success = self.is_line_complete(self.line_a)
-        
-        if success:
-            print(f"Auto-Fill: Erfolgreich! {filled} Spieler*innen verschoben")
-        else:
-            print(f"Auto-Fill: Nur {filled} Spieler*innen gefunden, Current Line noch unvollständig")
-        
-        return success
-
-    def _find_player_in_lines(self, role):
-        # Priorität 1: Next Line (B)
-        for player in self.line_b:
-            # REST-Spieler überspringen
-            if player.get("status") == "REST":
-                continue
-            if player["role"] == role:
-                return {"source": "line_b", "player": player}
-        
-        # Priorität 2: Third Line (C)
-        for player in self.line_c:
-            # REST-Spieler überspringen
-            if player.get("status") == "REST":
-                continue
-            if player["role"] == role:
-                return {"source": "line_c", "player": player}
-        
-        return None
+        self.notify(f"{len(plan)} Spieler*innen eingeteilt!", duration=2)
 
-    def show_info_popup(self, message, duration=3):
+    def notify(self, message, duration=3, key=None):
         """
-        Zeigt eine Info-Nachricht für kurze Zeit an.
+        Zeigt eine Info-Nachricht für kurze Zeit als Toast an (nicht-modal).
+        Gleiche Meldungen bzw. gleicher key werden zusammengefasst.
         """
-        content = Label(
-            text=message,
-            font_size="20sp",
-            halign="center",
-            valign="middle"
-        )
-        content.bind(size=content.setter("text_size"))
-        
-        popup = Popup(
-            title="Info",
-            content=content,
-            size_hint=(0.6, 0.25),
-            auto_dismiss=True
-        )
-        
-        popup.open()
-        
-        # Auto-close nach X Sekunden
-        from kivy.clock import Clock
-        Clock.schedule_once(lambda dt: popup.dismiss(), duration)
+        if self._toasts is None:
+            from notifications import ToastOverlay
+            self._toasts = ToastOverlay()
+        self._toasts.notify(message, duration, key)
 
     # -----------------------------------------------------
     # INTELLIGENTE ROTATION (Phase 1 - verbessert)
@@ -885,237 +636,14 @@ class MainLayout(BoxLayout):
         Current Line muss vollständig sein, sonst Warnung.
         REST-Spieler werden übersprungen und automatisch ersetzt.
         """
-        # PHASE 1.2: Check ob Current Line vollständig ist
-        if not self.is_line_complete(self.line_a):
+        # PHASE 1.2: Rotation wird NICHT ausgeführt wenn Current Line unvollständig
+        if not self.engine.rotate_lineup():
             self.show_incomplete_line_warning()
-            return  # Rotation wird NICHT ausgeführt
-        
-        # ========== JAMMER ROTATION (unabhängig) ==========
-        self._rotate_jammers()
-        
-        # ========== LINE ROTATION (unabhängig) ==========
-        self._rotate_lines()
-        
-        # NEU: Auto-Fill wenn Current Line durch REST-Filter unvollständig wurde
-        if len(self.line_a) < 4:
-            print(f"Current Line nach Rotation unvollständig ({len(self.line_a)}/4) - fülle automatisch auf")
-            self.auto_fill_current_line()
-        
-        # Prüfe ob Current Jammer leer ist (REST wurde übersprungen)
-        if not self.current_jammer:
-            # Versuche Jammer aus Next zu holen
-            if self.next_jammer and self.next_jammer[0].get("status") != "REST":
-                jammer = self.next_jammer.pop(0)
-                self.current_jammer.append(jammer)
-                print(f"Current Jammer war leer - {jammer['name']} aus Next geholt")
-            elif self.third_jammer and self.third_jammer[0].get("status") != "REST":
-                jammer = self.third_jammer.pop(0)
-                self.current_jammer.append(jammer)
-                print(f"Current Jammer war leer - {jammer['name']} aus Third geholt")
+            return
         
         self._save_to_history()
         self.update_ui()
 
-    def _rotate_jammers(self):
-        """
-        Rotiert nur zwischen belegten Jammer-Slots.
-        """
-        # Sammle belegte Jammer-Slots
-        jammer_map = {}
-        if self.current_jammer:
-            jammer_map['current'] = self.current_jammer[0]  # Liste hat max. 1 Element
-        if self.next_jammer:
-            jammer_map['next'] = self.next_jammer[0]
-        if self.third_jammer:
-            jammer_map['third'] = self.third_jammer[0]
-        
-        # Anzahl belegter Slots
-        count = len(jammer_map)
-        
-        if count == 0:
-            # Keine Jammer → nichts tun
-            return
-        
-        elif count == 1:
-            # Nur 1 Jammer → keine Rotation möglich
-            return
-        
-        elif count == 2:
-            # 2-Wege-Rotation zwischen den beiden belegten Slots
-            slots = list(jammer_map.keys())
-            slot_a, slot_b = slots[0], slots[1]
-            
-            jammer_a = jammer_map[slot_a]
-            jammer_b = jammer_map[slot_b]
-            
-            # Leere alle
-            self.current_jammer.clear()
-            self.next_jammer.clear()
-            self.third_jammer.clear()
-            
-            # Setze getauscht (mit REST-Filter für Current)
-            if slot_a == 'current':
-                # Jammer B wird zu Current → prüfe REST
-                if jammer_b.get("status") != "REST":
-                    self.current_jammer.append(jammer_b)
-                else:
-                    # REST bleibt in ursprünglicher Position
-                    if slot_b == 'next':
-                        self.next_jammer.append(jammer_b)
-                    else:
-                        self.third_jammer.append(jammer_b)
-                    print(f"REST-Jammer bleibt: {jammer_b['name']}")
-            elif slot_a == 'next':
-                self.next_jammer.append(jammer_b)
-            else:  # third
-                self.third_jammer.append(jammer_b)
-            
-            if slot_b == 'current':
-                # Jammer A wird zu Current → prüfe REST
-                if jammer_a.get("status") != "REST":
-                    self.current_jammer.append(jammer_a)
-                else:
-                    # REST bleibt in ursprünglicher Position
-                    if slot_a == 'next':
-                        self.next_jammer.append(jammer_a)
-                    else:
-                        self.third_jammer.append(jammer_a)
-                    print(f"REST-Jammer bleibt: {jammer_a['name']}")
-            elif slot_b == 'next':
-                self.next_jammer.append(jammer_a)
-            else:  # third
-                self.third_jammer.append(jammer_a)
-        
-        elif count == 3:
-            # 3-Wege-Rotation: Current → Third → Next → Current
-            # (Rückwärts im Vergleich zu Lines)
-            jammer_current = jammer_map['current']
-            jammer_next = jammer_map['next']
-            jammer_third = jammer_map['third']
-            
-            self.current_jammer.clear()
-            self.next_jammer.clear()
-            self.third_jammer.clear()
-            
-            # Current → Third
-            self.third_jammer.append(jammer_current)
-            # Third → Next
-            self.next_jammer.append(jammer_third)
-            # Next → Current (nur wenn NICHT REST)
-            if jammer_next.get("status") != "REST":
-                self.current_jammer.append(jammer_next)
-            else:
-                # REST-Jammer bleibt in Next
-                self.next_jammer.append(jammer_next)
-                print(f"REST-Jammer bleibt in Next: {jammer_next['name']}")
-
-    def _rotate_lines(self):
-        """
-        Rotiert nur zwischen belegten Line-Slots.
-        """
-        # Sammle belegte Line-Slots
-        line_map = {}
-        if self.line_a:
-            line_map['a'] = list(self.line_a)  # Kopie der Liste
-        if self.line_b:
-            line_map['b'] = list(self.line_b)
-        if self.line_c:
-            line_map['c'] = list(self.line_c)
-        
-        # Anzahl belegter Slots
-        count = len(line_map)
-        
-        if count == 0:
-            # Keine Lines → nichts tun
-            return
-        
-        elif count == 1:
-            # Nur 1 Line → keine Rotation möglich
-            return
-        
-        elif count == 2:
-            # 2-Wege-Rotation zwischen den beiden belegten Slots
-            slots = list(line_map.keys())
-            slot_a, slot_b = slots[0], slots[1]
-            
-            # Originale Listen
-            line_players_a = line_map[slot_a]
-            line_players_b = line_map[slot_b]
-            
-            # Filtere REST-Spieler aus der Line die zu Current (A) wird
-            if slot_a == 'a':
-                # Line B wird zu Current A → filtere REST
-                line_b_normal = [p for p in line_players_b if p.get("status") != "REST"]
-                line_b_rest = [p for p in line_players_b if p.get("status") == "REST"]
-            else:
-                line_b_normal = line_players_b
-                line_b_rest = []
-            
-            if slot_b == 'a':
-                # Line A wird zu Current A → filtere REST
-                line_a_normal = [p for p in line_players_a if p.get("status") != "REST"]
-                line_a_rest = [p for p in line_players_a if p.get("status") == "REST"]
-            else:
-                line_a_normal = line_players_a
-                line_a_rest = []
-            
-            # Leere alle
-            self.line_a.clear()
-            self.line_b.clear()
-            self.line_c.clear()
-            
-            # Setze getauscht (mit REST-Filter)
-            if slot_a == 'a':
-                self.line_a.extend(line_b_normal)
-                # REST-Spieler bleiben in ihrer ursprünglichen Line
-                if line_b_rest:
-                    if slot_b == 'b':
-                        self.line_b.extend(line_b_rest)
-                    elif slot_b == 'c':
-                        self.line_c.extend(line_b_rest)
-            elif slot_a == 'b':
-                self.line_b.extend(line_b_normal)
-            else:  # c
-                self.line_c.extend(line_b_normal)
-            
-            if slot_b == 'a':
-                self.line_a.extend(line_a_normal)
-                # REST-Spieler bleiben in ihrer ursprünglichen Line
-                if line_a_rest:
-                    if slot_a == 'b':
-                        self.line_b.extend(line_a_rest)
-                    elif slot_a == 'c':
-                        self.line_c.extend(line_a_rest)
-            elif slot_b == 'b':
-                self.line_b.extend(line_a_normal)
-            else:  # c
-                self.line_c.extend(line_a_normal)
-        
-        elif count == 3:
-            # 3-Wege-Rotation: A → C → B → A (rückwärts)
-            line_a_players = list(self.line_a)
-            line_b_players = list(self.line_b)
-            line_c_players = list(self.line_c)
-            
-            # REST-Spieler aus Line B filtern (würden nach Current kommen)
-            line_b_normal = [p for p in line_b_players if p.get("status") != "REST"]
-            line_b_rest = [p for p in line_b_players if p.get("status") == "REST"]
-            
-            self.line_a.clear()
-            self.line_b.clear()
-            self.line_c.clear()
-            
-            # A → C
-            self.line_c.extend(line_a_players)
-            # C → B (inkl. REST-Spieler die dort bleiben)
-            self.line_b.extend(line_c_players)
-            self.line_b.extend(line_b_rest)  # REST-Spieler bleiben in Next
-            # B → A (nur NORMAL-Spieler)
-            self.line_a.extend(line_b_normal)
-            
-            if line_b_rest:
-                print(f"REST-Spieler bleiben in Next Line: {[p['name'] for p in line_b_rest]}")
-
     def show_incomplete_line_warning(self):
         """
         Zeigt Warnung wenn Current Line unvollständig ist.
@@ -1124,57 +652,18 @@ class MainLayout(BoxLayout):
         - Trotzdem rotieren (ohne auffüllen)
         - Abbrechen
         """
-        content = BoxLayout(orientation="vertical", spacing=20, padding=20)
-        
         # Detaillierte Info über Current Line
-        line_info = self.get_line_info(self.line_a)
-        
-        msg = Label(
-            text=f"Current Line ist unvollständig!\n\n{line_info}",
-            font_size="20sp",
-            size_hint_y=0.5,
-            halign="center",
-            valign="middle"
-        )
-        msg.bind(size=msg.setter("text_size"))
-        
-        btn_box = BoxLayout(spacing=10, size_hint_y=0.5, orientation="vertical")
-        
-        popup = Popup(
-            title="⚠️ Line unvollständig",
-            content=content,
-            size_hint=(0.7, 0.5)
+        line_info = self.engine.get_line_info(self.engine.slot("line_a"))
+        
+        self.dialog("warning").show(
+            "⚠️ Line unvollständig",
+            f"Current Line ist unvollständig!\n\n{line_info}",
+            [
+                ("Auto-Fill & Rotieren", self._autofill_and_rotate),
+                ("Trotzdem rotieren", self._force_rotate),
+                ("Abbrechen", None)
+            ]
         )
-        
-        # Button 1: Auto-Fill & Rotieren
-        autofill_btn = Button(
-            text="Auto-Fill & Rotieren",
-            font_size="22sp",
-            on_release=lambda x: self._autofill_and_rotate(popup)
-        )
-        
-        # Button 2: Trotzdem rotieren (ohne Fill)
-        force_btn = Button(
-            text="Trotzdem rotieren",
-            font_size="22sp",
-            on_release=lambda x: self._force_rotate(popup)
-        )
-        
-        # Button 3: Abbrechen
-        cancel_btn = Button(
-            text="Abbrechen",
-            font_size="22sp",
-            on_release=popup.dismiss
-        )
-        
-        btn_box.add_widget(autofill_btn)
-        btn_box.add_widget(force_btn)
-        btn_box.add_widget(cancel_btn)
-        
-        content.add_widget(msg)
-        content.add_widget(btn_box)
-        
-        popup.open()
 
     def _autofill_and_rotate(self, popup):
         """
@@ -1182,38 +671,15 @@ class MainLayout(BoxLayout):
         """
         popup.dismiss()
         
-        # Versuche aufzufüllen
-        success = self.auto_fill_current_line()
-        
-        if success:
-            # Erfolgreich aufgefüllt → Rotieren
-            self._rotate_jammers()
-            self._rotate_lines()
+        if self.engine.autofill_and_rotate():
+            # Erfolgreich aufgefüllt → Rotiert
             self._save_to_history()
             self.update_ui()
-            self.show_info_popup("Line aufgefüllt & rotiert!", duration=2)
+            self.notify("Line aufgefüllt & rotiert!", duration=2)
         else:
             # Konnte nicht auffüllen
-            self.show_info_popup("Keine Ersatzspieler*innen verfügbar!\nRotation abgebrochen.")
-
-    def get_line_info(self, line_list):
-        """
-        Gibt detaillierte Info über eine Line zurück.
-        """
-        count = len(line_list)
-        pivot_count = sum(1 for p in line_list if p["role"] == "P")
-        blocker_count = sum(1 for p in line_list if p["role"] == "B")
-        
-        info = f"Aktuell: {count}/4 Spieler*innen\n"
-        info += f"Blocker: {blocker_count}, Pivot: {pivot_count}\n"
-        
-        if count < 4:
-            missing = 4 - count
-            info += f"Fehlend: {missing} Spieler*innen"
-        elif pivot_count > 1:
-            info += f"Problem: Zu viele Pivots ({pivot_count})"
-        
-        return info
+            self.update_ui()
+            self.notify("Keine Ersatzspieler*innen verfügbar!\nRotation abgebrochen.")
 
     def _force_rotate(self, popup):
         """
@@ -1222,8 +688,7 @@ class MainLayout(BoxLayout):
         popup.dismiss()
         
         # Rotation ohne Check durchführen
-        self._rotate_jammers()
-        self._rotate_lines()
+        self.engine.force_rotate()
         
         self._save_to_history()
         self.update_ui()
@@ -1231,41 +696,11 @@ class MainLayout(BoxLayout):
     # -----------------------------------------------------
     def confirm_clear_boxes(self):
         """Zeigt Bestätigungsdialog bevor alle Boxen geleert werden"""
-        content = BoxLayout(orientation="vertical", spacing=20, padding=20)
-        
-        msg = Label(
-            text="Möchtest du wirklich alle Zuweisungen löschen?",
-            font_size="20sp",
-            size_hint_y=0.6
-        )
-        
-        btn_box = BoxLayout(spacing=10, size_hint_y=0.4)
-        
-        popup = Popup(
-            title="Alle Boxen leeren?",
-            content=content,
-            size_hint=(0.6, 0.3)
+        self.dialog("confirm").show(
+            "Alle Boxen leeren?",
+            "Möchtest du wirklich alle Zuweisungen löschen?",
+            [("Nein", None), ("Ja", self._clear_boxes_confirmed)]
         )
-        
-        yes_btn = Button(
-            text="Ja",
-            font_size="22sp",
-            on_release=lambda x: self._clear_boxes_confirmed(popup)
-        )
-        
-        no_btn = Button(
-            text="Nein",
-            font_size="22sp",
-            on_release=popup.dismiss
-        )
-        
-        btn_box.add_widget(no_btn)
-        btn_box.add_widget(yes_btn)
-        
-        content.add_widget(msg)
-        content.add_widget(btn_box)
-        
-        popup.open()
 
     def _clear_boxes_confirmed(self, popup):
         """Führt das Leeren nach Bestätigung aus"""
@@ -1273,162 +708,126 @@ class MainLayout(BoxLayout):
         popup.dismiss()
 
     def clear_boxes(self):
-        self.current_jammer.clear()
-        self.next_jammer.clear()
-        self.third_jammer.clear()
-        self.line_a.clear()
-        self.line_b.clear()
-        self.line_c.clear()
-        self.penalty.clear()
-        self.injured.clear()
+        self.engine.clear_boxes()
         self._save_to_history()
         self.update_ui()
 
+    # -----------------------------------------------------
+    # Periode / Bout (Jam-Log, siehe jam_log.py)
+    # -----------------------------------------------------
+    def confirm_new_period(self):
+        """Fragt, ob die folgenden Jams zur nächsten Periode oder zum nächsten Bout zählen"""
+        log = self.engine.jam_log
+        self.dialog("confirm").show(
+            "Periode beenden?",
+            f"Bout {log.bout}, Periode {log.period}: {log.next_jam() - 1} Jams",
+            [("Abbrechen", None),
+             ("Neuer Bout", lambda popup: self._start_period(popup, new_bout=True)),
+             ("Neue Periode", lambda popup: self._start_period(popup, new_bout=False))]
+        )
+
+    def _start_period(self, popup, new_bout):
+        popup.dismiss()
+        self.engine.start_period(new_bout)
+        self._save_to_history()
+        log = self.engine.jam_log
+        self.notify(f"Bout {log.bout}, Periode {log.period}")
+
     # -----------------------------------------------------
     # IMPORT JSON (mit Lineup-Support)
     # -----------------------------------------------------
     def import_players_json(self):
-        chooser = FileChooserListView(
-            filters=["*.json"],
-            path=get_start_path(),
-            size_hint=(1, 1)
+        from roster_import import ImportJob
+        import snapshot
+        
+        request_storage_permissions()
+        
+        def load_file(path):
+            if self._import_job is not None and self._import_job.is_running():
+                self.notify("Import läuft bereits!")
+                return
+            
+            # Lesen + Prüfen im Hintergrund, UI bleibt bedienbar
+            self.importing = True
+            self.import_progress = 0
+            self.import_message = os.path.basename(path)
+            self._import_job = ImportJob(
+                path,
+                on_progress=self._on_import_progress,
+                on_done=self._on_import_done,
+                on_error=self._on_import_error
+            )
+            self._import_job.start()
+
+        self.file_picker().show(
+            "JSON- oder Archiv-Datei auswählen (Spieler oder Lineup)",
+            load_file,
+            mode="file",
+            key="import",
+            extensions=(".json", snapshot.SNAPSHOT_EXT),
+            start_path=get_start_path()
         )
 
-        scroll = ScrollView()
-        scroll.add_widget(chooser)
+    def dialog(self, name):
+        """Wiederverwendbarer Dialog aus dem DialogPool"""
+        return self._dialog_pool().get(name)
 
-        popup = Popup(
-            title="JSON-Datei auswählen (Spieler oder Lineup)",
-            content=scroll,
-            size_hint=(0.9, 0.9)
-        )
+    def _dialog_pool(self):
+        if self._dialogs is None:
+            from dialogs import DialogPool
+            self._dialogs = DialogPool()
+        return self._dialogs
 
-        def load_file(instance, selection, touch):
-            if not selection:
-                return
-            data = load_json(selection[0], None)
-            
-            if data is None:
-                print(f"Fehler beim Laden von {selection[0]}")
-                return
-            
-            # FALL 1: Neue Struktur mit "players" und "assignments"
-            if isinstance(data, dict) and "players" in data:
-                # Migration beim Import
-                for player in data["players"]:
-                    if "status" not in player:
-                        player["status"] = "NORMAL"
-                
-                self.players = data["players"]
-                
-                # Lade Zuweisungen (falls vorhanden)
-                if "assignments" in data:
-                    assignments = data["assignments"]
-                    # Direkte Zuweisung ohne deepcopy - ListProperty kann Listen zuweisen
-                    self.current_jammer = list(assignments.get('current_jammer', []))
-                    self.next_jammer = list(assignments.get('next_jammer', []))
-                    self.third_jammer = list(assignments.get('third_jammer', []))
-                    self.line_a = list(assignments.get('line_a', []))
-                    self.line_b = list(assignments.get('line_b', []))
-                    self.line_c = list(assignments.get('line_c', []))
-                    self.penalty = list(assignments.get('penalty', []))
-                    self.injured = list(assignments.get('injured', []))
-                    print("✓ Lineup (Spieler + Zuweisungen) importiert")
-                else:
-                    # Nur Spieler, keine Zuweisungen
-                    self.clear_boxes()
-                    print("✓ Nur Spieler importiert (keine Zuweisungen)")
-                
-                self.save_players()
-                self._save_to_history()
-                self.update_ui()
-                popup.dismiss()
-                self.show_info_popup("Import erfolgreich!", duration=2)
-            
-            # FALL 2: Alte Struktur - einfache Liste von Spielern
-            elif isinstance(data, list):
-                # Migration beim Import
-                for player in data:
-                    if "status" not in player:
-                        player["status"] = "NORMAL"
-                
-                self.players = data
-                self.clear_boxes()
-                self.save_players()
-                self._save_to_history()
-                self.update_ui()
-                popup.dismiss()
-                print("✓ Spieler-Liste importiert (alte Struktur)")
-                self.show_info_popup("Spieler importiert!", duration=2)
-            
-            else:
-                print(f"Ungültiges JSON-Format in {selection[0]}")
-                self.show_info_popup("Ungültiges Dateiformat!")
+    def _warm_up_dialogs(self, dt):
+        self._dialog_pool().warm_up()
+
+    def file_picker(self):
+        if self._file_picker is None:
+            from file_picker import FilePicker
+            self._file_picker = FilePicker()
+        return self._file_picker
 
-        chooser.bind(on_submit=load_file)
-        popup.open()
+    @mainthread
+    def _on_import_progress(self, fraction, message):
+        self.import_progress = fraction
+        self.import_message = message
+
+    @mainthread
+    def _on_import_done(self, data, skipped):
+        """Übernimmt den geprüften Import in einem Schritt (Main-Thread)"""
+        self.importing = False
+        kind = self.engine.load_lineup(data)
+        
+        self._save_to_history()
+        # Import ersetzt den ganzen Roster: direkt neuer Checkpoint
+        self.save_players()
+        self.update_ui()
+        
+        hint = f"\n({skipped} ungültige Einträge übersprungen)" if skipped else ""
+        if kind == "lineup":
+            print("✓ Lineup (Spieler + Zuweisungen) importiert")
+            self.notify("Import erfolgreich!" + hint, duration=2)
+        else:
+            print("✓ Nur Spieler importiert (keine Zuweisungen)")
+            self.notify("Spieler importiert!" + hint, duration=2)
+
+    @mainthread
+    def _on_import_error(self, message):
+        self.importing = False
+        self.notify("Ungültiges Dateiformat!")
 
     # -----------------------------------------------------
     # EXPORT JSON (mit Lineup-Support)
     # -----------------------------------------------------
     def export_players_json(self):
-        from kivy.uix.textinput import TextInput
-        
-        content = BoxLayout(orientation="vertical", spacing=15, padding=15)
-        
-        # Info-Text
-        info = Label(
-            text="Wähle was exportiert werden soll:",
-            font_size="22sp",
-            size_hint_y=None,
-            height=40
-        )
-        
-        # Filename Input
-        filename_box = BoxLayout(orientation="horizontal", spacing=10, size_hint_y=None, height=60)
-        filename_input = TextInput(
-            text="lineup_export.json",
-            font_size="20sp",
-            multiline=False
-        )
-        filename_box.add_widget(Label(text="Dateiname:", size_hint_x=0.3, font_size="20sp"))
-        filename_box.add_widget(filename_input)
-        
-        # Export-Optionen
-        export_options = GridLayout(cols=1, spacing=10, size_hint_y=None, height=200)
-        
-        popup = Popup(
-            title="Export Optionen",
-            content=content,
-            size_hint=(0.7, 0.6)
-        )
-        
-        # Option 1: Nur Spieler
-        btn_players_only = Button(
-            text="Nur Spieler\n(ohne Zuweisungen)",
-            font_size="20sp",
-            size_hint_y=None,
-            height=60,
-            on_release=lambda x: self._export_players_only(filename_input.text, popup)
-        )
-        
-        # Option 2: Komplettes Lineup
-        btn_full_lineup = Button(
-            text="Komplettes Lineup\n(Spieler + Zuweisungen)",
-            font_size="20sp",
-            size_hint_y=None,
-            height=60,
-            on_release=lambda x: self._export_full_lineup(filename_input.text, popup)
-        )
-        
-        export_options.add_widget(btn_players_only)
-        export_options.add_widget(btn_full_lineup)
-        
-        content.add_widget(info)
-        content.add_widget(filename_box)
-        content.add_widget(export_options)
-        
-        popup.open()
+        request_storage_permissions()
+        self.dialog("export").show(self._export_chosen)
+
+    def _export_chosen(self, kind, filename, popup):
+        if kind == "players":
+            self._export_players_only(filename, popup)
+        else:
+            self._export_full_lineup(filename, popup, archive=(kind == "archive"))
 
     def _export_players_only(self, filename, popup):
         """Exportiert nur Spieler-Liste"""
@@ -1436,121 +835,283 @@ class MainLayout(BoxLayout):
         if not filename.endswith('.json'):
             filename += '.json'
         
-        chooser = FileChooserListView(
-            path=get_start_path(),
-            dirselect=True,
-            size_hint=(1, 1)
-        )
-
-        scroll = ScrollView()
-        scroll.add_widget(chooser)
-
-        dir_popup = Popup(
-            title="Export-Zielordner wählen",
-            content=scroll,
-            size_hint=(0.9, 0.9)
-        )
-
-        def save_file(instance, selection, touch):
-            if not selection:
-                return
-            target_dir = selection[0]
+        def save_file(target_dir):
             if not os.path.isdir(target_dir):
                 return
             
-            # Nur Spieler exportieren
-            save_json(os.path.join(target_dir, filename), self.players)
-            print(f"✓ Nur Spieler exportiert: {filename}")
-            self.show_info_popup(f"Spieler exportiert:\n{filename}", duration=2)
-            dir_popup.dismiss()
+            # Nur Spieler exportieren; Meldung erst nach dem Schreiben
+            save_json(
+                os.path.join(target_dir, filename), self.engine.players,
+                on_done=lambda data: self._on_export_saved("Spieler", filename),
+                on_error=lambda error: self._on_export_failed(filename, error)
+            )
             popup.dismiss()
 
-        chooser.bind(on_submit=save_file)
-        dir_popup.open()
+        self.file_picker().show(
+            "Export-Zielordner wählen",
+            save_file,
+            mode="dir",
+            key="export",
+            start_path=get_start_path()
+        )
 
-    def _export_full_lineup(self, filename, popup):
-        """Exportiert komplettes Lineup (Spieler + Zuweisungen)"""
+    def _export_full_lineup(self, filename, popup, archive=False):
+        """Exportiert komplettes Lineup (Spieler + Zuweisungen), optional als Snapshot"""
+        import snapshot
+        
         filename = (filename or "lineup_export.json").strip()
-        if not filename.endswith('.json'):
-            filename += '.json'
+        ext = snapshot.SNAPSHOT_EXT if archive else '.json'
+        if filename.endswith('.json') or filename.endswith(snapshot.SNAPSHOT_EXT):
+            filename = os.path.splitext(filename)[0]
+        filename += ext
         
-        chooser = FileChooserListView(
-            path=get_start_path(),
-            dirselect=True,
-            size_hint=(1, 1)
-        )
-
-        scroll = ScrollView()
-        scroll.add_widget(chooser)
-
-        dir_popup = Popup(
-            title="Export-Zielordner wählen",
-            content=scroll,
-            size_hint=(0.9, 0.9)
-        )
-
-        def save_file(instance, selection, touch):
-            if not selection:
-                return
-            target_dir = selection[0]
+        def save_file(target_dir):
             if not os.path.isdir(target_dir):
                 return
             
-            # Komplettes Lineup exportieren
-            export_data = {
-                "players": self.players,
-                "assignments": {
-                    "current_jammer": self.current_jammer,
-                    "next_jammer": self.next_jammer,
-                    "third_jammer": self.third_jammer,
-                    "line_a": self.line_a,
-                    "line_b": self.line_b,
-                    "line_c": self.line_c,
-                    "penalty": self.penalty,
-                    "injured": self.injured
-                }
-            }
-            
-            save_json(os.path.join(target_dir, filename), export_data)
-            print(f"✓ Komplettes Lineup exportiert: {filename}")
-            self.show_info_popup(f"Lineup exportiert:\n{filename}", duration=2)
-            dir_popup.dismiss()
+            # Komplettes Lineup exportieren; Meldung erst nach dem Schreiben
+            path = os.path.join(target_dir, filename)
+            on_done = lambda data: self._on_export_saved("Lineup", filename)
+            on_error = lambda error: self._on_export_failed(filename, error)
+            if archive:
+                persistence.save_service.save(
+                    path, self.engine.export_state(), writer=snapshot.write_snapshot,
+                    on_done=on_done, on_error=on_error
+                )
+            else:
+                save_json(path, self.engine.export_lineup(), on_done=on_done, on_error=on_error)
             popup.dismiss()
 
-        chooser.bind(on_submit=save_file)
-        dir_popup.open()
+        self.file_picker().show(
+            "Export-Zielordner wählen",
+            save_file,
+            mode="dir",
+            key="export",
+            start_path=get_start_path()
+        )
+
+    @mainthread
+    def _on_export_saved(self, what, filename):
+        """Export-Datei ist geschrieben (Callback aus dem SaveService-Thread)"""
+        print(f"✓ {what} exportiert: {filename}")
+        self.notify(f"{what} exportiert:\n{filename}", duration=2)
+
+    @mainthread
+    def _on_export_failed(self, filename, error):
+        print(f"Export fehlgeschlagen: {filename}: {error}")
+        self.notify(f"Export fehlgeschlagen:\n{filename}", duration=3)
 
     # -----------------------------------------------------
     def update_ui(self):
+        """
+        Gleicht die angezeigten PlayerCards mit dem Engine-Zustand ab.
+
+        Karten werden pro player_id wiederverwendet: Nur neue Spieler*innen
+        bekommen eine neue Karte, entfernte verlieren ihre Karte, und nur
+        Boxen deren Reihenfolge sich geändert hat werden umgehängt.
+        """
         if not self.ids:
             return
 
-        def fill(box_id, data):
-            box = self.ids.get(box_id)
+        if not self._ui_initialized:
+            # Statische Kinder aus derby.kv (Überschriften) wurden schon immer
+            # beim ersten Aufbau entfernt - Boxen enthalten nur PlayerCards
+            for name in ("player_pool",) + tuple(f"{slot}_box" for slot in self.engine.slots):
+                box = self.ids.get(name)
+                if box:
+                    box.clear_widgets()
+            self._ui_initialized = True
+            self._register_drop_zones()
+
+        # Einmal pro Refresh: wer ist irgendeiner Box zugewiesen?
+        assigned = set(self.engine.assigned_ids())
+
+        # Karten gelöschter bzw. nicht mehr zugewiesener Spieler*innen verwerfen
+        self._discard_cards(self._pool_cards, {p["id"] for p in self.engine.players})
+        self._discard_cards(self._box_cards, assigned)
+
+        # Player Pool: zeigt immer alle Spieler*innen
+        if self._use_virtual_pool():
+            self._show_virtual_pool(assigned)
+        else:
+            self._show_widget_pool()
+            self._reconcile_box(self.ids.player_pool, self.engine.players, self._pool_cards, assigned)
+
+        for name, data in self.engine.slots.items():
+            box = self.ids.get(f"{name}_box")
             if box:
-                box.clear_widgets()
-                for p in data:
-                    box.add_widget(PlayerCard(p, self))
+                self._reconcile_box(box, data, self._box_cards)
+
+        # Simulation ohne Seiteneffekte, wenige µs pro Jam
+        self.lookahead_text = format_preview(simulate(self.engine))
+
+    def _reconcile_box(self, box, players, cards, assigned=None):
+        """
+        Bringt die PlayerCards einer Box in die Reihenfolge von players.
+
+        Args:
+            cards: dict player_id -> PlayerCard (Karten-Cache für diese Box-Art)
+            assigned: Menge zugewiesener player_ids (nur für den Player Pool);
+                      None = alle Karten liegen in einer Box
+        """
+        desired = [self._card_for(p, cards, assigned is not None and p["id"] not in assigned)
+                   for p in players]
 
-        self.ids.player_pool.clear_widgets()
-        for p in self.players:
-            self.ids.player_pool.add_widget(PlayerCard(p, self))
+        # Kivy: children[0] ist das zuletzt hinzugefügte (= unterste) Widget
+        current = [w for w in reversed(box.children) if isinstance(w, PlayerCard)]
 
-        fill("current_jammer_box", self.current_jammer)
-        fill("next_jammer_box", self.next_jammer)
-        fill("third_jammer_box", self.third_jammer)
-        fill("line_a_box", self.line_a)
-        fill("line_b_box", self.line_b)
-        fill("line_c_box", self.line_c)
-        fill("penalty_box", self.penalty)
-        fill("injured_box", self.injured)
+        # Ab der ersten Abweichung neu einhängen (Karten werden wiederverwendet)
+        first_diff = 0
+        for have, want in zip(current, desired):
+            if have is not want:
+                break
+            first_diff += 1
+        else:
+            if len(current) == len(desired):
+                return
+
+        for card in current[first_diff:]:
+            box.remove_widget(card)
+        for card in desired[first_diff:]:
+            if card.parent:
+                card.parent.remove_widget(card)
+            box.add_widget(card)
+
+    # -----------------------------------------------------
+    # PLAYER POOL MODUS (Widgets oder RecycleView)
+    # -----------------------------------------------------
+    def on_pool_mode(self, instance, value):
+        self.update_ui()
+
+    def _use_virtual_pool(self):
+        if self.pool_mode == "auto":
+            return len(self.engine.players) > VIRTUAL_POOL_THRESHOLD
+        return self.pool_mode == "virtual"
+
+    def pool_drop_zone(self):
+        """Sichtbarer Bereich des Player Pools (für Drop-Erkennung)"""
+        if self._pool_view is not None and self._pool_view.parent:
+            return self._pool_view
+        return self.ids.get("pool_scroll")
+
+    def _register_drop_zones(self):
+        zones = [("player_pool", self.pool_drop_zone())]
+        zones.extend((name, self.ids.get(f"{name}_box")) for name in self.engine.slots)
+        self.drop_zones.set_zones(zones)
+        for name, box in zones[1:]:
+            if box is not None and name not in self._card_rows:
+                self._card_rows[name] = CardRows(box)
+
+    # -----------------------------------------------------
+    # Touch-Weiterleitung in den Boxen
+    # -----------------------------------------------------
+    def _card_rows_at(self, touch):
+        """CardRows der Box unter dem Touch (None außerhalb der Boxen / im Player Pool)"""
+        if not self._card_rows:
+            return None
+        target = self.drop_zones.target_at(touch.x, touch.y)
+        return self._card_rows.get(target)
+
+    def on_touch_down(self, touch):
+        # In den Boxen bekommt nur die Karte unter dem Finger den Touch,
+        # statt dass jede Karte jeder Box collide_point prüft
+        rows = self._card_rows_at(touch)
+        if rows is None:
+            return super().on_touch_down(touch)
+        card = rows.card_at(touch.x, touch.y)
+        return card is not None and card.dispatch("on_touch_down", touch)
+
+    def on_touch_move(self, touch):
+        # Karten und ihre Buttons bekommen move/up über touch.grab
+        if self._card_rows_at(touch) is not None:
+            return False
+        return super().on_touch_move(touch)
+
+    def on_touch_up(self, touch):
+        if self._card_rows_at(touch) is not None:
+            return False
+        return super().on_touch_up(touch)
+
+    def _swap_pool_widget(self, old, new):
+        holder = old.parent
+        index = holder.children.index(old)
+        holder.remove_widget(old)
+        holder.add_widget(new, index=index)
+        self._register_drop_zones()
+
+    def _show_virtual_pool(self, assigned):
+        if self._pool_view is None:
+            self._pool_view = PlayerPoolView()
+
+        if not self._pool_view.parent:
+            # Einzelkarten verwerfen - die RecycleView instanziiert nur sichtbare Zeilen
+            self.ids.player_pool.clear_widgets()
+            self._pool_cards.clear()
+            self._swap_pool_widget(self.ids.pool_scroll, self._pool_view)
+            print(f"Player Pool: RecycleView ({len(self.engine.players)} Spieler*innen)")
+
+        self._pool_view.data = [
+            {"player": p, "in_pool": p["id"] not in assigned, "parent_layout": self}
+            for p in self.engine.players
+        ]
+
+    def _show_widget_pool(self):
+        if self._pool_view is not None and self._pool_view.parent:
+            self._pool_view.data = []
+            self._swap_pool_widget(self._pool_view, self.ids.pool_scroll)
+            print("Player Pool: Einzelkarten")
+
+    def _card_for(self, player, cards, in_pool):
+        """Karten-Factory: wiederverwendete oder neue PlayerCard für player"""
+        card = cards.get(player["id"])
+        if card is None:
+            card = cards[player["id"]] = PlayerCard(player, self, in_pool)
+        else:
+            card.refresh(player, in_pool)
+        return card
+
+    def _discard_cards(self, cards, keep_ids):
+        for pid in [pid for pid in cards if pid not in keep_ids]:
+            card = cards.pop(pid)
+            if card.parent:
+                card.parent.remove_widget(card)
 
 
 # ---------------------------------------------------------
 class DerbyApp(MDApp):
+    def load_kv(self, filename=None):
+        with timeline.span("derby.kv laden"):
+            return super().load_kv(filename)
+
     def build(self):
+        # Vollbild für Tablet / Desktop (erst hier, nicht beim Import)
+        Window.fullscreen = "auto"
         self.theme_cls.primary_palette = "BlueGray"
-        return MainLayout()
+        with timeline.span("MainLayout bauen"):
+            return MainLayout()
+
+    def on_start(self):
+        timeline.mark("App: on_start")
+        if timeline.enabled:
+            Window.bind(on_flip=self._on_first_frame)
+
+    def _on_first_frame(self, window):
+        window.unbind(on_flip=self._on_first_frame)
+        timeline.mark("Erster Frame")
+        # Frame mit allen Karten abwarten, dann ausgeben
+        Clock.schedule_once(lambda dt: timeline.dump(), 0.5)
+
+    def on_pause(self):
+        # Android beendet pausierte Apps ohne on_stop: Checkpoint sofort schreiben
+        self.root.save_players(background=False)
+        return True
+
+    def on_stop(self):
+        # Sitzung sauber abschließen: Checkpoint schreiben, Journal leeren
+        self.root.save_players(background=False)
+        self.root.journal.close()
+        # Flush-on-exit: auch ausstehende Exporte noch auf Disk bringen
+        persistence.flush()
 
 
 if __name__ == "__main__":
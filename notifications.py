@@ -0,0 +1,187 @@
+"""
+Nicht-modale Hinweise (Toasts) statt Info-Popups.
+
+NotificationQueue sammelt die Meldungen: Gleiche Meldungen (bzw. Meldungen
+mit gleichem key) werden zusammengefasst statt gestapelt, höchstens
+MAX_VISIBLE_TOASTS sind gleichzeitig sichtbar, der Rest wartet.
+
+ToastOverlay zeigt die sichtbaren Meldungen in einem einzigen Widget über
+dem Fenster an. Die Labels werden einmal angelegt und wiederverwendet, ein
+einziger Clock-Callback läuft nur solange Meldungen aktiv sind. Touches
+gehen durch das Overlay hindurch, Drag & Drop wird also nie blockiert.
+"""
+import time
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, RoundedRectangle
+from kivy.metrics import dp
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+MAX_VISIBLE_TOASTS = 3
+TOAST_TICK = 0.1  # Sekunden zwischen zwei Prüfungen auf abgelaufene Toasts
+
+
+class Notification:
+    __slots__ = ("key", "message", "count", "duration", "expires")
+
+    def __init__(self, key, message, duration):
+        self.key = key
+        self.message = message
+        self.count = 1
+        self.duration = duration
+        self.expires = None  # Wird beim Anzeigen gesetzt
+
+    @property
+    def text(self):
+        if self.count > 1:
+            return f"{self.message}  (×{self.count})"
+        return self.message
+
+
+class NotificationQueue:
+    def __init__(self, max_visible=MAX_VISIBLE_TOASTS, clock=time.monotonic):
+        self.max_visible = max_visible
+        self.clock = clock
+        self.visible = []
+        self.pending = deque()
+
+    def __bool__(self):
+        return bool(self.visible or self.pending)
+
+    def push(self, message, duration=3, key=None):
+        """
+        Fügt eine Meldung hinzu oder frischt eine vorhandene auf.
+
+        Args:
+            key: Meldungen mit gleichem key ersetzen sich gegenseitig
+                 (Standard: der Text selbst)
+
+        Returns:
+            bool: True wenn sich die sichtbaren Meldungen geändert haben
+        """
+        key = key or message
+        now = self.clock()
+        for note in self.visible:
+            if note.key == key:
+                self._merge(note, message, duration)
+                note.expires = now + note.duration
+                return True
+        for note in self.pending:
+            if note.key == key:
+                self._merge(note, message, duration)
+                return False
+
+        note = Notification(key, message, duration)
+        if len(self.visible) < self.max_visible:
+            note.expires = now + duration
+            self.visible.append(note)
+            return True
+        self.pending.append(note)
+        return False
+
+    def _merge(self, note, message, duration):
+        if note.message == message:
+            note.count += 1
+        else:
+            note.message = message
+            note.count = 1
+        note.duration = max(note.duration, duration)
+
+    def expire(self):
+        """
+        Entfernt abgelaufene Meldungen und rückt wartende nach.
+
+        Returns:
+            bool: True wenn sich die sichtbaren Meldungen geändert haben
+        """
+        now = self.clock()
+        visible = [note for note in self.visible if note.expires > now]
+        changed = len(visible) != len(self.visible)
+        while self.pending and len(visible) < self.max_visible:
+            note = self.pending.popleft()
+            note.expires = now + note.duration
+            visible.append(note)
+            changed = True
+        self.visible = visible
+        return changed
+
+
+class Toast(Label):
+    def __init__(self, **kwargs):
+        super().__init__(
+            font_size="20sp",
+            halign="center",
+            valign="middle",
+            size_hint_y=None,
+            height=dp(56),
+            **kwargs
+        )
+        self.bind(width=lambda *a: setattr(self, "text_size", (self.width - dp(20), None)))
+        with self.canvas.before:
+            Color(0.15, 0.17, 0.2, 0.9)
+            self._bg = RoundedRectangle(radius=[dp(12)])
+        self.bind(pos=self._update_bg, size=self._update_bg)
+
+    def _update_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+
+
+class ToastOverlay(BoxLayout):
+    def __init__(self, queue=None, **kwargs):
+        super().__init__(
+            orientation="vertical",
+            spacing=dp(8),
+            size_hint=(None, None),
+            **kwargs
+        )
+        self.queue = queue or NotificationQueue()
+        self._toasts = [Toast() for _ in range(self.queue.max_visible)]
+        self._tick_event = None
+        Window.bind(size=self._reposition)
+
+    def notify(self, message, duration=3, key=None):
+        if self.parent is None:
+            Window.add_widget(self)
+        if self.queue.push(message, duration, key):
+            self._render()
+        if self._tick_event is None:
+            self._tick_event = Clock.schedule_interval(self._tick, TOAST_TICK)
+
+    def _tick(self, dt):
+        if self.queue.expire():
+            self._render()
+        if not self.queue:
+            self._tick_event.cancel()
+            self._tick_event = None
+            return False
+
+    def _render(self):
+        visible = self.queue.visible
+        for i, toast in enumerate(self._toasts):
+            if i < len(visible):
+                toast.text = visible[i].text
+                if toast.parent is None:
+                    self.add_widget(toast)
+            elif toast.parent is not None:
+                self.remove_widget(toast)
+        self.height = len(visible) * (dp(56) + self.spacing)
+        self._reposition()
+
+    def _reposition(self, *args):
+        self.width = Window.width * 0.5
+        self.x = (Window.width - self.width) / 2
+        self.y = dp(24)
+
+    def on_touch_down(self, touch):
+        # Nicht-modal: Touches nie abfangen
+        return False
+
+    def on_touch_move(self, touch):
+        return False
+
+    def on_touch_up(self, touch):
+        return False
@@ -0,0 +1,165 @@
+"""
+Persistenz: atomares, gebündeltes Speichern von JSON-Dateien.
+
+Speicheraufrufe kommen vom Kivy-Main-Thread und werden hier nur vorgemerkt.
+Ein Worker-Thread sammelt alle Aufrufe innerhalb eines kurzen Fensters
+(SAVE_DELAY), behält pro Datei nur den letzten Stand und schreibt ihn per
+temp-Datei + fsync + rename. Auf Disk liegt damit immer entweder die alte
+oder die neue Version - nie eine halb geschriebene Datei.
+
+Beim Beenden der App muss flush() aufgerufen werden (siehe DerbyApp.on_stop).
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+# Sammelfenster für Speicheraufrufe in Sekunden
+SAVE_DELAY = 0.5
+
+
+def sync_file(fileobj):
+    fileobj.flush()
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(fileobj.fileno())
+    else:
+        os.fsync(fileobj.fileno())
+
+
+def write_json_atomic(path, data, indent=2):
+    """Schreibt temp-Datei + fsync + rename: auf Disk liegt immer alt oder neu"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        sync_file(f)
+    os.replace(tmp_path, path)
+
+
+def copy_tree(data):
+    """Kopiert verschachtelte dicts/lists (schneller als deepcopy für JSON-Daten)"""
+    if isinstance(data, dict):
+        return {key: copy_tree(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [copy_tree(item) for item in data]
+    return data
+
+
+class SaveService:
+    def __init__(self, delay=SAVE_DELAY):
+        self.delay = delay
+        self._pending = {}       # path -> (data, write, on_done, on_error)
+        self._deadline = None    # Zeitpunkt, zu dem der Worker schreibt
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def save(self, path, data, indent=2, on_done=None, writer=None, on_error=None):
+        """
+        Merkt eine Datei zum Speichern vor (kehrt sofort zurück).
+
+        Args:
+            path: Zieldatei
+            data: JSON-Daten; dürfen danach nicht mehr verändert werden
+                  (siehe copy_tree)
+            indent: Einrückung wie bei json.dump
+            on_done: Optional, wird im Worker-Thread nach erfolgreichem
+                     Schreiben mit data aufgerufen
+            writer: Optional, writer(path, data) statt JSON (z.B. Snapshot)
+            on_error: Optional, wird im Worker-Thread mit der Exception
+                      aufgerufen, wenn das Schreiben fehlschlägt
+        """
+        write = writer or functools.partial(write_json_atomic, indent=indent)
+        with self._cond:
+            # Neuerer Stand ersetzt einen noch nicht geschriebenen älteren
+            self._pending[path] = (data, write, on_done, on_error)
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.delay
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pending(self):
+        with self._cond:
+            return bool(self._pending) or self._writing
+
+    def flush(self, timeout=None):
+        """
+        Schreibt alle vorgemerkten Dateien sofort und wartet darauf.
+
+        Returns:
+            bool: True wenn alles geschrieben wurde
+        """
+        with self._cond:
+            if self._pending:
+                self._deadline = time.monotonic()
+                self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Sammelfenster abwarten (flush() verkürzt es)
+                while True:
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending
+                self._pending = {}
+                self._deadline = None
+                self._writing = True
+
+            for path, (data, write, on_done, on_error) in batch.items():
+                try:
+                    write(path, data)
+                    print(f"Successfully saved {path}")
+                    if on_done:
+                        on_done(data)
+                except Exception as e:
+                    print(f"Error saving {path}: {e}")
+                    if on_error:
+                        on_error(e)
+
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+# Gemeinsame Instanz für die App
+save_service = SaveService()
+
+
+# ---------------------------------------------------------
+# JSON helpers
+# ---------------------------------------------------------
+def load_json(file, default):
+    if not os.path.exists(file):
+        print(f"File {file} does not exist, using default")
+        return default
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            print(f"Successfully loaded {file}")
+            return data
+    except json.JSONDecodeError as e:
+        print(f"JSON decode error in {file}: {e}")
+        return default
+    except Exception as e:
+        print(f"Error loading {file}: {e}")
+        return default
+
+
+def save_json(file, data, on_done=None, on_error=None):
+    """Speichert im Hintergrund; data wird vorher kopiert (Callbacks siehe SaveService.save)"""
+    save_service.save(file, copy_tree(data), indent=2, on_done=on_done, on_error=on_error)
+
+
+def flush():
+    """Wartet, bis alle vorgemerkten Dateien geschrieben sind (App-Ende)"""
+    save_service.flush()
@@ -0,0 +1,125 @@
+"""
+Spielzeit pro Spieler*in: gespielte Jams, Jams in Folge, Jams seit REST.
+
+Bei jeder Rotation meldet der LineupEngine die Besetzung des gerade
+gespielten Jams (Current Jammer + Current Line) per record_jam(). Das kostet
+O(Line-Größe): Nur die Zähler der Beteiligten werden angefasst. Wer nicht
+gespielt hat, wird nicht zurückgesetzt - "in Folge" ergibt sich beim Lesen
+daraus, ob der letzte gespielte Jam der aktuelle ist. Lesen ist damit O(1).
+
+record_jam() liefert die vorherigen Zähler der Beteiligten zurück; der
+Engine legt sie im Undo-Record ab, damit Undo/Redo und das Journal die
+Zähler exakt zurückdrehen bzw. wiederherstellen können.
+
+Die REST-Marke (Jams seit REST) wird beim Setzen des Status REST gesetzt.
+Der Engine legt alte und neue Marke mit der Status-Änderung im Undo-Record
+ab (rest_mark / set_rest_mark), Undo/Redo und Journal stellen sie exakt her.
+"""
+JAMS, STREAK, LAST_JAM, REST_MARK = range(4)
+
+# Ab diesen Werten zeigt die Karte "müde" (1) bzw. "sehr müde" (2) an
+FATIGUE_STREAK = (2, 3)      # Jams in Folge
+FATIGUE_SINCE_REST = (6, 10)  # Jams seit der letzten REST-Pause
+
+
+class PlayingTimeTracker:
+    def __init__(self):
+        self.jam_count = 0
+        self._counters = {}  # player_id -> [jams, streak, last_jam, rest_mark]
+
+    # -----------------------------------------------------
+    # Schreiben
+    # -----------------------------------------------------
+    def record_jam(self, player_ids):
+        """
+        Zählt einen gespielten Jam für die Beteiligten.
+
+        Returns:
+            dict: player_id -> vorherige Zähler (None = noch nie gespielt)
+        """
+        self.jam_count += 1
+        jam = self.jam_count
+        before = {}
+        for pid in player_ids:
+            counters = self._counters.get(pid)
+            if counters is None:
+                before[pid] = None
+                counters = self._counters[pid] = [0, 0, 0, 0]
+            else:
+                before[pid] = list(counters)
+            if counters[JAMS] and counters[LAST_JAM] == jam - 1:
+                counters[STREAK] += 1
+            else:
+                counters[STREAK] = 1
+            counters[JAMS] += 1
+            counters[LAST_JAM] = jam
+        return before
+
+    def unrecord_jam(self, before):
+        """Nimmt den zuletzt gezählten Jam zurück (Rückgabe von record_jam)"""
+        self.jam_count -= 1
+        for pid, counters in before.items():
+            if counters is None:
+                self._counters.pop(pid, None)
+            else:
+                self._counters[pid] = list(counters)
+
+    def mark_rest(self, player_id):
+        counters = self._counters.get(player_id)
+        if counters is not None:
+            counters[REST_MARK] = counters[JAMS]
+
+    def rest_mark(self, player_id):
+        """REST-Marke (None = noch nie gespielt)"""
+        counters = self._counters.get(player_id)
+        return counters[REST_MARK] if counters else None
+
+    def set_rest_mark(self, player_id, mark):
+        """Setzt eine gespeicherte REST-Marke zurück (Undo/Redo)"""
+        counters = self._counters.get(player_id)
+        if counters is not None and mark is not None:
+            counters[REST_MARK] = mark
+
+    # -----------------------------------------------------
+    # Lesen (O(1))
+    # -----------------------------------------------------
+    def jams(self, player_id):
+        counters = self._counters.get(player_id)
+        return counters[JAMS] if counters else 0
+
+    def consecutive(self, player_id):
+        """Jams in Folge bis einschließlich des letzten Jams (0 = hat zuletzt pausiert)"""
+        counters = self._counters.get(player_id)
+        if counters is None or counters[LAST_JAM] != self.jam_count:
+            return 0
+        return counters[STREAK]
+
+    def since_rest(self, player_id):
+        counters = self._counters.get(player_id)
+        return counters[JAMS] - counters[REST_MARK] if counters else 0
+
+    def fatigue(self, player_id):
+        """0 = frisch, 1 = müde, 2 = sehr müde"""
+        streak = self.consecutive(player_id)
+        since_rest = self.since_rest(player_id)
+        level = 0
+        for i in (0, 1):
+            if streak >= FATIGUE_STREAK[i] or since_rest >= FATIGUE_SINCE_REST[i]:
+                level = i + 1
+        return level
+
+    def load(self):
+        """player_id -> gespielte Jams (z.B. für line_builder.build_plan)"""
+        return {pid: counters[JAMS] for pid, counters in self._counters.items()}
+
+    # -----------------------------------------------------
+    # Persistenz (Teil von LineupEngine.export_state)
+    # -----------------------------------------------------
+    def export(self):
+        return {"jam_count": self.jam_count,
+                "players": {pid: list(c) for pid, c in self._counters.items()}}
+
+    def restore(self, data):
+        data = data or {}
+        self.jam_count = data.get("jam_count", 0)
+        self._counters = {pid: list(c) for pid, c in data.get("players", {}).items()}
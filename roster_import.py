@@ -0,0 +1,193 @@
+"""
+Import von Spieler-Listen und Lineups im Hintergrund (ohne Kivy).
+
+Ein ImportJob liest die Datei blockweise in einem Worker-Thread, parst sie
+dort und prüft/migriert die Datensätze in Blöcken von IMPORT_CHUNK. Der
+Fortschritt wird über on_progress gemeldet; das Ergebnis hat dieselbe
+Struktur wie die Eingabe und kann auf dem Main-Thread in einem Schritt mit
+LineupEngine.load_lineup übernommen werden.
+
+Alle Callbacks laufen im Worker-Thread - die UI muss sie selbst auf den
+Main-Thread holen (z.B. mit kivy.clock.mainthread).
+"""
+import json
+import os
+import threading
+
+import snapshot
+from lineup_engine import BOX_SLOTS, ROLES, STATUSES
+
+IMPORT_CHUNK = 500
+READ_BLOCK = 256 * 1024
+
+# Anteil der Phasen am Gesamtfortschritt
+READ_SHARE = 0.4
+PARSE_SHARE = 0.1
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def clean_player(raw):
+    """
+    Prüft und migriert einen Spieler-Datensatz (arbeitet auf einer Kopie).
+
+    Returns:
+        dict | None: Bereinigter Datensatz oder None wenn ungültig
+    """
+    if not isinstance(raw, dict):
+        return None
+    name = raw.get("name")
+    if not isinstance(name, str) or not name.strip():
+        return None
+    role = str(raw.get("role", "")).strip().upper()
+    if role not in ROLES:
+        return None
+
+    number = raw.get("number", "")
+    player = {
+        "name": name.strip(),
+        "number": "" if number is None else str(number).strip(),
+        "role": role,
+        # Migration: fehlender oder unbekannter Status -> NORMAL
+        "status": raw.get("status") if raw.get("status") in STATUSES else "NORMAL"
+    }
+    pid = raw.get("id")
+    if isinstance(pid, str) and pid:
+        player["id"] = pid
+    return player
+
+
+def clean_assignments(assignments):
+    """
+    Nur bekannte Boxen; Einträge werden wie Spieler bereinigt, damit ältere
+    Exporte ohne ID weiterhin über Name/Nummer/Rolle zugeordnet werden.
+    """
+    if not isinstance(assignments, dict):
+        return {}
+    cleaned = {}
+    for name in BOX_SLOTS:
+        entries = assignments.get(name)
+        if isinstance(entries, list):
+            cleaned[name] = [p for p in map(clean_player, entries) if p is not None]
+    return cleaned
+
+
+class ImportJob:
+    def __init__(self, path, on_progress=None, on_done=None, on_error=None,
+                 chunk_size=IMPORT_CHUNK):
+        """
+        Args:
+            path: JSON- oder Snapshot-Datei
+            on_progress: on_progress(fraction, message), fraction 0..1
+            on_done: on_done(data, skipped) mit bereinigten Import-Daten
+                     und der Anzahl verworfener Datensätze
+            on_error: on_error(message)
+        """
+        self.path = path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.chunk_size = chunk_size
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _report(self, fraction, message):
+        if self._cancelled.is_set():
+            raise ImportCancelled()
+        if self.on_progress:
+            self.on_progress(fraction, message)
+
+    def _run(self):
+        try:
+            data, skipped = self.run()
+        except ImportCancelled:
+            print(f"Import abgebrochen: {self.path}")
+            return
+        except (OSError, ValueError) as e:
+            print(f"Import-Fehler in {self.path}: {e}")
+            if self.on_error:
+                self.on_error(str(e))
+            return
+        except Exception as e:
+            # Auch unerwartete Fehler melden, sonst bleibt der Import-Fortschritt stehen
+            print(f"Unerwarteter Import-Fehler in {self.path}: {e!r}")
+            if self.on_error:
+                self.on_error(f"Datei nicht lesbar ({type(e).__name__})")
+            return
+        if self.on_done:
+            self.on_done(data, skipped)
+
+    def run(self):
+        """
+        Führt den Import synchron aus (im Worker-Thread oder z.B. in Skripten).
+
+        Returns:
+            tuple: (data, skipped)
+
+        Raises:
+            ValueError: Ungültiges Dateiformat
+            OSError: Datei nicht lesbar
+        """
+        if snapshot.is_snapshot_file(self.path):
+            self._report(0.0, "Lese Archiv ...")
+            data = snapshot.read_lineup(self.path)
+        else:
+            data = json.loads(self._read_text())
+        self._report(READ_SHARE + PARSE_SHARE, "Prüfe Spieler ...")
+
+        if isinstance(data, dict) and isinstance(data.get("players"), list):
+            players, skipped = self._clean_players(data["players"])
+            result = {"players": players}
+            if "assignments" in data:
+                result["assignments"] = clean_assignments(data["assignments"])
+        elif isinstance(data, list):
+            result, skipped = self._clean_players(data)
+        else:
+            raise ValueError("Ungültiges Dateiformat")
+
+        self._report(1.0, "Übernehme ...")
+        return result, skipped
+
+    def _read_text(self):
+        total = os.path.getsize(self.path) or 1
+        blocks = []
+        done = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            while True:
+                block = f.read(READ_BLOCK)
+                if not block:
+                    break
+                blocks.append(block)
+                done += len(block)
+                self._report(READ_SHARE * min(done / total, 1.0), "Lese Datei ...")
+        self._report(READ_SHARE, "Verarbeite JSON ...")
+        return "".join(blocks)
+
+    def _clean_players(self, raw_players):
+        cleaned = []
+        skipped = 0
+        total = len(raw_players) or 1
+        start = READ_SHARE + PARSE_SHARE
+        for offset in range(0, len(raw_players), self.chunk_size):
+            for raw in raw_players[offset:offset + self.chunk_size]:
+                player = clean_player(raw)
+                if player is None:
+                    skipped += 1
+                else:
+                    cleaned.append(player)
+            done = min(offset + self.chunk_size, len(raw_players))
+            self._report(start + (1.0 - start) * done / total,
+                         f"Prüfe Spieler {done}/{len(raw_players)}")
+        return cleaned, skipped
@@ -0,0 +1,135 @@
+"""
+Tabellengesteuerte Rotation über beliebig viele Slots (ohne Kivy).
+
+Die Slots einer Gruppe (Lines bzw. Jammer) sind geordnet: Index 0 ist
+"Current", danach Next, Third, ... Rotiert wird nur zwischen belegten Slots,
+jeweils einen Schritt rückwärts: Next → Current, Third → Next, ...,
+Current → letzter belegter Slot. Bei drei Lines also A → C → B → A, bei
+zwei belegten Slots ein Tausch.
+
+Der Rotationsplan hängt nur vom Belegungsmuster ab und wird pro Muster
+einmal berechnet (rotation_plan). REST-Filter: Wer nach Current rotieren
+würde und auf REST steht, bleibt im Ursprungs-Slot (hinter den Neuzugängen).
+
+Auch Auto-Fill (fill_plan) und das Nachrücken in Current Jammer
+(jammer_refill_source) sind hier als reine Funktionen abgelegt; der
+LineupEngine wendet sie an, lookahead.py simuliert mit ihnen.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def rotation_plan(occupancy):
+    """
+    Permutationstabelle für ein Belegungsmuster.
+
+    Args:
+        occupancy: Tupel aus bools, ein Eintrag pro Slot (True = belegt)
+
+    Returns:
+        tuple | None: Ziel-Index pro Slot (None für leere Slots),
+                      None wenn weniger als 2 Slots belegt sind
+    """
+    occupied = [i for i, used in enumerate(occupancy) if used]
+    if len(occupied) < 2:
+        return None
+    plan = [None] * len(occupancy)
+    for k, origin in enumerate(occupied):
+        plan[origin] = occupied[k - 1]
+    return tuple(plan)
+
+
+def is_rest(player):
+    return player.get("status") == "REST"
+
+
+def rotate_groups(groups):
+    """
+    Rotiert die Inhalte einer Slot-Gruppe.
+
+    Args:
+        groups: Liste von Spieler-Listen, in Slot-Reihenfolge (Current zuerst)
+
+    Returns:
+        tuple: (neue Listen pro Slot, zurückgehaltene REST-Spieler*innen)
+               oder None wenn nichts zu rotieren ist
+    """
+    plan = rotation_plan(tuple(bool(players) for players in groups))
+    if plan is None:
+        return None
+
+    result = [[] for _ in groups]
+    held = []
+    for origin, target in enumerate(plan):
+        if target is None:
+            continue
+        players = groups[origin]
+        if target == 0:
+            # REST-Filter: einmal zentral für alle Gruppengrößen
+            stay = [p for p in players if is_rest(p)]
+            if stay:
+                players = [p for p in players if not is_rest(p)]
+                held.append((origin, stay))
+        result[target].extend(players)
+
+    for origin, stay in held:
+        result[origin].extend(stay)
+    return result, [p for _, stay in held for p in stay]
+
+
+def fill_plan(current, sources, line_size):
+    """
+    Auto-Fill-Regel: erst ein Pivot (falls keiner in current), dann Blocker,
+    bis die Line voll ist. Gesucht wird in sources der Reihe nach
+    (Next Line, Third Line, ...), REST wird übersprungen.
+
+    Returns:
+        list: (Index in sources, Spieler*in)-Paare in Auffüll-Reihenfolge
+    """
+    missing = line_size - len(current)
+    picks = []
+    if missing <= 0:
+        return picks
+    taken = set()
+
+    def find(role):
+        for index, players in enumerate(sources):
+            for player in players:
+                if player["role"] == role and not is_rest(player) and player["id"] not in taken:
+                    return index, player
+        return None
+
+    def take(pick):
+        picks.append(pick)
+        taken.add(pick[1]["id"])
+
+    # SCHRITT 1: Pivot holen (falls benötigt)
+    if not any(p["role"] == "P" for p in current):
+        pick = find("P")
+        if pick is not None:
+            take(pick)
+            missing -= 1
+
+    # SCHRITT 2: Blocker auffüllen
+    while missing > 0:
+        pick = find("B")
+        if pick is None:
+            break  # Keine Blocker mehr verfügbar
+        take(pick)
+        missing -= 1
+    return picks
+
+
+def jammer_refill_source(groups):
+    """
+    Index des Jammer-Slots, aus dem ein leerer Current Jammer nachbesetzt wird
+    (erster nicht leerer Slot nach Current, dessen erste Person nicht REST ist).
+
+    Returns:
+        int | None
+    """
+    for index in range(1, len(groups)):
+        players = groups[index]
+        if players and not is_rest(players[0]):
+            return index
+    return None
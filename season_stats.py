@@ -0,0 +1,289 @@
+"""
+Saison-Statistik über viele Lineup-Exporte (Kommandozeile, ohne Kivy).
+
+Liest alle Dateien eines Verzeichnisses (rekursiv):
+
+    *.json   Lineup-Exporte (lineup_export.json aus _export_full_lineup)
+             oder Sitzungs-Checkpoints (session.json) mit Jam-Log
+    *.drby   archivierte Snapshots (siehe snapshot.py)
+
+und fasst sie pro Spieler*in und pro Line zusammen. Jede Datei wird in
+einem Worker-Prozess geparst (ProcessPoolExecutor); die Teilergebnisse sind
+kleine Zähler-dicts, die im Hauptprozess addiert werden.
+
+Lineup-Exporte zählen Einsätze in den Boxen (eine Aufstellung pro Datei),
+Dateien mit Jam-Log zählen gespielte Jams. Spieler*innen werden über Nummer
+und Name zusammengeführt, weil sich die IDs zwischen Geräten unterscheiden.
+
+Aufruf:
+    python season_stats.py saison/                   # CSV auf stdout
+    python season_stats.py saison/ --out stats/      # players.csv + lines.csv
+    python season_stats.py saison/ --json stats.json --workers 4
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import snapshot
+from jam_log import EVENT_KINDS, INJURY, line_label
+
+STATS_EXTS = (".json", ".drby")
+
+PLAYER_COUNTERS = (
+    "lineups",       # Aufstellungen mit Einsatz in Line oder Jammer-Box
+    "line_spots",    # davon in einer Line
+    "pivot_spots",   # davon in einer Line mit Rolle P
+    "jammer_spots",  # davon in einer Jammer-Box
+    "jams",          # gespielte Jams (Jam-Log)
+    "pivot_jams",    # davon auf einem Pivot-Platz
+    "jammer_jams",   # davon als Jammer
+    "penalties",
+    "injuries",
+)
+LINE_COUNTERS = ("lineups", "jams", "pivot_jams", "penalties", "injuries")
+
+PLAYER_FIELDS = ("number", "name", "role") + PLAYER_COUNTERS + ("jam_share", "jammer_share", "pivot_share")
+LINE_FIELDS = ("line",) + LINE_COUNTERS + ("skaters", "jam_share")
+
+
+def find_files(directory):
+    """Alle auswertbaren Dateien unter directory, sortiert"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files
+                     if name.lower().endswith(STATS_EXTS))
+    return sorted(paths)
+
+
+def empty_result():
+    return {"files": 0, "lineups": 0, "jam_logs": 0, "jams": 0,
+            "players": {}, "lines": {}, "skipped": []}
+
+
+# ---------------------------------------------------------
+# Worker: eine Datei → Teilergebnis
+# ---------------------------------------------------------
+def parse_file(path):
+    """Wertet eine Datei aus (läuft im Worker-Prozess)"""
+    result = empty_result()
+    result["files"] = 1
+    try:
+        # Engine-Logging (print) gehört nicht in die CSV-Ausgabe
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine, kind = snapshot.load_engine(path)
+    except Exception as e:
+        result["skipped"].append(f"{path}: {e}")
+        return result
+    if kind not in ("lineup", "state"):
+        result["skipped"].append(f"{path}: kein Lineup")
+        return result
+
+    if len(engine.jam_log):
+        _count_jams(engine, result)
+    else:
+        _count_lineup(engine, result)
+    return result
+
+
+def _player_key(player):
+    return f"{player.get('number', '')}|{player.get('name', '')}"
+
+
+def _player_stats(result, player):
+    key = _player_key(player)
+    stats = result["players"].get(key)
+    if stats is None:
+        stats = result["players"][key] = dict.fromkeys(PLAYER_COUNTERS, 0)
+        stats.update(number=player.get("number", ""), name=player.get("name", ""),
+                     role=player.get("role", ""))
+    return stats
+
+
+def _line_stats(result, label):
+    stats = result["lines"].get(label)
+    if stats is None:
+        stats = result["lines"][label] = dict.fromkeys(LINE_COUNTERS, 0)
+        stats["skaters"] = set()
+    return stats
+
+
+def _count_lineup(engine, result):
+    result["lineups"] = 1
+    for name in engine.jammer_slots:
+        for player in engine.slot(name):
+            stats = _player_stats(result, player)
+            stats["lineups"] += 1
+            stats["jammer_spots"] += 1
+    for index, name in enumerate(engine.line_slots):
+        line = engine.slot(name)
+        if not line:
+            continue
+        line_stats = _line_stats(result, line_label(engine.line_labels[index]))
+        line_stats["lineups"] += 1
+        for player in line:
+            stats = _player_stats(result, player)
+            stats["lineups"] += 1
+            stats["line_spots"] += 1
+            if player["role"] == "P":
+                stats["pivot_spots"] += 1
+            line_stats["skaters"].add(_player_key(player))
+
+
+def _count_jams(engine, result):
+    log = engine.jam_log
+    result["jam_logs"] = 1
+    result["jams"] = len(log)
+
+    def player_of(player_id):
+        # Gelöschte Spieler*innen bleiben im Log; Anzeige dann über die ID
+        return engine.get_player(player_id) or {"name": player_id}
+
+    for row in range(len(log)):
+        jam = log.row(row)
+        line_stats = _line_stats(result, jam["line"])
+        line_stats["jams"] += 1
+        if jam["pivots"]:
+            line_stats["pivot_jams"] += 1
+
+        if jam["jammer"] is not None:
+            stats = _player_stats(result, player_of(jam["jammer"]))
+            stats["jams"] += 1
+            stats["jammer_jams"] += 1
+        for seat, player_id in enumerate(jam["blockers"]):
+            player = player_of(player_id)
+            stats = _player_stats(result, player)
+            stats["jams"] += 1
+            if seat in jam["pivots"]:
+                stats["pivot_jams"] += 1
+            line_stats["skaters"].add(_player_key(player))
+
+        for player_id, kind in jam["events"]:
+            counter = "injuries" if kind == EVENT_KINDS[INJURY] else "penalties"
+            _player_stats(result, player_of(player_id))[counter] += 1
+            line_stats[counter] += 1
+
+
+# ---------------------------------------------------------
+# Zusammenführen und Ausgabe
+# ---------------------------------------------------------
+def merge(total, part):
+    for key in ("files", "lineups", "jam_logs", "jams"):
+        total[key] += part[key]
+    total["skipped"].extend(part["skipped"])
+    for key, stats in part["players"].items():
+        target = total["players"].get(key)
+        if target is None:
+            total["players"][key] = stats
+            continue
+        for counter in PLAYER_COUNTERS:
+            target[counter] += stats[counter]
+        target["role"] = target["role"] or stats["role"]
+    for label, stats in part["lines"].items():
+        target = total["lines"].get(label)
+        if target is None:
+            total["lines"][label] = stats
+            continue
+        for counter in LINE_COUNTERS:
+            target[counter] += stats[counter]
+        target["skaters"] |= stats["skaters"]
+    return total
+
+
+def collect(paths, workers=None):
+    """
+    Wertet alle Dateien aus, parallel in Worker-Prozessen.
+
+    Args:
+        workers: Anzahl Prozesse (None = CPU-Kerne, 1 = ohne Prozesse)
+    """
+    total = empty_result()
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            merge(total, parse_file(path))
+        return total
+
+    workers = workers or os.cpu_count() or 1
+    # Mehrere Dateien pro Auftrag: weniger Pickling-Rundreisen bei kleinen Exporten
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(parse_file, paths, chunksize=chunksize):
+            merge(total, part)
+    return total
+
+
+def _share(part, whole):
+    return round(part / whole, 3) if whole else ""
+
+
+def player_rows(total):
+    rows = []
+    for stats in total["players"].values():
+        row = dict(stats)
+        row["jam_share"] = _share(stats["jams"], total["jams"])
+        # Anteil an allen Jams der Saison, nicht an den eigenen Jams
+        row["jammer_share"] = _share(stats["jammer_jams"], total["jams"])
+        row["pivot_share"] = _share(stats["pivot_jams"], total["jams"])
+        rows.append(row)
+    rows.sort(key=lambda r: (-r["jams"], -r["lineups"], r["number"], r["name"]))
+    return rows
+
+
+def line_rows(total):
+    rows = []
+    for label in sorted(total["lines"]):
+        stats = total["lines"][label]
+        row = dict(stats, line=label, skaters=len(stats["skaters"]))
+        row["jam_share"] = _share(stats["jams"], total["jams"])
+        rows.append(row)
+    return rows
+
+
+def write_csv(fileobj, fields, rows):
+    writer = csv.DictWriter(fileobj, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Saison-Statistik aus Lineup-Exporten und Jam-Logs")
+    parser.add_argument("directory", help="Ordner mit .json-Exporten, session.json und .drby-Snapshots")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: CPU-Kerne)")
+    parser.add_argument("--out", help="Ordner für players.csv und lines.csv (Standard: stdout)")
+    parser.add_argument("--json", dest="json_path", help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    paths = find_files(args.directory)
+    total = collect(paths, args.workers)
+    players, lines = player_rows(total), line_rows(total)
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for filename, fields, rows in (("players.csv", PLAYER_FIELDS, players),
+                                       ("lines.csv", LINE_FIELDS, lines)):
+            with open(os.path.join(args.out, filename), "w", encoding="utf-8", newline="") as f:
+                write_csv(f, fields, rows)
+    else:
+        write_csv(sys.stdout, PLAYER_FIELDS, players)
+        sys.stdout.write("\n")
+        write_csv(sys.stdout, LINE_FIELDS, lines)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"players": players, "lines": lines}, f, indent=2, ensure_ascii=False)
+
+    for message in total["skipped"]:
+        print(f"Übersprungen: {message}", file=sys.stderr)
+    print(f"{total['files']} Dateien ({total['lineups']} Lineups, {total['jam_logs']} Jam-Logs, "
+          f"{total['jams']} Jams) in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return total
+
+
+if __name__ == "__main__":
+    main()
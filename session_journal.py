@@ -0,0 +1,183 @@
+"""
+Write-Ahead-Journal für die Sitzung (Roster + Zuweisungen).
+
+Jeder Undo-Schritt (siehe LineupEngine.checkpoint) wird als eine kompakte
+JSON-Zeile an das Journal angehängt und per fdatasync gesichert - pro Aktion
+wird also nur ein Record geschrieben statt der ganzen players.json.
+
+Beim Start wird der letzte Checkpoint (session.json) geladen und das Journal
+darauf abgespielt. Regelmäßig wird das Journal in einen neuen Checkpoint
+kompaktiert: Das aktuelle Journal wird dabei in ein Segment umbenannt, der
+Checkpoint über den SaveService (persistence.py) im Hintergrund geschrieben
+und das Segment danach gelöscht.
+"""
+import json
+import os
+import threading
+
+from persistence import save_service, sync_file
+
+SESSION_FILE = "session.json"
+JOURNAL_FILE = "session.journal"
+
+CHECKPOINT_VERSION = 1
+
+# Kompaktierung nach so vielen Records oder Bytes im Journal
+COMPACT_EVERY_RECORDS = 200
+COMPACT_EVERY_BYTES = 512 * 1024
+
+
+class SessionJournal:
+    def __init__(self, directory=".", roster_file=None, saver=None):
+        """
+        Args:
+            directory: Ablageort für session.json und session.journal
+            roster_file: Optional players.json, die bei jeder Kompaktierung
+                         mitgeschrieben wird (für Kompatibilität)
+            saver: SaveService für Checkpoints (Standard: gemeinsame Instanz)
+        """
+        self.checkpoint_path = os.path.join(directory, SESSION_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.segment_path = self.journal_path + ".1"
+        self.roster_file = roster_file
+        self.saver = saver or save_service
+
+        self._file = None
+        self._seq = 0             # Sequenznummer des letzten Records
+        self._segment_seq = 0     # Letzter Record im Segment
+        self._records = 0         # Records seit letzter Kompaktierung
+        self._bytes = 0
+        # Schützt das Segment zwischen Rotation (Main-Thread) und Löschen (Worker)
+        self._segment_lock = threading.Lock()
+
+    # -----------------------------------------------------
+    # Wiederherstellung
+    # -----------------------------------------------------
+    def recover(self, engine):
+        """
+        Lädt den letzten Checkpoint in die Engine und spielt das Journal ab.
+
+        Returns:
+            int | None: Anzahl abgespielter Records oder None wenn kein
+                        Checkpoint existiert (Engine bleibt unverändert)
+        """
+        state = None
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Journal: Checkpoint nicht lesbar: {e}")
+
+        if state is None:
+            if os.path.exists(self.journal_path) or os.path.exists(self.segment_path):
+                print("Journal: Kein Checkpoint vorhanden - Journal wird verworfen")
+            return None
+
+        engine.load_state(state)
+        self._seq = state.get("seq", 0)
+
+        replayed = 0
+        for path in (self.segment_path, self.journal_path):
+            for entry in self._read_entries(path):
+                if entry["seq"] <= self._seq:
+                    continue  # Bereits im Checkpoint enthalten
+                engine.apply_record(entry["record"], reverse=entry.get("undo", False))
+                self._seq = entry["seq"]
+                replayed += 1
+
+        print(f"Journal: Checkpoint geladen, {replayed} Records abgespielt")
+        return replayed
+
+    def _read_entries(self, path):
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Abgebrochener letzter Schreibvorgang (App-Kill): abschneiden,
+                    # damit neue Records nicht hinter dem Fragment landen
+                    print(f"Journal: Unvollständiger Record in {path} verworfen")
+                    f.close()
+                    with open(path, "r+b") as tail:
+                        tail.truncate(offset)
+                    return
+                offset += len(line)
+                yield entry
+
+    # -----------------------------------------------------
+    # Schreiben
+    # -----------------------------------------------------
+    def append(self, record, undo=False):
+        """Hängt einen Record an (O(1), ein fdatasync pro Aktion)"""
+        if self._file is None:
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+
+        self._seq += 1
+        entry = {"seq": self._seq, "record": record}
+        if undo:
+            entry["undo"] = True
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._file.write(line)
+        sync_file(self._file)
+
+        self._records += 1
+        self._bytes += len(line)
+
+    def needs_compaction(self):
+        return self._records >= COMPACT_EVERY_RECORDS or self._bytes >= COMPACT_EVERY_BYTES
+
+    def compact(self, state, background=True):
+        """
+        Schreibt einen neuen Checkpoint und verwirft das bisherige Journal.
+
+        Args:
+            state: Zustand aus LineupEngine.export_state() (bereits kopiert)
+            background: False wartet, bis der Checkpoint auf Disk ist
+        """
+        # Aktuelles Journal wird zum Segment, neue Records gehen in eine neue Datei
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with self._segment_lock:
+            if os.path.exists(self.journal_path):
+                if os.path.exists(self.segment_path):
+                    # Checkpoint steht noch aus: Journal an das Segment anhängen
+                    with open(self.segment_path, "a", encoding="utf-8") as seg, \
+                            open(self.journal_path, "r", encoding="utf-8") as cur:
+                        seg.write(cur.read())
+                        sync_file(seg)
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, self.segment_path)
+            self._segment_seq = self._seq
+        self._records = 0
+        self._bytes = 0
+
+        # Mehrere Kompaktierungen kurz hintereinander schreibt der SaveService
+        # nur einmal (der neueste Checkpoint gewinnt)
+        checkpoint = dict(state, version=CHECKPOINT_VERSION, seq=self._seq)
+        self.saver.save(self.checkpoint_path, checkpoint, indent=None,
+                        on_done=self._checkpoint_written)
+        if self.roster_file:
+            self.saver.save(self.roster_file, checkpoint["players"], indent=2)
+        if not background:
+            self.saver.flush()
+
+    def _checkpoint_written(self, checkpoint):
+        # Läuft im Worker-Thread. Schlägt das Schreiben fehl, bleibt das
+        # Segment liegen und wird beim nächsten Start abgespielt
+        with self._segment_lock:
+            # Nur löschen, wenn seit diesem Checkpoint nichts nachrotiert wurde
+            if checkpoint["seq"] >= self._segment_seq and os.path.exists(self.segment_path):
+                os.remove(self.segment_path)
+        print(f"Journal: Kompaktiert (seq {checkpoint['seq']})")
+
+    def close(self):
+        self.saver.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,387 @@
+"""
+Kompaktes binäres Snapshot-Format für Lineups (Dateiendung .drby).
+
+Gedacht für archivierte Bouts und schnelles Laden: Die Spieler*innen stehen
+genau einmal in einer Tabelle mit fester Satzlänge, die Boxen verweisen nur
+per Index darauf. Alle Texte liegen dedupliziert in einem UTF-8-Block am
+Ende. Dadurch kann SnapshotReader die Datei per mmap öffnen und einzelne
+Spieler*innen oder Boxen lesen, ohne die ganze Datei zu parsen.
+
+Aufbau (little endian):
+
+    Header     HEADER_FORMAT   Magic, Version, Anzahl + Offsets der Bereiche
+    Spieler    PLAYER_FORMAT   pro Feld (Offset, Länge) im Text-Block
+    Boxen      SLOT_FORMAT     Name (Offset, Länge), erster Verweis, Anzahl
+    Verweise   REF_FORMAT      Index in die Spieler-Tabelle
+    Texte      UTF-8
+"""
+import json
+import mmap
+import os
+import struct
+
+from lineup_engine import BOX_SLOTS, LineupEngine, line_slots_for
+from persistence import sync_file
+
+SNAPSHOT_EXT = ".drby"
+SNAPSHOT_MAGIC = b"DRBY"
+SNAPSHOT_VERSION = 1
+
+PLAYER_FIELDS = ("id", "name", "number", "role", "status")
+
+HEADER_FORMAT = "<4sHHIIIIII"
+PLAYER_FORMAT = "<" + "IH" * len(PLAYER_FIELDS)
+SLOT_FORMAT = "<IHII"
+REF_FORMAT = "<I"
+
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PLAYER_SIZE = struct.calcsize(PLAYER_FORMAT)
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+REF_SIZE = struct.calcsize(REF_FORMAT)
+
+# Offset für fehlende Felder (None)
+NO_VALUE = 0xFFFFFFFF
+
+
+class SnapshotError(ValueError):
+    """Datei ist kein (lesbarer) Snapshot"""
+
+
+# ---------------------------------------------------------
+# Schreiben
+# ---------------------------------------------------------
+def encode_state(state):
+    """
+    Kodiert einen Zustand aus LineupEngine.export_state() als Snapshot.
+
+    Returns:
+        bytes
+    """
+    strings = bytearray()
+    interned = {}
+
+    def text(value):
+        if value is None:
+            return NO_VALUE, 0
+        data = str(value).encode("utf-8")
+        if data not in interned:
+            interned[data] = len(strings)
+            strings.extend(data)
+        return interned[data], len(data)
+
+    players = state["players"]
+    index_of = {}
+    player_table = bytearray()
+    for index, player in enumerate(players):
+        index_of[player["id"]] = index
+        fields = []
+        for field in PLAYER_FIELDS:
+            fields.extend(text(player.get(field)))
+        player_table += struct.pack(PLAYER_FORMAT, *fields)
+
+    slot_table = bytearray()
+    refs = bytearray()
+    ref_count = 0
+    assignments = state["assignments"]
+    # Zusätzliche Boxen (z.B. line_d beim Scrimmage) hinter den Standard-Boxen
+    slot_names = list(BOX_SLOTS) + [name for name in assignments if name not in BOX_SLOTS]
+    for name in slot_names:
+        ids = [pid for pid in assignments.get(name, []) if pid in index_of]
+        name_offset, name_len = text(name)
+        slot_table += struct.pack(SLOT_FORMAT, name_offset, name_len, ref_count, len(ids))
+        for pid in ids:
+            refs += struct.pack(REF_FORMAT, index_of[pid])
+        ref_count += len(ids)
+
+    players_offset = HEADER_SIZE
+    slots_offset = players_offset + len(player_table)
+    refs_offset = slots_offset + len(slot_table)
+    strings_offset = refs_offset + len(refs)
+    header = struct.pack(
+        HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0,
+        len(players), len(slot_names),
+        players_offset, slots_offset, refs_offset, strings_offset
+    )
+    return b"".join((header, player_table, slot_table, refs, strings))
+
+
+def write_snapshot(path, state):
+    """Schreibt einen Snapshot atomar (temp-Datei + fsync + rename)"""
+    data = encode_state(state)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        sync_file(f)
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------
+# Lesen
+# ---------------------------------------------------------
+class SnapshotReader:
+    """
+    Liest einen Snapshot per mmap; Felder werden erst bei Zugriff dekodiert.
+
+        with SnapshotReader(path) as snap:
+            jammer_ids = snap.slot_ids("current_jammer")
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Leere Datei lässt sich nicht mappen
+                raise SnapshotError(f"{path}: leere Datei")
+
+        if len(self._buf) < HEADER_SIZE:
+            self.close()
+            raise SnapshotError(f"{path}: Header unvollständig")
+        (magic, self.version, _flags, self.player_count, self.slot_count,
+         self._players_offset, self._slots_offset, self._refs_offset,
+         self._strings_offset) = struct.unpack_from(HEADER_FORMAT, self._buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"{path}: kein Lineup-Snapshot")
+        if self.version > SNAPSHOT_VERSION:
+            self.close()
+            raise SnapshotError(f"{path}: Version {self.version} wird nicht unterstützt")
+        # Alle Tabellen müssen vollständig in der Datei liegen (abgeschnitten/beschädigt)
+        tables = (
+            (self._players_offset, self.player_count * PLAYER_SIZE),
+            (self._slots_offset, self.slot_count * SLOT_SIZE),
+            (self._refs_offset, self._strings_offset - self._refs_offset),
+            (self._strings_offset, 0),
+        )
+        if any(offset < HEADER_SIZE or size < 0 or offset + size > len(self._buf)
+               for offset, size in tables):
+            self.close()
+            raise SnapshotError(f"{path}: Datei abgeschnitten oder beschädigt")
+
+        self._slot_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.player_count
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.close()
+            self._buf = None
+
+    def _text(self, offset, length):
+        if offset == NO_VALUE:
+            return None
+        start = self._strings_offset + offset
+        if start + length > len(self._buf):
+            raise SnapshotError(f"{self.path}: Text außerhalb der Datei")
+        return self._buf[start:start + length].decode("utf-8")
+
+    def _player_fields(self, index):
+        if not 0 <= index < self.player_count:
+            raise IndexError(index)
+        return struct.unpack_from(
+            PLAYER_FORMAT, self._buf, self._players_offset + index * PLAYER_SIZE
+        )
+
+    def player(self, index):
+        """Spieler*in an Position index als Dict"""
+        fields = self._player_fields(index)
+        player = {}
+        for i, field in enumerate(PLAYER_FIELDS):
+            value = self._text(fields[2 * i], fields[2 * i + 1])
+            if value is not None:
+                player[field] = value
+        return player
+
+    def player_id(self, index):
+        fields = self._player_fields(index)
+        return self._text(fields[0], fields[1])
+
+    def players(self):
+        """Alle Spieler*innen; Tabelle und Texte werden in einem Durchgang gelesen"""
+        table = self._buf[self._players_offset:self._players_offset + self.player_count * PLAYER_SIZE]
+        blob = self._buf[self._strings_offset:]
+        decoded = {}  # Texte sind dedupliziert: (Offset, Länge) nur einmal dekodieren
+        players = []
+        for fields in struct.iter_unpack(PLAYER_FORMAT, table):
+            player = {}
+            for i, field in enumerate(PLAYER_FIELDS):
+                key = fields[2 * i], fields[2 * i + 1]
+                if key[0] == NO_VALUE:
+                    continue
+                value = decoded.get(key)
+                if value is None:
+                    if key[0] + key[1] > len(blob):
+                        raise SnapshotError(f"{self.path}: Text außerhalb der Datei")
+                    value = decoded[key] = blob[key[0]:key[0] + key[1]].decode("utf-8")
+                player[field] = value
+            players.append(player)
+        return players
+
+    def _slots(self):
+        # Box-Name -> (erster Verweis, Anzahl); nur die kleine Box-Tabelle
+        if self._slot_index is None:
+            self._slot_index = {}
+            for i in range(self.slot_count):
+                name_offset, name_len, first, count = struct.unpack_from(
+                    SLOT_FORMAT, self._buf, self._slots_offset + i * SLOT_SIZE
+                )
+                self._slot_index[self._text(name_offset, name_len)] = (first, count)
+        return self._slot_index
+
+    def slot_names(self):
+        return list(self._slots())
+
+    def slot_indices(self, name):
+        """Indizes der Spieler*innen in einer Box (leer für unbekannte Boxen)"""
+        first, count = self._slots().get(name, (0, 0))
+        start = self._refs_offset + first * REF_SIZE
+        end = start + count * REF_SIZE
+        if end > self._strings_offset:
+            raise SnapshotError(f"{self.path}: Box {name} außerhalb der Verweis-Tabelle")
+        indices = [index for (index,) in struct.iter_unpack(REF_FORMAT, self._buf[start:end])]
+        if any(index >= self.player_count for index in indices):
+            raise SnapshotError(f"{self.path}: Box {name} verweist auf unbekannte Spieler*in")
+        return indices
+
+    def slot_ids(self, name):
+        return [self.player_id(index) for index in self.slot_indices(name)]
+
+    def to_state(self):
+        """Zustand im Format von LineupEngine.export_state()"""
+        players = self.players()
+        return {
+            "players": players,
+            "assignments": {
+                name: [players[index]["id"] for index in self.slot_indices(name)]
+                for name in self.slot_names()
+            }
+        }
+
+    def to_lineup(self):
+        """Lineup im JSON-Exportformat (Zuweisungen als Spieler-Dicts)"""
+        players = self.players()
+        return {
+            "players": players,
+            "assignments": {
+                name: [players[index] for index in self.slot_indices(name)]
+                for name in self.slot_names()
+            }
+        }
+
+
+def is_snapshot_file(path):
+    return path.lower().endswith(SNAPSHOT_EXT)
+
+
+def read_lineup(path):
+    """Lädt einen Snapshot im Format, das import_players_json erwartet"""
+    with SnapshotReader(path) as snap:
+        return snap.to_lineup()
+
+
+# ---------------------------------------------------------
+# Konverter JSON <-> Snapshot
+# ---------------------------------------------------------
+def state_from_json(data):
+    """
+    Bringt importierte JSON-Daten (Spieler-Liste oder Lineup) in das
+    export_state()-Format; Migration und Zuordnung wie beim Import in der App.
+
+    Returns:
+        dict | None: None bei ungültigem Format
+    """
+    engine = LineupEngine()
+    if engine.load_lineup(data) is None:
+        return None
+    return engine.export_state()
+
+
+def json_to_snapshot(data, path):
+    """
+    Speichert importierbare JSON-Daten als Snapshot.
+
+    Returns:
+        bool: False bei ungültigem Format
+    """
+    state = state_from_json(data)
+    if state is None:
+        return False
+    write_snapshot(path, state)
+    return True
+
+
+def snapshot_to_json(path):
+    """Snapshot als JSON-Lineup (wie _export_full_lineup)"""
+    return read_lineup(path)
+
+
+def load_file(path):
+    """Liest eine JSON-Datei oder einen Snapshot im Import-Format"""
+    if is_snapshot_file(path):
+        return read_lineup(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_shape(data):
+    """
+    Prüft die Grundstruktur importierter Daten: Spieler-Liste oder Objekt mit
+    "players" (Liste von Objekten) und optional "assignments" (Box -> Liste).
+
+    Raises:
+        ValueError: bei jeder anderen Struktur
+    """
+    if isinstance(data, list):
+        players, assignments = data, None
+    elif isinstance(data, dict):
+        players, assignments = data.get("players"), data.get("assignments")
+    else:
+        raise ValueError(f"Unbekanntes Format ({type(data).__name__} statt Liste oder Objekt)")
+
+    if not isinstance(players, list):
+        raise ValueError("Spieler-Liste (players) fehlt")
+    for index, player in enumerate(players):
+        if not isinstance(player, dict) or "name" not in player or "role" not in player:
+            raise ValueError(f"Spieler*in #{index + 1} ist kein gültiger Datensatz")
+    if assignments is None:
+        return
+    if not isinstance(assignments, dict):
+        raise ValueError("assignments ist kein Objekt")
+    for name, entries in assignments.items():
+        if not isinstance(entries, list) or not all(isinstance(e, (str, dict)) for e in entries):
+            raise ValueError(f"assignments.{name} ist keine Liste von IDs oder Spieler*innen")
+
+
+def load_engine(path):
+    """
+    Lädt eine Spieler-Liste, einen Lineup-Export, einen Snapshot oder einen
+    Sitzungs-Checkpoint (export_state mit Jam-Log) in einen neuen Engine.
+    Die Zahl der Lines richtet sich nach der Datei.
+
+    Returns:
+        tuple: (LineupEngine, Art) mit Art "players", "lineup" oder "state"
+
+    Raises:
+        ValueError: bei ungültigem Format (siehe check_shape)
+    """
+    data = load_file(path)
+    check_shape(data)
+    assignments = data.get("assignments") if isinstance(data, dict) else None
+    engine = LineupEngine(line_slots=line_slots_for(assignments))
+    # export_state-Format: Zuweisungen als IDs statt als Spieler-Dicts
+    entries = [entry for column in (assignments or {}).values() for entry in column]
+    is_state = any(isinstance(entry, str) for entry in entries)
+    if is_state and not all(isinstance(entry, str) for entry in entries):
+        raise ValueError("Zuweisungen mischen IDs und Spieler-Objekte")
+    if is_state or (assignments is not None and "jam_log" in data):
+        engine.load_state(data)
+        return engine, "state"
+    return engine, engine.load_lineup(data)
@@ -0,0 +1,150 @@
+"""
+Startup-Zeitleiste für Kaltstart-Messungen.
+
+Aktiv nur, wenn die Umgebungsvariable DERBY_STARTUP_PROFILE gesetzt ist
+(Wert = Zieldatei, "1" = STARTUP_PROFILE_FILE). Muss als erstes Modul in
+main.py importiert werden, damit die Import-Zeiten vollständig sind.
+
+Erfasst werden:
+    - Import-Zeit pro Modul (inklusive Untermodule, als Baum)
+    - frei gesetzte Marken (mark) und Abschnitte (span), z.B. KV-Build
+    - der erste gezeichnete Frame
+
+Nach dem ersten Frame wird die Zeitleiste ausgegeben und als JSON
+gespeichert, damit Kaltstarts über Releases hinweg vergleichbar sind.
+"""
+import builtins
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+
+STARTUP_PROFILE_ENV = "DERBY_STARTUP_PROFILE"
+STARTUP_PROFILE_FILE = "startup_profile.json"
+
+# Imports unter dieser Dauer (ms) werden in der Ausgabe nicht aufgeführt
+MIN_IMPORT_MS = 1.0
+
+_T0 = time.perf_counter()
+
+
+def _ms(t):
+    return round((t - _T0) * 1000, 2)
+
+
+class StartupTimeline:
+    def __init__(self, path=None):
+        self.path = path
+        self.enabled = path is not None
+        self.events = []   # (label, start_ms, dauer_ms | None)
+        self.imports = []  # (tiefe, modul, dauer_ms)
+        self._depth = 0
+        self._original_import = None
+        self._dumped = False
+
+    # -----------------------------------------------------
+    # Import-Messung
+    # -----------------------------------------------------
+    def install_import_hook(self):
+        if not self.enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level or name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        # Platz reservieren, damit Untermodule nach ihrem Eltern-Modul stehen
+        entry = len(self.imports)
+        self.imports.append(None)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.imports[entry] = (self._depth, name, round((time.perf_counter() - start) * 1000, 2))
+
+    # -----------------------------------------------------
+    # Marken
+    # -----------------------------------------------------
+    def mark(self, label):
+        if self.enabled:
+            self.events.append((label, _ms(time.perf_counter()), None))
+
+    @contextlib.contextmanager
+    def span(self, label):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append((label, _ms(start), round((end - start) * 1000, 2)))
+
+    # -----------------------------------------------------
+    # Ausgabe
+    # -----------------------------------------------------
+    def report(self):
+        return {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "platform": sys.platform,
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "events": [
+                {"label": label, "at_ms": at, "duration_ms": duration}
+                for label, at, duration in sorted(self.events, key=lambda e: e[1])
+            ],
+            "imports": [
+                {"module": name, "depth": depth, "ms": ms}
+                for depth, name, ms in filter(None, self.imports)
+            ]
+        }
+
+    def dump(self):
+        """Gibt die Zeitleiste aus und speichert sie (nur einmal pro Start)"""
+        if not self.enabled or self._dumped:
+            return
+        self._dumped = True
+        self.remove_import_hook()
+        data = self.report()
+
+        print("Startup-Zeitleiste:")
+        for event in data["events"]:
+            duration = event["duration_ms"]
+            suffix = f" ({duration} ms)" if duration is not None else ""
+            print(f"  {event['at_ms']:9.1f} ms  {event['label']}{suffix}")
+        print("Imports:")
+        for item in data["imports"]:
+            if item["ms"] >= MIN_IMPORT_MS:
+                print(f"  {item['ms']:9.1f} ms  {'  ' * item['depth']}{item['module']}")
+
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            print(f"Startup-Profil gespeichert: {self.path}")
+        except OSError as e:
+            print(f"Startup-Profil nicht gespeichert: {e}")
+
+
+def _profile_path():
+    value = os.environ.get(STARTUP_PROFILE_ENV)
+    if not value:
+        return None
+    return STARTUP_PROFILE_FILE if value == "1" else value
+
+
+timeline = StartupTimeline(_profile_path())
+timeline.install_import_hook()
+timeline.mark("Prozess: startup_profile geladen")
@@ -0,0 +1,107 @@
+"""
+Undo/Redo-Verlauf aus kleinen, umkehrbaren Änderungs-Records.
+
+Ein Record beschreibt nur, was sich zwischen zwei Checkpoints geändert hat
+(siehe LineupEngine.checkpoint):
+
+    {
+        "slots":  {box_name: [alte_ids, neue_ids]},
+        "status": {player_id: [alter_status, neuer_status,
+                               alte_rest_marke, neue_rest_marke]},      (Marken optional)
+        "roster": [["add" | "del", index, spieler_dict], ...],
+        "jams":   [[player_ids, zähler_vorher, jam_log_zeile], ...],  (optional)
+        "lines":  [alte_line_labels, neue_line_labels],                (optional)
+        "period": [[bout, periode], [bout, periode]]                   (optional)
+    }
+
+Der Verlauf ist über ein Byte-Budget begrenzt statt über eine feste Anzahl
+Schritte; die ältesten Records fallen zuerst heraus.
+"""
+import sys
+
+HISTORY_MAX_BYTES = 4 * 1024 * 1024
+
+
+def estimate_size(obj):
+    """Grobe Schätzung des Speicherbedarfs eines Records in Bytes"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key) + estimate_size(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            size += estimate_size(item)
+    return size
+
+
+def is_empty_record(record):
+    return not (record["slots"] or record["status"] or record["roster"]
+                or record.get("jams") or record.get("lines") or record.get("period"))
+
+
+class UndoHistory:
+    def __init__(self, max_bytes=HISTORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._records = []  # Liste von (record, bytes)
+        self._index = 0     # Anzahl angewendeter Records
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def position(self):
+        """Aktueller Schritt (0 = Ausgangszustand)"""
+        return self._index
+
+    @property
+    def total_bytes(self):
+        return self._bytes
+
+    def can_undo(self):
+        return self._index > 0
+
+    def can_redo(self):
+        return self._index < len(self._records)
+
+    def clear(self):
+        self._records = []
+        self._index = 0
+        self._bytes = 0
+
+    def push(self, record):
+        """Fügt einen Record hinzu; verwirft dabei alle Redo-Schritte"""
+        # Entferne alle Schritte nach current index (bei neuer Änderung nach Undo)
+        for _, size in self._records[self._index:]:
+            self._bytes -= size
+        del self._records[self._index:]
+
+        size = estimate_size(record)
+        self._records.append((record, size))
+        self._bytes += size
+        self._index += 1
+
+        # Budget einhalten: älteste Schritte verwerfen (mindestens einer bleibt)
+        dropped = 0
+        while self._bytes > self.max_bytes and len(self._records) > 1:
+            _, old_size = self._records[dropped]
+            self._bytes -= old_size
+            dropped += 1
+        if dropped:
+            del self._records[:dropped]
+            self._index -= dropped
+
+    def undo(self):
+        """Liefert den rückgängig zu machenden Record oder None"""
+        if not self.can_undo():
+            return None
+        self._index -= 1
+        return self._records[self._index][0]
+
+    def redo(self):
+        """Liefert den wiederherzustellenden Record oder None"""
+        if not self.can_redo():
+            return None
+        record = self._records[self._index][0]
+        self._index += 1
+        return record